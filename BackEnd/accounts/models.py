@@ -10,7 +10,10 @@ class User(AbstractUser):
     avatar = models.URLField(max_length=500, blank=True, null=True)
 
     # 사용자 라이브러리 정보 갱신된 가장 최근 시점
-    # last_synced_at = models.DateTimeField(null=True, blank=True)
+    last_synced_at = models.DateTimeField(null=True, blank=True)
+
+    # 마지막으로 반영한 GetOwnedGames 응답의 지문 (바뀐 게 없으면 동기화 생략)
+    library_fingerprint = models.CharField(max_length=64, blank=True, default="")
 
     def __str__(self):
         return self.nickname if self.nickname else self.username
\ No newline at end of file
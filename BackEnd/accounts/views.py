@@ -6,13 +6,13 @@ from django.conf import settings
 from django.contrib.auth import get_user_model
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.authentication import JWTAuthentication
-import requests
 from urllib.parse import urlencode
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny
 
 from .serializers import MyPageSerializer
+from games.steam_client import steam_get, steam_post
 
 User = get_user_model()
 
@@ -37,8 +37,8 @@ class SteamLoginVerifyView(APIView):
         steam_data = request.data.copy()
         steam_data["openid.mode"] = "check_authentication"
         
-        # 스팀에 검증 요청
-        response = requests.post("https://steamcommunity.com/openid/login", data=steam_data)
+        # 스팀에 검증 요청 (nonce를 소모하는 요청이므로 재시도하지 않음)
+        response = steam_post('openid', data=steam_data, max_retries=0)
         
         if "is_valid:true" in response.text:
             claimed_id = steam_data.get("openid.claimed_id")
@@ -50,9 +50,8 @@ class SteamLoginVerifyView(APIView):
             # 스팀 유저 정보 업데이트
             try:
                 api_key = settings.STEAM_API_KEY 
-                player_url = "http://api.steampowered.com/ISteamUser/GetPlayerSummaries/v0002/"
                 
-                res = requests.get(player_url, params={"key": api_key, "steamids": steam_id})
+                res = steam_get('player_summaries', {"key": api_key, "steamids": steam_id}, interactive=True)
                 data = res.json()
                 
                 # 데이터 파싱
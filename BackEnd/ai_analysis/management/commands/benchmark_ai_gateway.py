@@ -0,0 +1,46 @@
+import statistics
+import time
+import httpx
+from asgiref.sync import async_to_sync
+from django.core.management.base import BaseCommand
+from ai_analysis.utils import HTTP2_AVAILABLE, _gateway, run_ai
+
+DEFAULT_URL = "https://gms.ssafy.io/"
+
+
+class Command(BaseCommand):
+    help = 'AI 게이트웨이 호출의 요청마다 클라이언트를 새로 만드는 방식과 공용(keep-alive) 클라이언트 방식의 지연 시간을 비교합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default=DEFAULT_URL, help='측정할 URL (토큰을 쓰지 않도록 기본값은 게이트웨이 루트)')
+        parser.add_argument('--calls', type=int, default=20, help='방식마다 순서대로 보낼 요청 수')
+
+    def handle(self, *args, **options):
+        url, calls = options['url'], options['calls']
+        self.stdout.write(f"{url} 에 방식마다 {calls}회 요청 (HTTP/2 {'사용' if HTTP2_AVAILABLE else '미설치'})")
+
+        async def fresh_client():
+            # 기존 방식: 호출마다 이벤트 루프(async_to_sync) + 클라이언트 + 커넥션을 새로 만듦
+            async with httpx.AsyncClient() as client:
+                await client.get(url)
+
+        async def pooled_client():
+            await _gateway.get_http_client().get(url)
+
+        results = {}
+        for name, call in (('fresh', lambda: async_to_sync(fresh_client)()), ('pooled', lambda: run_ai(pooled_client()))):
+            timings = []
+            for _ in range(calls):
+                started = time.perf_counter()
+                call()
+                timings.append((time.perf_counter() - started) * 1000)
+            timings.sort()
+            results[name] = timings
+            self.stdout.write(
+                f"  {name:<6} p50 {statistics.median(timings):8.2f}ms  "
+                f"p95 {timings[int(len(timings) * 0.95) - 1]:8.2f}ms  "
+                f"max {timings[-1]:8.2f}ms"
+            )
+
+        saved = statistics.median(results['fresh']) - statistics.median(results['pooled'])
+        self.stdout.write(self.style.SUCCESS(f'호출당 중앙값 {saved:.1f}ms 절약'))
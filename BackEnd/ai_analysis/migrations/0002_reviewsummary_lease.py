@@ -0,0 +1,23 @@
+# Generated by Django 5.2.4 on 2026-10-18 10:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_analysis', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reviewsummary',
+            name='lease_expires_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='reviewsummary',
+            name='lease_owner',
+            field=models.CharField(blank=True, default='', max_length=32),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.4 on 2026-10-18 11:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_analysis', '0003_airesponsecache'),
+        ('games', '0012_searchrecommendationcache'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gamereview',
+            name='language',
+            field=models.CharField(blank=True, default='', max_length=30),
+        ),
+        migrations.AddField(
+            model_name='gamereview',
+            name='playtime_at_review',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='gamereview',
+            name='posted_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='gamereview',
+            name='voted_up',
+            field=models.BooleanField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='gamereview',
+            name='votes_up',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='gamereview',
+            index=models.Index(fields=['game', 'language', '-posted_at'], name='gamereview_lang_posted_idx'),
+        ),
+    ]
@@ -22,6 +22,10 @@ class ReviewSummary(models.Model):
     tokens_used = models.IntegerField(default=0)
     last_updated_at = models.DateTimeField(auto_now=True)
 
+    # 분석 작업 임대(lease): 게임당 한 작업만 실행, 작업이 죽어도 만료 시각이 지나면 다른 요청이 다시 가져감
+    lease_owner = models.CharField(max_length=32, blank=True, default='')
+    lease_expires_at = models.DateTimeField(null=True, blank=True)
+
     def __str__(self):
         return f'{self.game.name} 리뷰 AI 요약'
 
@@ -42,6 +46,19 @@ class GameReview(models.Model):
         help_text="감정 점수(-1: 매우 부정, 1: 매우 긍정)")
     is_useful = models.BooleanField(default=False)
 
+    # 스팀 appreviews 원본 정보
+    language = models.CharField(max_length=30, blank=True, default='')
+    voted_up = models.BooleanField(null=True, blank=True) # 추천 여부
+    votes_up = models.PositiveIntegerField(default=0)     # '유용함' 투표 수
+    playtime_at_review = models.PositiveIntegerField(default=0) # 작성 시점 플레이타임(분)
+    posted_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # 증분 수집 시 언어별 가장 최근 리뷰 조회
+            models.Index(fields=['game', 'language', '-posted_at'], name='gamereview_lang_posted_idx'),
+        ]
+
     def __str__(self):
         return f'{self.game.name} - 리뷰 번호 {self.steam_review_id}'
 
@@ -60,4 +77,17 @@ class AIAnalysisLog(models.Model):
     updated_at = models.DateTimeField(auto_now=True)     # 다시 분석한 시간
 
     def __str__(self):
-        return f"{self.user} - {self.gamer_type}"
\ No newline at end of file
+        return f"{self.user} - {self.gamer_type}"
+
+class AIResponseCache(models.Model):
+    # 같은 (모델, 시스템 프롬프트, 유저 프롬프트)에 대한 LLM 응답 캐시, key는 세 값의 sha256
+    key = models.CharField(max_length=64, primary_key=True)
+    model_name = models.CharField(max_length=100)
+    response = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+    last_used_at = models.DateTimeField(db_index=True) # LRU 정리 기준
+    hit_count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.model_name} 응답 캐시 {self.key[:12]}"
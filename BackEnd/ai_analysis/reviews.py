@@ -0,0 +1,164 @@
+# ai_analysis/reviews.py
+"""
+스팀 유저 리뷰 수집 파이프라인 (appreviews → GameReview).
+  - 언어별로 cursor를 따라 최신순 페이지를 차례로 받는 스트리밍 generator (동기/비동기 버전)
+  - steam_review_id 기준으로 중복 없이 bulk insert
+  - 증분 수집: 언어별로 저장된 가장 최근 리뷰보다 새로운 리뷰가 나오는 동안만 페이지를 넘김
+감정 점수(ai_analysis.sentiment)는 저장할 때 함께 계산하고, 요약은 저장된 리뷰를 읽어서 처리한다.
+"""
+from datetime import datetime, timezone as dt_timezone
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import Max
+from games.steam_client import async_steam_get, steam_get
+from .models import GameReview
+from .sentiment import score_reviews
+
+
+def review_languages():
+    return getattr(settings, 'STEAM_REVIEW_LANGUAGES', ['korean'])
+
+
+def _review_params(language, cursor):
+    return {
+        "json": 1, "filter": "recent", "language": language, "cursor": cursor,
+        "num_per_page": getattr(settings, 'STEAM_REVIEW_PAGE_SIZE', 100), "purchase_type": "all", "review_type": "all",
+    }
+
+
+def _read_page(response, cursor, since_ts, remaining):
+    """ 응답 한 페이지에서 (꺼낼 리뷰 목록, 다음 cursor) 반환. 더 읽을 페이지가 없으면 cursor는 None """
+    if response.status_code != 200:
+        raise RuntimeError(f"리뷰 요청 실패: {response.status_code}")
+    data = response.json()
+    reviews = data.get('reviews') or []
+    if not data.get('success') or not reviews:
+        return [], None
+
+    page = []
+    for review in reviews:
+        if since_ts is not None and review.get('timestamp_created', 0) < since_ts:
+            return page, None
+        page.append(review)
+        if remaining is not None and len(page) >= remaining:
+            return page, None
+
+    # 마지막 페이지에서는 같은 cursor가 다시 돌아옴
+    next_cursor = data.get('cursor')
+    if not next_cursor or next_cursor == cursor:
+        return page, None
+    return page, next_cursor
+
+
+def iter_steam_reviews(appid, language, since=None, max_reviews=None):
+    """
+    한 언어의 리뷰를 최신순으로 하나씩 꺼냄 (원본 dict).
+    since(datetime)가 주어지면 그보다 먼저 작성된 리뷰가 나오는 순간 멈춘다 (같은 시각은 중복 제거로 걸러짐).
+    """
+    since_ts = since.timestamp() if since else None
+    cursor = '*'
+    count = 0
+    while cursor:
+        response = steam_get('appreviews', _review_params(language, cursor), path_params={"appid": appid})
+        page, cursor = _read_page(response, cursor, since_ts, max_reviews - count if max_reviews else None)
+        count += len(page)
+        yield from page
+
+
+async def aiter_steam_reviews(appid, language, since=None, max_reviews=None):
+    """ iter_steam_reviews의 비동기 버전 (async_steam_get 사용) """
+    since_ts = since.timestamp() if since else None
+    cursor = '*'
+    count = 0
+    while cursor:
+        response = await async_steam_get('appreviews', _review_params(language, cursor), path_params={"appid": appid})
+        page, cursor = _read_page(response, cursor, since_ts, max_reviews - count if max_reviews else None)
+        count += len(page)
+        for review in page:
+            yield review
+
+
+def _to_game_review(appid, language, review):
+    created = review.get('timestamp_created')
+    return GameReview(
+        game_id=appid,
+        steam_review_id=str(review['recommendationid']),
+        content=review.get('review', ''),
+        # 스팀 응답의 language는 'koreana'처럼 요청 값과 다를 수 있으므로 요청한 언어로 저장 (조회/증분 수집 기준)
+        language=language,
+        voted_up=review.get('voted_up'),
+        votes_up=review.get('votes_up') or 0,
+        playtime_at_review=(review.get('author') or {}).get('playtime_at_review') or 0,
+        posted_at=datetime.fromtimestamp(created, tz=dt_timezone.utc) if created else None,
+    )
+
+
+def _save_batch(appid, language, batch):
+    """ 이미 저장된 steam_review_id는 건너뛰고 저장, 새로 저장한 개수 반환 """
+    ids = {review['recommendationid'] for review in batch}
+    existing = set(GameReview.objects.filter(steam_review_id__in=ids).values_list('steam_review_id', flat=True))
+    rows = [
+        _to_game_review(appid, language, review) for review in batch
+        if review['recommendationid'] not in existing and review.get('review')
+    ]
+    # 감정 점수/유용성은 저장하기 전에 묶음 단위로 계산
+    score_reviews(rows)
+    # 동시에 같은 게임을 수집한 경우를 대비해 unique 충돌은 무시
+    GameReview.objects.bulk_create(rows, ignore_conflicts=True)
+    return len(rows)
+
+
+def _latest_posted(appid):
+    """ 언어별로 저장된 가장 최근 리뷰의 작성 시각 """
+    return dict(
+        GameReview.objects.filter(game_id=appid).values_list('language').annotate(last=Max('posted_at')).order_by()
+    )
+
+
+def ingest_game_reviews(appid, languages=None, full=False, max_reviews=None):
+    """
+    게임의 리뷰를 받아 GameReview에 저장하고 새로 저장한 개수를 반환.
+    full=False면 언어별로 저장된 가장 최근 리뷰 이후의 리뷰만 받는다.
+    """
+    batch_size = getattr(settings, 'STEAM_REVIEW_WRITE_BATCH', 500)
+    max_reviews = max_reviews or getattr(settings, 'STEAM_REVIEW_MAX_PER_GAME', 2000)
+    latest = {} if full else _latest_posted(appid)
+
+    saved = 0
+    for language in languages or review_languages():
+        batch = []
+        for review in iter_steam_reviews(appid, language, since=latest.get(language), max_reviews=max_reviews):
+            review['recommendationid'] = str(review['recommendationid'])
+            batch.append(review)
+            if len(batch) >= batch_size:
+                saved += _save_batch(appid, language, batch)
+                batch = []
+        if batch:
+            saved += _save_batch(appid, language, batch)
+    return saved
+
+
+async def async_ingest_game_reviews(appid, languages=None, full=False, max_reviews=None):
+    """ ingest_game_reviews의 비동기 버전: 스팀 요청은 이벤트 루프에서, DB 저장만 sync_to_async로 """
+    batch_size = getattr(settings, 'STEAM_REVIEW_WRITE_BATCH', 500)
+    max_reviews = max_reviews or getattr(settings, 'STEAM_REVIEW_MAX_PER_GAME', 2000)
+    latest = {} if full else await sync_to_async(_latest_posted)(appid)
+    save_batch = sync_to_async(_save_batch)
+
+    saved = 0
+    for language in languages or review_languages():
+        batch = []
+        async for review in aiter_steam_reviews(appid, language, since=latest.get(language), max_reviews=max_reviews):
+            review['recommendationid'] = str(review['recommendationid'])
+            batch.append(review)
+            if len(batch) >= batch_size:
+                saved += await save_batch(appid, language, batch)
+                batch = []
+        if batch:
+            saved += await save_batch(appid, language, batch)
+    return saved
+
+
+def stored_reviews(appid, language='korean', limit=30):
+    """ 요약에 쓸 저장된 리뷰: '유용함' 투표가 많은 순, 같으면 최신순 """
+    return GameReview.objects.filter(game_id=appid, language=language).order_by('-votes_up', '-posted_at', 'id')[:limit]
@@ -0,0 +1,100 @@
+# ai_analysis/selection.py
+"""
+리뷰 요약 프롬프트에 넣을 리뷰 고르기 (LLM에 보내기 전 추출 단계).
+  1. 너무 짧거나 같은 말을 반복하는 리뷰는 버리고, 너무 긴 리뷰는 잘라냄
+  2. 글자 2-gram TF-IDF 벡터의 코사인 유사도로 거의 같은 리뷰(복붙 등)를 하나만 남김
+  3. 전체 리뷰의 중심(centroid)과 가까우면서 이미 고른 리뷰와는 다른 리뷰를 MMR로 골라 최대 개수/토큰 예산까지 채움
+같은 입력이면 항상 같은 결과가 나오므로 (해시를 쓰지 않음) LLM 응답 캐시도 그대로 적중한다.
+"""
+import re
+import numpy as np
+from django.conf import settings
+
+_WORD_RE = re.compile(r"[\w']+")
+
+
+def estimate_tokens(text):
+    """토큰 수 대략 추정 (한글은 글자당 1토큰 안팎, 영문은 4글자당 1토큰 정도)"""
+    non_ascii = sum(1 for ch in text if ord(ch) > 127)
+    return non_ascii + (len(text) - non_ascii) // 4 + 1
+
+
+def _clean(text, max_chars):
+    text = ' '.join(text.split())
+    return text[:max_chars].rstrip() + '…' if len(text) > max_chars else text
+
+
+def _is_informative(text, min_words):
+    words = _WORD_RE.findall(text.casefold())
+    if len(words) < min_words:
+        return False
+    # 같은 단어/글자만 반복하는 리뷰 (ㅋㅋㅋㅋ, 추천 추천 추천 ...)
+    if len(set(words)) / len(words) < 0.3:
+        return False
+    chars = text.replace(' ', '')
+    return len(set(chars)) / len(chars) >= 0.1
+
+
+def _tfidf(texts):
+    """ 글자 2-gram TF-IDF 행렬 (행마다 L2 정규화) """
+    grams = []
+    for text in texts:
+        key = text.casefold()
+        grams.append([key[i:i + 2] for i in range(len(key) - 1)])
+    vocab, inverse = np.unique(np.array([g for row in grams for g in row]), return_inverse=True)
+    rows = np.repeat(np.arange(len(texts)), [len(row) for row in grams])
+
+    counts = np.zeros((len(texts), len(vocab)))
+    np.add.at(counts, (rows, inverse), 1)
+    df = np.count_nonzero(counts, axis=0)
+    matrix = np.log1p(counts) * (np.log((1 + len(texts)) / (1 + df)) + 1)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+
+def select_reviews(reviews, token_budget=None, max_reviews=None):
+    """
+    reviews(중요한 순서로 정렬된 본문 목록)에서 요약에 넣을 리뷰를 최대 max_reviews개, 토큰 예산 안에서 골라 반환.
+    중복은 앞쪽(더 유용한) 리뷰를 남기고, 결과는 고른 순서(대표성이 높은 순).
+    """
+    token_budget = token_budget or getattr(settings, 'REVIEW_SUMMARY_PROMPT_TOKENS', 1500)
+    max_reviews = max_reviews or getattr(settings, 'REVIEW_SELECT_MAX_REVIEWS', 20)
+    max_chars = getattr(settings, 'REVIEW_SELECT_MAX_CHARS', 600)
+    min_words = getattr(settings, 'REVIEW_SELECT_MIN_WORDS', 3)
+    duplicate_similarity = getattr(settings, 'REVIEW_SELECT_DUPLICATE_SIMILARITY', 0.8)
+    diversity = getattr(settings, 'REVIEW_SELECT_MMR_LAMBDA', 0.7)
+
+    texts = [_clean(text, max_chars) for text in reviews if text]
+    texts = [text for text in texts if _is_informative(text, min_words)]
+    if not texts:
+        return []
+
+    vectors = _tfidf(texts)
+    similarity = vectors @ vectors.T
+
+    # 앞에서부터 보면서 이미 남긴 리뷰와 거의 같은 리뷰는 버림
+    keep = []
+    for i in range(len(texts)):
+        if not keep or similarity[i, keep].max() < duplicate_similarity:
+            keep.append(i)
+    vectors, similarity = vectors[keep], similarity[np.ix_(keep, keep)]
+    texts = [texts[i] for i in keep]
+    tokens = np.array([estimate_tokens(text) for text in texts])
+
+    centroid = vectors.mean(axis=0)
+    relevance = vectors @ centroid
+
+    selected = []
+    redundancy = np.zeros(len(texts))
+    available = tokens <= token_budget
+    remaining = token_budget
+    while available.any() and len(selected) < max_reviews:
+        # MMR: 대표성(중심과의 유사도) - 이미 고른 리뷰와의 최대 유사도
+        score = diversity * relevance - (1 - diversity) * redundancy
+        best = int(np.argmax(np.where(available, score, -np.inf)))
+        selected.append(best)
+        remaining -= tokens[best]
+        redundancy = np.maximum(redundancy, similarity[best])
+        available[best] = False
+        available &= tokens <= remaining
+    return [texts[i] for i in selected]
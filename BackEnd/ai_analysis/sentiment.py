@@ -0,0 +1,168 @@
+# ai_analysis/sentiment.py
+"""
+저장된 리뷰(GameReview)의 감정 점수와 유용성을 AI 호출 없이 계산.
+감정 사전(어간 → 가중치)을 리뷰 묶음 전체에 NumPy로 한 번에 적용한다.
+  - 묶음의 모든 토큰을 한 배열로 펼치고, 고유 토큰마다 한 번만 사전을 찾음
+  - 바로 앞 토큰이 부정어(안, 못, not ...)이거나 바로 뒤 토큰이 부정 용언(않다, 없다 ...)이면 부호를 뒤집고,
+    바로 앞 토큰이 강조어(정말, 너무 ...)면 1.5배
+  - 리뷰별 합계(bincount)를 tanh로 -1 ~ 1 범위에 맞춤. 작성자의 추천/비추천(voted_up)은 약한 사전 정보로 더함
+"""
+import re
+import numpy as np
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Avg, Count, Q
+from .models import GameReview
+
+# 한국어는 활용형이 많으므로 어간으로, 토큰이 어간으로 시작하면 일치 (가장 긴 어간 우선)
+LEXICON = {
+    # 긍정
+    '재밌': 1.0, '재미있': 1.0, '재미': 0.6, '꿀잼': 1.5, '갓겜': 1.5, '명작': 1.5, '최고': 1.2, '추천': 1.0,
+    '좋': 0.8, '훌륭': 1.2, '완벽': 1.2, '만족': 1.0, '감동': 1.0, '몰입': 0.8, '중독': 0.6,
+    '갓': 0.8, '사랑': 1.0, '아름답': 1.0, '예쁘': 0.6, '신나': 0.8, '강추': 1.5, '혜자': 1.0,
+    'good': 0.8, 'great': 1.0, 'fun': 1.0, 'love': 1.0, 'best': 1.2, 'amazing': 1.2,
+    'awesome': 1.2, 'masterpiece': 1.5, 'recommend': 1.0, 'enjoy': 0.8, 'excellent': 1.2,
+    # 부정
+    '재미없': -1.2, '노잼': -1.5, '망겜': -1.5, '쓰레기': -1.5, '최악': -1.5, '비추': -1.2,
+    '별로': -0.8, '실망': -1.0, '지루': -1.0, '버그': -0.6, '렉': -0.6, '튕': -0.8, '환불': -1.0,
+    '짜증': -1.0, '불편': -0.6, '아쉽': -0.5, '과금': -0.5, '핵': -0.6, '망했': -1.2, '최적화': -0.3,
+    'bad': -0.8, 'boring': -1.0, 'worst': -1.5, 'refund': -1.0, 'bug': -0.6, 'buggy': -1.0,
+    'broken': -1.0, 'crash': -0.8, 'waste': -1.2, 'terrible': -1.2, 'awful': -1.2, 'trash': -1.5,
+}
+NEGATORS = {'안', '못', 'not', 'no', 'never', "don't", "doesn't", "isn't", "can't", "won't"}
+# 뒤에 붙어서 앞 단어를 부정하는 용언 (좋지 않다, 재미 없다, 추천하지 않음 ...)
+POST_NEGATOR_STEMS = ('않', '없', '아니', '아닌')
+INTENSIFIERS = {'정말', '너무', '진짜', '완전', '존나', '개', '매우', 'very', 'really', 'so', 'super'}
+MAX_STEM_LENGTH = max(len(stem) for stem in LEXICON)
+VOTED_UP_PRIOR = 0.5
+
+_TOKEN_RE = re.compile(r"[\w']+")
+_weight_cache = {}
+
+
+def _token_weight(token):
+    weight = _weight_cache.get(token)
+    if weight is None:
+        weight = 0.0
+        for length in range(min(len(token), MAX_STEM_LENGTH), 0, -1):
+            if token[:length] in LEXICON:
+                weight = LEXICON[token[:length]]
+                break
+        if len(_weight_cache) < 500000:
+            _weight_cache[token] = weight
+    return weight
+
+
+def score_texts(texts, voted_up=None):
+    """
+    리뷰 본문 목록의 감정 점수와 감정어 개수.
+    voted_up: 같은 길이의 True/False/None 목록 (작성자의 추천 여부)
+    반환값: (점수 배열 -1~1, 감정어 개수 배열, 토큰 수 배열)
+    """
+    n = len(texts)
+    token_lists = [_TOKEN_RE.findall(text.casefold()) for text in texts]
+    lengths = np.fromiter((len(tokens) for tokens in token_lists), dtype=np.int64, count=n)
+    owners = np.repeat(np.arange(n), lengths)
+
+    prior = np.zeros(n)
+    if voted_up is not None:
+        prior = np.array([VOTED_UP_PRIOR if v else -VOTED_UP_PRIOR if v is False else 0.0 for v in voted_up])
+
+    if owners.size == 0:
+        return np.round(np.tanh(prior), 3), np.zeros(n, dtype=np.int64), lengths
+
+    vocab, inverse = np.unique(np.array([token for tokens in token_lists for token in tokens]), return_inverse=True)
+    vocab_weights = np.array([_token_weight(token) for token in vocab])
+    vocab_negator = np.array([token in NEGATORS for token in vocab])
+    vocab_intensifier = np.array([token in INTENSIFIERS for token in vocab])
+    vocab_post_negator = np.array([token.startswith(POST_NEGATOR_STEMS) for token in vocab])
+
+    weights = vocab_weights[inverse]
+    # 바로 앞/뒤 토큰 (같은 리뷰 안에서만)
+    same_review = np.r_[False, owners[1:] == owners[:-1]]
+    prev_negator = np.r_[False, vocab_negator[inverse][:-1]] & same_review
+    next_negator = np.r_[vocab_post_negator[inverse][1:], False] & np.r_[same_review[1:], False]
+    prev_intensifier = np.r_[False, vocab_intensifier[inverse][:-1]] & same_review
+    weights = np.where(prev_negator ^ next_negator, -weights, weights)
+    weights = np.where(prev_intensifier, weights * 1.5, weights)
+
+    raw = np.bincount(owners, weights=weights, minlength=n)
+    hits = np.bincount(owners, weights=weights != 0, minlength=n).astype(np.int64)
+    # 감정어가 많을수록 합계가 커지므로 √개수로 나눠서 긴 리뷰가 항상 ±1에 붙지 않게 함
+    scores = np.tanh((raw + prior) / np.sqrt(hits + 1))
+    return np.round(scores, 3), hits, lengths
+
+
+def score_reviews(reviews):
+    """ GameReview 객체들의 sentiment_score, is_useful을 채움 (저장은 호출한 쪽에서) """
+    if not reviews:
+        return reviews
+    scores, hits, lengths = score_texts([r.content for r in reviews], [r.voted_up for r in reviews])
+    votes = np.fromiter((r.votes_up for r in reviews), dtype=np.int64, count=len(reviews))
+    # 다른 유저가 유용하다고 투표했거나, 충분히 길고 감정 근거가 여러 개인 리뷰
+    useful = (votes >= getattr(settings, 'REVIEW_USEFUL_MIN_VOTES', 3)) | (
+        (lengths >= getattr(settings, 'REVIEW_USEFUL_MIN_TOKENS', 20)) & (hits >= 2)
+    )
+    for review, score, is_useful in zip(reviews, scores.tolist(), useful.tolist()):
+        review.sentiment_score = score
+        review.is_useful = is_useful
+    return reviews
+
+
+def _save_scores(reviews):
+    # bulk_update의 CASE WHEN 대신 행마다 같은 UPDATE를 executemany로 (묶음이 클수록 훨씬 빠름)
+    meta = GameReview._meta
+    quote = connection.ops.quote_name
+    table = quote(meta.db_table)
+    score, useful, pk = (quote(meta.get_field(name).column) for name in ('sentiment_score', 'is_useful', meta.pk.name))
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.executemany(
+            f"UPDATE {table} SET {score} = %s, {useful} = %s WHERE {pk} = %s",
+            [(r.sentiment_score, r.is_useful, r.pk) for r in reviews],
+        )
+
+
+def score_stored_reviews(appids=None, rescore=False, batch_size=2000, on_batch=None):
+    """ 저장된 리뷰를 묶음으로 점수 계산해서 저장 (묶음마다 executemany UPDATE 한 번). 처리한 개수 반환 """
+    qs = GameReview.objects.all()
+    if appids is not None:
+        qs = qs.filter(game_id__in=appids)
+    if not rescore:
+        qs = qs.filter(sentiment_score__isnull=True)
+
+    done = 0
+    last_id = 0
+    while True:
+        batch = list(
+            qs.filter(id__gt=last_id).order_by('id')
+            .only('id', 'content', 'voted_up', 'votes_up')[:batch_size]
+        )
+        if not batch:
+            return done
+        score_reviews(batch)
+        _save_scores(batch)
+        last_id = batch[-1].id
+        done += len(batch)
+        if on_batch:
+            on_batch(done)
+
+
+def game_sentiment(appid):
+    """ 게임 상세 페이지용 리뷰 감정 집계 (점수가 계산된 리뷰가 없으면 None) """
+    threshold = getattr(settings, 'REVIEW_SENTIMENT_THRESHOLD', 0.2)
+    stats = GameReview.objects.filter(game_id=appid, sentiment_score__isnull=False).aggregate(
+        count=Count('id'),
+        average=Avg('sentiment_score'),
+        positive=Count('id', filter=Q(sentiment_score__gte=threshold)),
+        negative=Count('id', filter=Q(sentiment_score__lte=-threshold)),
+        useful=Count('id', filter=Q(is_useful=True)),
+    )
+    if not stats['count']:
+        return None
+    return {
+        'review_count': stats['count'],
+        'average_score': round(stats['average'], 3),
+        'positive_ratio': round(stats['positive'] / stats['count'], 3),
+        'negative_ratio': round(stats['negative'] / stats['count'], 3),
+        'useful_count': stats['useful'],
+    }
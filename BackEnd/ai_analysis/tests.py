@@ -1,3 +1,202 @@
-from django.test import TestCase
+import asyncio
+import threading
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from games.models import Game
+from . import reviews, utils
+from .selection import estimate_tokens, select_reviews
+from .sentiment import game_sentiment, score_stored_reviews, score_texts
+from .models import AIResponseCache, GameReview
+
+
+class AIResponseCacheTests(TestCase):
+    """ 같은 모델/프롬프트는 한 번만 호출하고, 실패 응답은 저장하지 않음 """
+
+    def ask(self, user_prompt, **kwargs):
+        return async_to_sync(utils.get_ai_response)('gemini-2.5-flash-lite', '시스템', user_prompt, **kwargs)
+
+    def test_identical_prompt_hits_cache(self):
+        with mock.patch.object(utils, '_get_ai_response', mock.AsyncMock(side_effect=[('첫 응답', 120), ('새 응답', 130)])) as call:
+            self.assertEqual(self.ask('리뷰'), '첫 응답')
+            self.assertEqual(self.ask('리뷰'), '첫 응답')
+            self.assertEqual(call.await_count, 1)
+
+            # 강제 갱신은 캐시를 건너뛰고 새 응답으로 덮어씀
+            self.assertEqual(self.ask('리뷰', use_cache=False), '새 응답')
+            self.assertEqual(self.ask('리뷰'), '새 응답')
+        self.assertEqual(AIResponseCache.objects.get().hit_count, 2)
+
+    def test_failures_are_not_cached(self):
+        with mock.patch.object(utils, '_get_ai_response', mock.AsyncMock(side_effect=[RuntimeError, ('응답', 100)])) as call:
+            self.assertEqual(self.ask('리뷰'), '')
+            self.assertEqual(self.ask('리뷰'), '응답')
+            self.assertEqual(call.await_count, 2)
+
+    def test_eviction_keeps_recently_used(self):
+        now = timezone.now()
+        AIResponseCache.objects.bulk_create([
+            AIResponseCache(key=f'{i:064d}', model_name='m', response='r',
+                            expires_at=now + timedelta(days=1), last_used_at=now - timedelta(minutes=i))
+            for i in range(5)
+        ] + [AIResponseCache(key='x' * 64, model_name='m', response='r', expires_at=now, last_used_at=now)])
+        self.assertEqual(utils.evict_ai_response_cache(max_entries=2), 4)
+        self.assertEqual(set(AIResponseCache.objects.values_list('key', flat=True)), {f'{0:064d}', f'{1:064d}'})
+
+
+class AIGatewayTests(SimpleTestCase):
+    """ 전용 루프의 AI 호출이 멈춰도 요청 스레드는 AI_REQUEST_TIMEOUT 뒤에 실패로 돌아옴 """
+
+    @override_settings(AI_REQUEST_TIMEOUT=0.05)
+    def test_timeout_cancels_and_returns_default(self):
+        cancelled = threading.Event()
+
+        async def hang():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        self.assertEqual(utils.run_ai(hang(), default=(None, 0)), (None, 0))
+        self.assertTrue(cancelled.wait(1))
+
+
+class FakeSteamReviews:
+    """ appreviews 응답 흉내: 최신순 리뷰를 cursor 단위 페이지로 나눠서 돌려줌 """
+
+    def __init__(self, timestamps, page_size=3):
+        self.reviews = [
+            {'recommendationid': str(ts), 'review': f'리뷰 {ts}', 'language': 'koreana',
+             'timestamp_created': ts, 'voted_up': ts % 2 == 0, 'votes_up': ts % 5, 'author': {'playtime_at_review': 60}}
+            for ts in sorted(timestamps, reverse=True)
+        ]
+        self.page_size = page_size
+        self.requests = 0
+
+    def __call__(self, endpoint, params, path_params=None):
+        self.requests += 1
+        start = 0 if params['cursor'] == '*' else int(params['cursor'])
+        page = self.reviews[start:start + self.page_size]
+        cursor = str(start + len(page)) if page else params['cursor']
+        return mock.Mock(status_code=200, json=lambda: {'success': 1, 'reviews': page, 'cursor': cursor})
+
+    async def async_get(self, endpoint, params, path_params=None):
+        return self(endpoint, params, path_params)
+
+
+class ReviewIngestTests(TestCase):
+    """ cursor를 따라 전체 페이지를 저장하고, 증분 수집은 새 리뷰 페이지만 요청 """
+
+    def setUp(self):
+        Game.objects.create(appid=1, title='Game 1')
+
+    def test_full_then_incremental(self):
+        steam = FakeSteamReviews(range(1000, 1010))
+        with mock.patch.object(reviews, 'steam_get', steam):
+            self.assertEqual(reviews.ingest_game_reviews(1, ['korean']), 10)
+            self.assertEqual(steam.requests, 5) # 3+3+3+1, 마지막은 빈 페이지
+
+            steam.reviews = FakeSteamReviews(range(1000, 1012)).reviews
+            steam.requests = 0
+            self.assertEqual(reviews.ingest_game_reviews(1, ['korean']), 2)
+            self.assertEqual(steam.requests, 2) # 같은 시각에 작성된 리뷰를 놓치지 않도록 since 시각의 리뷰까지 읽음
+
+            # 전체 재수집도 이미 저장된 리뷰는 건너뜀
+            self.assertEqual(reviews.ingest_game_reviews(1, ['korean'], full=True), 0)
+        self.assertEqual(GameReview.objects.filter(game_id=1).count(), 12)
+        self.assertEqual(GameReview.objects.get(steam_review_id='1011').playtime_at_review, 60)
+
+    def test_ingested_reviews_are_found_by_requested_language(self):
+        # 스팀은 한국어 리뷰를 'koreana'로 돌려주지만 요청한 'korean'으로 저장/조회해야 함
+        steam = FakeSteamReviews(range(1000, 1004))
+        with mock.patch.object(reviews, 'steam_get', steam):
+            reviews.ingest_game_reviews(1, ['korean'])
+            self.assertEqual(
+                [review.steam_review_id for review in reviews.stored_reviews(1)], ['1003', '1002', '1001', '1000']
+            )
+
+            # 저장된 최신 리뷰 기준으로 증분 수집 (첫 페이지만 요청)
+            steam.requests = 0
+            self.assertEqual(reviews.ingest_game_reviews(1, ['korean']), 0)
+            self.assertEqual(steam.requests, 1)
+
+    def test_async_ingest_matches_sync(self):
+        steam = FakeSteamReviews(range(1000, 1010))
+        with mock.patch.object(reviews, 'async_steam_get', steam.async_get):
+            self.assertEqual(async_to_sync(reviews.async_ingest_game_reviews)(1, ['korean'], max_reviews=7), 7)
+            self.assertEqual(steam.requests, 3)
+        self.assertEqual(reviews.stored_reviews(1).count(), 7)
+
+
+class SentimentTests(TestCase):
+    """ 감정 사전 점수: 부정어/강조어 처리와 게임별 집계 """
+
+    def test_scores_follow_lexicon_and_negation(self):
+        scores, hits, _ = score_texts(['정말 재밌어요 강추', '좋지 않다', '노잼 망겜', 'not good', '그냥 그래요'])
+        self.assertGreater(scores[0], 0.5)
+        self.assertLess(scores[1], 0)
+        self.assertLess(scores[2], -0.5)
+        self.assertLess(scores[3], 0)
+        self.assertEqual((scores[4], hits[4]), (0, 0))
+
+    def test_ingested_reviews_are_scored(self):
+        Game.objects.create(appid=1, title='Game 1')
+        steam = FakeSteamReviews(range(1000, 1004))
+        steam.reviews[0]['review'] = '최악의 버그 환불'
+        with mock.patch.object(reviews, 'steam_get', steam):
+            reviews.ingest_game_reviews(1, ['korean'])
+        self.assertFalse(GameReview.objects.filter(sentiment_score__isnull=True).exists())
+        self.assertLess(GameReview.objects.get(steam_review_id='1003').sentiment_score, 0)
+        self.assertEqual(game_sentiment(1)['review_count'], 4)
+        self.assertIsNone(game_sentiment(2))
+
+    def test_score_stored_reviews_saves_scores(self):
+        Game.objects.bulk_create([Game(appid=1, title='Game 1'), Game(appid=2, title='Game 2')])
+        GameReview.objects.bulk_create([
+            GameReview(game_id=1, steam_review_id='1', content='정말 재밌어요 강추', votes_up=5),
+            GameReview(game_id=1, steam_review_id='2', content='최악의 버그 환불'),
+            GameReview(game_id=1, steam_review_id='3', content='그냥 그래요', sentiment_score=0.9),
+            GameReview(game_id=2, steam_review_id='4', content='노잼 망겜'),
+        ])
+        batches = []
+        self.assertEqual(score_stored_reviews(appids=[1], batch_size=1, on_batch=batches.append), 2)
+        self.assertEqual(batches, [1, 2])
+
+        saved = {r.steam_review_id: r for r in GameReview.objects.all()}
+        self.assertGreater(saved['1'].sentiment_score, 0.5)
+        self.assertTrue(saved['1'].is_useful)
+        self.assertLess(saved['2'].sentiment_score, 0)
+        self.assertEqual(saved['3'].sentiment_score, 0.9) # 이미 계산된 리뷰는 건너뜀
+        self.assertIsNone(saved['4'].sentiment_score)     # 다른 게임
+
+        self.assertEqual(score_stored_reviews(rescore=True), 4)
+        self.assertEqual(GameReview.objects.get(steam_review_id='3').sentiment_score, 0)
+
+
+class ReviewSelectionTests(TestCase):
+    """ 요약 프롬프트용 리뷰 선택: 중복/정보 없는 리뷰 제외, 토큰 예산 준수 """
+
+    def test_dedupes_and_drops_low_information(self):
+        reviews = [
+            '전투가 정말 재밌고 스토리도 훌륭합니다',
+            '전투가 정말 재밌고 스토리도 훌륭합니다!!',
+            'ㅋㅋㅋㅋㅋㅋㅋㅋㅋㅋㅋㅋ',
+            '추천',
+            '최적화가 안 좋아서 프레임이 자주 떨어져요',
+            '가격 대비 콘텐츠가 부족하지만 그래픽은 예쁩니다',
+        ]
+        selected = select_reviews(reviews)
+        self.assertEqual(len(selected), 3)
+        self.assertEqual(sum('스토리도 훌륭' in text for text in selected), 1)
+        self.assertEqual(selected, select_reviews(reviews)) # 같은 입력이면 같은 결과 (LLM 캐시 적중)
+
+    def test_respects_token_budget(self):
+        reviews = [f'{i}번째 리뷰: 맵 {i}의 레벨 디자인과 보스 {i * 7} 패턴이 인상적입니다 ' * 3 for i in range(60)]
+        selected = select_reviews(reviews, token_budget=500)
+        self.assertTrue(selected)
+        self.assertLessEqual(sum(estimate_tokens(text) for text in selected), 500)
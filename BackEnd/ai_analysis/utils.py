@@ -1,12 +1,25 @@
 ﻿# ai_analysis/utils.py
-import requests
+import asyncio
+import atexit
+import concurrent.futures
+import hashlib
+import importlib.util
 import json
 import re
+import threading
 import httpx
 import environ
 from pathlib import Path
+from datetime import timedelta
+from asgiref.sync import sync_to_async
 from openai import AsyncOpenAI
 from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+from games.eviction import evict_overflow
+from .models import AIResponseCache
+from .reviews import async_ingest_game_reviews, ingest_game_reviews, stored_reviews
+from .selection import estimate_tokens, select_reviews
 
 # 환경 변수 로드
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -18,15 +31,109 @@ if env_file.exists():
 # GMS_KEY 통합 사용
 GMS_KEY = env('GMS_KEY').strip()
 
+# --- AI 게이트웨이 공용 클라이언트 ---
+# httpx/OpenAI 비동기 클라이언트는 처음 사용한 이벤트 루프에 묶이므로,
+# 전용 백그라운드 루프 하나에서 클라이언트를 만들어 두고 모든 AI 호출을 그 루프에서 실행한다.
+# (호출마다 클라이언트/커넥션/TLS 핸드셰이크/이벤트 루프를 새로 만들지 않음)
+HTTP2_AVAILABLE = importlib.util.find_spec('h2') is not None
+
+
+class _AIGateway:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.loop = None
+        self.thread = None
+        self.http_client = None
+        self.gpt_client = None
+
+    def get_loop(self):
+        """ 전용 이벤트 루프 (처음 호출할 때 스레드와 함께 시작) """
+        if self.loop is None:
+            with self.lock:
+                if self.loop is None:
+                    loop = asyncio.new_event_loop()
+                    self.thread = threading.Thread(target=loop.run_forever, name='ai-gateway', daemon=True)
+                    self.thread.start()
+                    self.loop = loop
+                    atexit.register(self.close)
+        return self.loop
+
+    def get_http_client(self):
+        """ 루프 안에서만 호출. GMS 게이트웨이로 가는 모든 요청이 공유하는 keep-alive 커넥션 풀 """
+        if self.http_client is None:
+            self.http_client = httpx.AsyncClient(
+                http2=getattr(settings, 'AI_HTTP2', True) and HTTP2_AVAILABLE,
+                limits=httpx.Limits(
+                    max_connections=getattr(settings, 'AI_HTTP_MAX_CONNECTIONS', 20),
+                    max_keepalive_connections=getattr(settings, 'AI_HTTP_MAX_KEEPALIVE', 10),
+                    keepalive_expiry=getattr(settings, 'AI_HTTP_KEEPALIVE_EXPIRY', 60),
+                ),
+                timeout=getattr(settings, 'AI_HTTP_TIMEOUT', 30.0),
+            )
+        return self.http_client
+
+    def get_gpt_client(self):
+        if self.gpt_client is None:
+            self.gpt_client = AsyncOpenAI(
+                api_key=GMS_KEY,
+                base_url="https://gms.ssafy.io/gmsapi/api.openai.com/v1",
+                http_client=self.get_http_client(),
+                timeout=getattr(settings, 'AI_HTTP_TIMEOUT', 30.0),
+            )
+        return self.gpt_client
+
+    async def _aclose(self):
+        if self.gpt_client is not None:
+            await self.gpt_client.close()
+        if self.http_client is not None:
+            await self.http_client.aclose()
+        self.gpt_client = self.http_client = None
+
+    def close(self):
+        """ 커넥션을 정리하고 루프를 멈춤 (프로세스 종료 시 atexit으로 호출) """
+        with self.lock:
+            loop, self.loop = self.loop, None
+        if loop is None or not loop.is_running():
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._aclose(), loop).result(timeout=5)
+        except Exception as e:
+            print(f"❌ [AI Gateway] 종료 중 오류: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        self.thread.join(timeout=5)
+
+
+_gateway = _AIGateway()
+
+
+def run_ai(coro, default=None):
+    """
+    동기 코드(뷰, 백그라운드 작업)에서 AI 코루틴을 전용 루프에 넘기고 결과를 기다림 (async_to_sync 대신 사용)
+    AI_REQUEST_TIMEOUT초 안에 끝나지 않으면 작업을 취소하고 AI 호출 실패로 보고 default를 반환
+    """
+    future = asyncio.run_coroutine_threadsafe(coro, _gateway.get_loop())
+    try:
+        return future.result(timeout=getattr(settings, 'AI_REQUEST_TIMEOUT', 45.0))
+    except concurrent.futures.TimeoutError:
+        future.cancel()
+        print("❌ [AI Error] 응답 대기 시간 초과")
+        return default
+
+
+async def _on_gateway(coro):
+    """ 다른 이벤트 루프(asyncio.run, ASGI 등)에서 호출되어도 공용 클라이언트가 있는 전용 루프에서 실행 """
+    loop = _gateway.get_loop()
+    if asyncio.get_running_loop() is loop:
+        return await coro
+    return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+
 def get_gpt_client():
-    """GPT 계열 전용 OpenAI SDK 클라이언트 생성"""
-    return AsyncOpenAI(
-        api_key=GMS_KEY,
-        base_url="https://gms.ssafy.io/gmsapi/api.openai.com/v1"
-    )
+    """GPT 계열 전용 OpenAI SDK 클라이언트 (공용, 전용 루프 안에서만 사용)"""
+    return _gateway.get_gpt_client()
 
 async def call_gemini_native(model_name, system_prompt, user_prompt):
-    """Gemini 계열 전용 직접 HTTP 호출 (URL 오염 완벽 차단)"""
+    """Gemini 계열 전용 직접 HTTP 호출 (URL 오염 완벽 차단). 반환값: (응답 텍스트, 사용 토큰 수)"""
     # URL을 한 줄로 정의하여 특수기호 삽입 방지
     url = f"https://gms.ssafy.io/gmsapi/generativelanguage.googleapis.com/v1beta/models/{model_name}:generateContent?key={GMS_KEY}"
     
@@ -34,31 +141,118 @@ async def call_gemini_native(model_name, system_prompt, user_prompt):
         "contents": [{"parts": [{"text": f"{system_prompt}\n\n{user_prompt}"}]}]
     }
     
-    async with httpx.AsyncClient() as client:
-        response = await client.post(url.strip(), json=payload, timeout=30.0)
-        response.raise_for_status()
-        res_data = response.json()
-        return res_data['candidates'][0]['content']['parts'][0]['text'].strip()
-
-async def get_ai_response(model_name, system_prompt, user_prompt):
-    """[통합 엔드포인트] 모든 AI 기능을 이 함수 하나로 처리"""
+    response = await _gateway.get_http_client().post(url.strip(), json=payload)
+    response.raise_for_status()
+    res_data = response.json()
+    tokens = (res_data.get('usageMetadata') or {}).get('totalTokenCount', 0)
+    return res_data['candidates'][0]['content']['parts'][0]['text'].strip(), tokens
+
+async def _get_ai_response(model_name, system_prompt, user_prompt):
+    if 'gpt' in model_name:
+        client = get_gpt_client()
+        response = await client.chat.completions.create(
+            model=model_name,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+        )
+        tokens = response.usage.total_tokens if response.usage else 0
+        return response.choices[0].message.content.strip(), tokens
+    elif 'gemini' in model_name:
+        return await call_gemini_native(model_name, system_prompt, user_prompt)
+    raise ValueError(f"Unsupported model: {model_name}")
+
+# --- LLM 응답 캐시 (모델 + 프롬프트의 해시 → 응답) ---
+_cache_stats = {'hits': 0, 'misses': 0}
+_cache_lock = threading.Lock()
+_writes_since_eviction = 0
+
+
+def ai_cache_key(model_name, system_prompt, user_prompt):
+    payload = json.dumps([model_name, system_prompt, user_prompt], ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def ai_cache_stats():
+    """ 현재 프로세스의 캐시 적중/실패 횟수 """
+    with _cache_lock:
+        stats = dict(_cache_stats)
+    total = stats['hits'] + stats['misses']
+    stats['hit_rate'] = stats['hits'] / total if total else 0.0
+    return stats
+
+
+def _count(name):
+    with _cache_lock:
+        _cache_stats[name] += 1
+
+
+def get_cached_response(key):
+    """ 유효한 캐시 응답이 있으면 반환하고 사용 시각/횟수를 갱신, 없으면 None """
+    now = timezone.now()
+    entry = AIResponseCache.objects.filter(key=key, expires_at__gt=now).first()
+    if entry is None:
+        return None
+    AIResponseCache.objects.filter(key=key).update(last_used_at=now, hit_count=F('hit_count') + 1)
+    return entry.response
+
+
+def store_response(key, model_name, response):
+    now = timezone.now()
+    ttl = getattr(settings, 'AI_RESPONSE_CACHE_TTL', timedelta(days=7))
+    AIResponseCache.objects.update_or_create(
+        key=key,
+        defaults={'model_name': model_name, 'response': response, 'expires_at': now + ttl, 'last_used_at': now},
+    )
+    global _writes_since_eviction
+    with _cache_lock:
+        _writes_since_eviction += 1
+        evict = _writes_since_eviction >= getattr(settings, 'AI_RESPONSE_CACHE_EVICT_EVERY', 50)
+        if evict:
+            _writes_since_eviction = 0
+    if evict:
+        evict_ai_response_cache()
+
+
+def evict_ai_response_cache(max_entries=None):
+    """ 만료된 응답과, 상한을 넘는 만큼 가장 오래 안 쓰인 응답을 삭제. 삭제한 개수 반환 """
+    max_entries = max_entries or getattr(settings, 'AI_RESPONSE_CACHE_MAX_ENTRIES', 5000)
+    deleted, _ = AIResponseCache.objects.filter(expires_at__lte=timezone.now()).delete()
+    return deleted + evict_overflow(AIResponseCache.objects.all(), 'last_used_at', max_entries)
+
+
+async def get_ai_response_with_usage(model_name, system_prompt, user_prompt, use_cache=True):
+    """
+    get_ai_response와 같지만 (응답, 이번 호출에서 실제로 사용한 토큰 수)를 반환.
+    캐시에서 돌려준 응답은 모델을 호출하지 않았으므로 0토큰.
+    """
+    key = ai_cache_key(model_name, system_prompt, user_prompt)
+    if use_cache:
+        cached = await sync_to_async(get_cached_response)(key)
+        if cached is not None:
+            _count('hits')
+            return cached, 0
+        _count('misses')
+
     try:
-        if 'gpt' in model_name:
-            client = get_gpt_client()
-            response = await client.chat.completions.create(
-                model=model_name,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-            )
-            return response.choices[0].message.content.strip()
-        elif 'gemini' in model_name:
-            return await call_gemini_native(model_name, system_prompt, user_prompt)
-        raise ValueError(f"Unsupported model: {model_name}")
+        response, tokens = await _on_gateway(_get_ai_response(model_name, system_prompt, user_prompt))
     except Exception as e:
         print(f"❌ [AI Error] {model_name}: {e}")
-        return ""
+        return "", 0
+
+    # 실패(빈 응답)는 저장하지 않음 → 다음 호출에서 다시 시도
+    if response:
+        await sync_to_async(store_response)(key, model_name, response)
+    return response, tokens
+
+async def get_ai_response(model_name, system_prompt, user_prompt, use_cache=True):
+    """
+    [통합 엔드포인트] 모든 AI 기능을 이 함수 하나로 처리.
+    같은 모델/프롬프트의 응답은 캐시에서 돌려주며, use_cache=False면 캐시를 건너뛰고 새로 받은 응답으로 갱신한다.
+    """
+    response, _ = await get_ai_response_with_usage(model_name, system_prompt, user_prompt, use_cache=use_cache)
+    return response
 
 def parse_ai_json(raw_content):
     """AI 응답 텍스트에서 JSON을 안전하게 추출"""
@@ -71,24 +265,38 @@ def parse_ai_json(raw_content):
     except: return None
 
 # --- 3번 기능: 리뷰 수집 및 요약 관련 ---
+REVIEW_SUMMARY_MODEL = "gemini-2.5-flash-lite"
+# 요약 응답(200자 내외 JSON)에 잡아 두는 출력 토큰 수
+REVIEW_SUMMARY_OUTPUT_TOKENS = 400
+
+def _summary_candidates(appid):
+    # 후보는 넉넉히 가져오고 프롬프트에 넣을 리뷰는 review_summary_prompts에서 고름
+    return [review.content for review in stored_reviews(appid, limit=getattr(settings, 'REVIEW_SUMMARY_CANDIDATES', 150))]
+
 def fetch_steam_reviews(appid):
-    """스팀 API에서 한국어 리뷰 수집"""
-    url = f"https://store.steampowered.com/appreviews/{appid}?json=1&language=korean&num_per_page=30&purchase_type=all"
+    """새 한국어 리뷰를 GameReview에 저장한 뒤 요약에 쓸 리뷰 본문을 반환 (수집 실패 시 저장된 리뷰만 사용)"""
     try:
-        response = requests.get(url, timeout=5)
-        if response.status_code == 200:
-            return [r['review'] for r in response.json().get('reviews', []) if r.get('review')]
+        ingest_game_reviews(appid, languages=['korean'], max_reviews=getattr(settings, 'STEAM_REVIEW_ON_DEMAND_MAX', 200))
     except Exception as e:
         print(f"Review Fetch Error: {e}")
-    return []
+    return _summary_candidates(appid)
 
-async def get_ai_review_summary(reviews):
-    """리뷰 요약 실행 (통합 함수 사용)"""
-    print(f"🔍 [DEBUG] 요약 시작 - 리뷰 개수: {len(reviews)}")
-    if not reviews: 
-        return "표시할 리뷰가 없습니다."
-    
-    combined_text = "\n".join(reviews[:30])
+async def async_fetch_steam_reviews(appid):
+    """fetch_steam_reviews의 비동기 버전 (여러 게임의 리뷰를 한 이벤트 루프에서 동시에 수집)"""
+    try:
+        await async_ingest_game_reviews(
+            appid, languages=['korean'], max_reviews=getattr(settings, 'STEAM_REVIEW_ON_DEMAND_MAX', 200)
+        )
+    except Exception as e:
+        print(f"Review Fetch Error: {e}")
+    return await sync_to_async(_summary_candidates)(appid)
+
+def review_summary_prompts(reviews):
+    """리뷰 요약용 (시스템 프롬프트, 유저 프롬프트). 중복/정보 없는 리뷰를 걸러 토큰 예산 안에서 고르고, 남는 리뷰가 없으면 None"""
+    selected = select_reviews(reviews)
+    if not selected:
+        return None
+    combined_text = "\n".join(selected)
     system_prompt = (
         "너는 게임 전문 칼럼니스트야. 제공된 스팀 유저 리뷰들을 읽고, "
         "게임의 전반적인 특징, 장점, 단점을 모두 포함한 하나의 완성된 요약문을 작성해줘. "
@@ -96,8 +304,17 @@ async def get_ai_review_summary(reviews):
         "반드시 한국어로 답변하고, 분량은 200자 내외로, 결과는 JSON 형식 {'summary': '내용'}으로 반환해."
     )
     user_prompt = f"다음은 유저들의 실제 리뷰 내용들이야:\n\n{combined_text}"
+    return system_prompt, user_prompt
+
+async def get_ai_review_summary(reviews):
+    """리뷰 요약 실행 (통합 함수 사용). 반환값: (요약문, 사용 토큰 수)"""
+    print(f"🔍 [DEBUG] 요약 시작 - 리뷰 개수: {len(reviews)}")
+    prompts = review_summary_prompts(reviews) if reviews else None
+    if not prompts: 
+        return "표시할 리뷰가 없습니다.", 0
     
     # 모델은 상황에 맞게 변경 가능 (예: gpt-5-nano)
-    raw_res = await get_ai_response("gemini-2.5-flash-lite", system_prompt, user_prompt)
+    raw_res, tokens = await get_ai_response_with_usage(REVIEW_SUMMARY_MODEL, *prompts)
     result = parse_ai_json(raw_res)
-    return result.get('summary', "요약을 생성할 수 없습니다.") if result else "분석 결과가 유효하지 않습니다."
\ No newline at end of file
+    summary = result.get('summary', "요약을 생성할 수 없습니다.") if result else "분석 결과가 유효하지 않습니다."
+    return summary, tokens
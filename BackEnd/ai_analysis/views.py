@@ -1,6 +1,5 @@
 #ai_analysis/views.py
 from django.shortcuts import get_object_or_404
-from asgiref.sync import async_to_sync
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
@@ -9,7 +8,7 @@ from rest_framework.permissions import IsAuthenticated
 from games.models import Game, UserGameLibrary
 from .models import AIAnalysisLog
 from .serializers import AIAnalysisLogSerializer
-from .utils import get_ai_response, parse_ai_json
+from .utils import get_ai_response, parse_ai_json, run_ai
 
 class GameRecommendationView(APIView):
     permission_classes = [IsAuthenticated]
@@ -36,7 +35,7 @@ class GameRecommendationView(APIView):
 
         try:
             # 3. AI 분석 실행 (gpt-5-nano 사용)
-            result_json = async_to_sync(self.get_ai_analysis)(game_list_str, 'gemini-2.5-flash-lite')
+            result_json = run_ai(self.get_ai_analysis(game_list_str, 'gemini-2.5-flash-lite', use_cache=not force_update))
             
             if not result_json:
                 return Response({"error": "AI 분석 결과 파싱에 실패했습니다."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -70,7 +69,7 @@ class GameRecommendationView(APIView):
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
-    async def get_ai_analysis(self, game_str, model_name):
+    async def get_ai_analysis(self, game_str, model_name, use_cache=True):
         system_prompt = (
             "당신은 'Friday'라는 이름의 AI 게임 분석가입니다. 긍정적이고 활기찬 말투를 쓰세요. "
             "유저의 게임 목록을 보고 성향을 분석한 뒤, 추천 게임 7개를 골라주세요. "
@@ -87,6 +86,6 @@ class GameRecommendationView(APIView):
         )
         user_prompt = f"안녕 Friday! 내가 즐겨하는 게임들이야: [{game_str}]. 성향 분석과 추천 부탁해!"
         
-        # 통합 유틸리티 함수 사용
-        raw_res = await get_ai_response(model_name, system_prompt, user_prompt)
+        # 통합 유틸리티 함수 사용 (다시 분석 요청이면 캐시된 응답 대신 새로 받음)
+        raw_res = await get_ai_response(model_name, system_prompt, user_prompt, use_cache=use_cache)
         return parse_ai_json(raw_res)
\ No newline at end of file
@@ -46,6 +46,11 @@ class Review(models.Model):
     class Meta:
         # 한 유저가 하나의 게임에 대해 중복 리뷰 작성 불가
         unique_together = ('user', 'game')
+        indexes = [
+            # 리뷰 목록 최신순 조회, 게임별 리뷰 최신순 조회
+            models.Index(fields=['-created_at'], name='review_created_idx'),
+            models.Index(fields=['game', '-created_at'], name='review_game_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user} - {self.game.title} Review"
\ No newline at end of file
@@ -0,0 +1,262 @@
+# games/autocomplete.py
+"""
+검색어 자동완성용 프로세스 메모리 색인.
+- 정규화한 제목을 정렬된 리스트로 보관 → bisect로 접두어 구간을 바로 찾음
+- 제목의 3글자 조각(trigram)마다 게임 위치를 인기 순 array로 보관 → 중간 일치
+- 짧은 접두어(1~2글자)는 인기 순 top-k를, 긴 접두어 구간은 블록별 top-k를 미리 계산
+검색 결과가 없을 때의 오타 교정(fuzzy_search)도 같은 trigram posting list를 사용한다.
+색인은 처음 요청 때 백그라운드에서 Game 테이블로 만들고 (그동안 자동완성은 DB 검색, 오타 교정은 빈 결과), 카탈로그 버전(games.counts)이 바뀌면 백그라운드에서 다시 만든다.
+"""
+import heapq
+from collections import Counter
+import threading
+import time
+import unicodedata
+from array import array
+from bisect import bisect_left
+
+from django.conf import settings
+from django.db.models import Count
+
+from .counts import catalog_version
+from .models import Game, UserGameLibrary
+from .search import search_games
+
+NGRAM = 3
+
+# 오타 교정 후보를 모을 때 trigram 하나당 확인할 최대 게임 수 (posting list는 인기 순이라 앞쪽만)
+FUZZY_MAX_POSTINGS = 5000
+# trigram 유사도 상위 중 편집 거리로 다시 비교할 후보 수
+FUZZY_RERANK_CANDIDATES = 20
+
+
+def normalize_title(text):
+    """ 대소문자, 전각/반각, 연속 공백 차이를 없앤 비교용 문자열 """
+    return ' '.join(unicodedata.normalize('NFKC', text).casefold().split())
+
+
+def _ngrams(text):
+    return {text[i:i + NGRAM] for i in range(len(text) - NGRAM + 1)}
+
+
+def substring_edit_distance(query, text):
+    """ text의 어느 부분 문자열과 비교했을 때 가장 작은 편집 거리 (시작/끝 위치 자유) """
+    previous = [0] * (len(text) + 1)
+    for i, cq in enumerate(query, 1):
+        current = [i]
+        for j, ct in enumerate(text, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (cq != ct)))
+        previous = current
+    return min(previous)
+
+
+def edit_similarity(query, title):
+    """ 1 - (제목 안에서 가장 비슷한 부분과의 편집 거리 / 검색어 길이) """
+    return 1 - substring_edit_distance(query, title) / len(query)
+
+
+class TitleIndex:
+    """ 정렬된 제목 배열 + trigram posting list. 만든 뒤에는 읽기 전용이라 스레드 간 공유해도 안전 """
+
+    # 접두어 구간이 이보다 길면 블록별로 미리 골라 둔 상위 결과만 비교
+    BLOCK_SIZE = 256
+
+    def __init__(self, rows, version=None, top_prefix_length=2, top_k=20):
+        # rows: (appid, 제목, 인기 점수)
+        rows = sorted(
+            ((normalize_title(title), appid, title, score) for appid, title, score in rows if title),
+            key=lambda row: (row[0], row[1]),
+        )
+        self.version = version
+        self.built_at = time.monotonic()
+        self.keys = [row[0] for row in rows]
+        self.appids = array('q', (row[1] for row in rows))
+        self.titles = [row[2] for row in rows]
+
+        # 인기 순위 (0이 가장 인기, 동점이면 제목 순). 결과 비교는 모두 이 순위로 한다
+        by_popularity = sorted(range(len(rows)), key=lambda i: (-rows[i][3], i))
+        self.rank = array('I', bytes(4 * len(rows)))
+        for rank, i in enumerate(by_popularity):
+            self.rank[i] = rank
+
+        # posting list를 인기 순으로 저장 → 중간 일치는 앞에서부터 확인하다 limit개가 차면 멈춤
+        postings = {}
+        for i in by_popularity:
+            for gram in _ngrams(self.keys[i]):
+                postings.setdefault(gram, array('I')).append(i)
+        self.postings = postings
+        self.gram_counts = array('H', (min(len(_ngrams(key)), 65535) for key in self.keys))
+
+        # 블록(BLOCK_SIZE개씩)별 인기 순 상위 top_k
+        self.top_k = top_k
+        self.block_top = [
+            array('I', self._rank(range(start, min(start + self.BLOCK_SIZE, len(rows))), top_k))
+            for start in range(0, len(rows), self.BLOCK_SIZE)
+        ]
+
+        # 짧은 접두어(결과가 가장 많음)별 인기 순 상위 top_k
+        self.top_prefix_length = top_prefix_length
+        buckets = {}
+        for i, key in enumerate(self.keys):
+            for length in range(1, min(top_prefix_length, len(key)) + 1):
+                buckets.setdefault(key[:length], []).append(i)
+        self.top_by_prefix = {
+            prefix: array('I', self._rank(positions, top_k)) for prefix, positions in buckets.items()
+        }
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _rank(self, positions, k):
+        return heapq.nsmallest(k, positions, key=self.rank.__getitem__)
+
+    def _prefix_matches(self, key, limit):
+        lo = bisect_left(self.keys, key)
+        # key 뒤에 올 수 있는 가장 큰 문자를 붙여서 접두어 구간의 끝을 찾음
+        hi = bisect_left(self.keys, key + '\U0010ffff', lo)
+        if hi - lo <= 2 * self.BLOCK_SIZE or limit > self.top_k:
+            return self._rank(range(lo, hi), limit)
+
+        # 양 끝의 걸친 블록은 직접, 가운데 블록은 미리 골라 둔 상위 결과만 후보로
+        first_block = -(-lo // self.BLOCK_SIZE)
+        last_block = hi // self.BLOCK_SIZE
+        candidates = list(range(lo, first_block * self.BLOCK_SIZE))
+        candidates += range(last_block * self.BLOCK_SIZE, hi)
+        for block in range(first_block, last_block):
+            candidates += self.block_top[block]
+        return self._rank(candidates, limit)
+
+    def _infix_matches(self, key, limit, exclude):
+        grams = _ngrams(key)
+        postings = [self.postings.get(gram) for gram in grams]
+        if not postings or None in postings:
+            return []
+        # 가장 짧은 posting list를 인기 순으로 훑으면서 실제 부분 문자열인지 확인
+        matches = []
+        for i in min(postings, key=len):
+            if i not in exclude and key in self.keys[i]:
+                matches.append(i)
+                if len(matches) >= limit:
+                    break
+        return matches
+
+    def search(self, query, limit=10):
+        """ 접두어 일치를 먼저, 그다음 중간 일치를 인기 순으로. 반환값: [(appid, 제목), ...] """
+        key = normalize_title(query)
+        if not key:
+            return []
+
+        if len(key) <= self.top_prefix_length and limit <= self.top_k:
+            results = list(self.top_by_prefix.get(key, ()))[:limit]
+        else:
+            results = self._prefix_matches(key, limit)
+
+        if len(results) < limit and len(key) >= NGRAM:
+            results += self._infix_matches(key, limit - len(results), set(results))
+        return [(self.appids[i], self.titles[i]) for i in results]
+
+    def fuzzy(self, query, limit=5):
+        """
+        오타가 섞인 검색어와 비슷한 제목. trigram 유사도(Jaccard)로 후보를 고른 뒤 편집 거리로 다시 정렬.
+        반환값: [(appid, 제목, 점수 0~1), ...] 점수 내림차순
+        """
+        key = normalize_title(query)
+        grams = _ngrams(key)
+        if not grams:
+            return []
+
+        shared = Counter()
+        for gram in grams:
+            postings = self.postings.get(gram)
+            if postings is not None:
+                shared.update(postings[:FUZZY_MAX_POSTINGS])
+        if not shared:
+            return []
+
+        size = len(grams)
+        gram_counts = self.gram_counts
+        candidates = heapq.nlargest(
+            FUZZY_RERANK_CANDIDATES, shared.items(),
+            key=lambda item: item[1] / (size + gram_counts[item[0]] - item[1]),
+        )
+
+        scored = []
+        for i, count in candidates:
+            jaccard = count / (size + gram_counts[i] - count)
+            score = 0.4 * jaccard + 0.6 * edit_similarity(key, self.keys[i])
+            scored.append((score, i))
+        scored.sort(key=lambda item: (-item[0], self.rank[item[1]]))
+        return [(self.appids[i], self.titles[i], round(score, 3)) for score, i in scored[:limit]]
+
+
+def build_title_index(version=None):
+    """ Game 테이블에서 색인을 만듦. 인기 점수 = 보유 유저 수 × 10 + 상세 페이지 조회 수 """
+    owners = dict(
+        UserGameLibrary.objects.values_list('game_id').annotate(n=Count('id')).order_by()
+    )
+    rows = (
+        (appid, title, owners.get(appid, 0) * 10 + view_count)
+        for appid, title, view_count in Game.objects.values_list('appid', 'title', 'view_count').iterator(chunk_size=5000)
+    )
+    return TitleIndex(
+        rows,
+        version=version,
+        top_prefix_length=getattr(settings, 'AUTOCOMPLETE_TOP_PREFIX_LENGTH', 2),
+        top_k=getattr(settings, 'AUTOCOMPLETE_MAX_RESULTS', 20),
+    )
+
+
+_index = None
+_index_lock = threading.Lock()
+_rebuilding = False
+
+
+def _rebuild(version):
+    global _index, _rebuilding
+    try:
+        _index = build_title_index(version)
+    finally:
+        _rebuilding = False
+
+
+def _schedule_rebuild(version):
+    """ 이미 만드는 중이 아니면 백그라운드에서 색인을 (다시) 만듦 """
+    global _rebuilding
+    with _index_lock:
+        if _rebuilding:
+            return
+        _rebuilding = True
+    from .tasks import submit_background
+    submit_background(_rebuild, version)
+
+
+def get_title_index():
+    """
+    현재 프로세스의 색인. 아직 없으면 백그라운드에서 만들기 시작하고 None을 반환 (그동안은 DB 검색으로 대신함)
+    이후 카탈로그 버전이 바뀌었으면 기존 색인으로 응답하면서 백그라운드에서 다시 만든다.
+    (게임 정보 수집 중에는 버전이 자주 바뀌므로 AUTOCOMPLETE_REFRESH_INTERVAL 안에는 다시 만들지 않음)
+    """
+    version = catalog_version()
+    index = _index
+    if index is None:
+        _schedule_rebuild(version)
+        return None
+
+    interval = getattr(settings, 'AUTOCOMPLETE_REFRESH_INTERVAL', 60)
+    if index.version != version and time.monotonic() - index.built_at >= interval:
+        _schedule_rebuild(version)
+    return index
+
+
+def autocomplete(query, limit=10):
+    index = get_title_index()
+    if index is None:
+        # 첫 색인이 만들어지는 동안은 FTS/ORM 제목 검색(접두어 일치 우선)으로 응답
+        _, games = search_games(query, 0, limit)
+        return [(game.appid, game.title) for game in games]
+    return index.search(query, limit)
+
+
+def fuzzy_search(query, limit=5):
+    index = get_title_index()
+    return index.fuzzy(query, limit) if index is not None else []
@@ -0,0 +1,107 @@
+# games/counts.py
+import hashlib
+import json
+import math
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+
+from .models import Game
+
+CATALOG_VERSION_KEY = 'games:catalog_version'
+
+
+def catalog_version():
+    """ 게임 카탈로그가 바뀔 때마다 올라가는 번호 (캐시 키에 포함해서 한 번에 무효화) """
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        cache.add(CATALOG_VERSION_KEY, 1, timeout=None)
+        version = cache.get(CATALOG_VERSION_KEY, 1)
+    return version
+
+
+def bump_catalog_version():
+    """ 게임이 추가/수정/삭제되었을 때 호출 (bulk 작업은 시그널이 없으므로 직접 호출) """
+    try:
+        return cache.incr(CATALOG_VERSION_KEY)
+    except ValueError:
+        cache.add(CATALOG_VERSION_KEY, 2, timeout=None)
+        return cache.get(CATALOG_VERSION_KEY, 2)
+
+
+def _count_key(kind, filters):
+    # 필터 조합을 정규화(정렬된 장르, 가격 범위)해서 같은 조건은 같은 키가 되도록
+    raw = json.dumps(filters, sort_keys=True, separators=(',', ':'), default=str)
+    digest = hashlib.sha1(raw.encode()).hexdigest()
+    return f'games:count:{kind}:v{catalog_version()}:{digest}'
+
+
+def normalize_filters(genres=None, min_price=None, max_price=None):
+    return {
+        'genres': sorted(set(genres or [])),
+        'min_price': min_price,
+        'max_price': max_price,
+    }
+
+
+def cached_count(qs, filters, kind='exact'):
+    """ qs.count()를 필터 조합 + 카탈로그 버전 기준으로 캐시 """
+    key = _count_key(kind, filters)
+    count = cache.get(key)
+    if count is None:
+        count = qs.count()
+        cache.set(key, count, getattr(settings, 'GAME_COUNT_CACHE_TTL', 300))
+    return count
+
+
+def catalog_size():
+    return cached_count(Game.objects.all(), {}, kind='catalog')
+
+
+# 표본 추출용 해시: (appid × SAMPLE_HASH_MULTIPLIER) % SAMPLE_HASH_MODULUS
+# appid 순서(= 등록 시기)와 무관하게 고르게 흩어지도록 소수로 나눈 나머지를 씀 (스팀 appid는 대부분 10의 배수)
+SAMPLE_HASH_MODULUS = 1000003
+SAMPLE_HASH_MULTIPLIER = 618034
+
+
+def _sample_filter(qs, sample_size, total):
+    """ 전체 total개 중 약 sample_size개가 고르게 뽑히도록 appid 해시로 거른 qs """
+    threshold = math.ceil(SAMPLE_HASH_MODULUS * sample_size / total)
+    return qs.alias(
+        sample_hash=(F('appid') * SAMPLE_HASH_MULTIPLIER) % SAMPLE_HASH_MODULUS
+    ).filter(sample_hash__lt=threshold), threshold
+
+
+def approximate_count(qs, filters):
+    """
+    결과가 적으면 정확한 개수, 많으면 추정치를 반환. 반환값: (개수, 추정치 여부)
+    - LIMIT을 건 count로 EXACT_LIMIT개까지만 세어 보고
+    - 넘으면 appid 해시로 고르게 뽑은 표본에서의 비율 × 전체 게임 수로 추정
+      (appid 앞쪽만 보면 오래된 게임에 치우쳐 가격/장르/출시일 비율이 틀어짐)
+    """
+    key = _count_key('approx', filters)
+    cached = cache.get(key)
+    if cached is not None:
+        return tuple(cached)
+
+    exact_limit = getattr(settings, 'GAME_COUNT_EXACT_LIMIT', 10000)
+    bounded = qs.order_by().values('pk')[:exact_limit + 1].count()
+    if bounded <= exact_limit:
+        result = (bounded, False)
+    else:
+        sample_size = getattr(settings, 'GAME_COUNT_SAMPLE_SIZE', 20000)
+        total = catalog_size()
+        if total <= sample_size:
+            # 카탈로그 전체가 표본보다 작으면 그냥 셈
+            result = (qs.count(), False)
+        else:
+            sample, threshold = _sample_filter(Game.objects.all(), sample_size, total)
+            sampled = cached_count(sample, {'threshold': threshold}, kind='sample')
+            matched = _sample_filter(qs, sample_size, total)[0].order_by().count()
+            estimate = max(bounded, int(matched / max(sampled, 1) * total))
+            # 추정치임이 드러나도록 유효숫자 2자리로 반올림
+            digits = max(len(str(estimate)) - 2, 0)
+            result = (round(estimate, -digits), True)
+
+    cache.set(key, list(result), getattr(settings, 'GAME_COUNT_CACHE_TTL', 300))
+    return result
@@ -0,0 +1,21 @@
+# games/eviction.py
+from django.db.models import Q
+
+
+def evict_overflow(queryset, time_field, max_entries):
+    """
+    time_field가 최근인 순(같으면 pk가 큰 순)으로 max_entries개만 남기고 나머지를 삭제. 삭제한 개수 반환.
+    남길 마지막 경계 행 하나만 읽고 그보다 오래된 행을 조건 DELETE 한 번으로 지우므로
+    정리할 행이 아무리 많아도 키 목록을 메모리에 올리거나 IN (...) 바인딩 개수 제한에 걸리지 않는다.
+    """
+    pk = queryset.model._meta.pk.name
+    boundary = list(
+        queryset.order_by(f'-{time_field}', f'-{pk}').values_list(time_field, pk)[max_entries:max_entries + 1]
+    )
+    if not boundary:
+        return 0
+    cutoff_time, cutoff_pk = boundary[0]
+    deleted, _ = queryset.filter(
+        Q(**{f'{time_field}__lt': cutoff_time}) | Q(**{time_field: cutoff_time, f'{pk}__lte': cutoff_pk})
+    ).delete()
+    return deleted
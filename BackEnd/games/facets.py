@@ -0,0 +1,210 @@
+# games/facets.py
+"""
+게임 목록 필터 패널용 장르/가격대별 게임 수.
+GameFacetCount 집계 테이블에 (장르, 가격대) → 게임 수를 미리 계산해 두고,
+게임의 가격이나 장르가 바뀌면 변경 전/후 키를 비교해서 달라진 (장르, 가격대) 행의 개수만 ±1씩 고친다.
+(전체 재계산은 대량 적재 후나 rebuild_game_facets 명령에서만)
+집계 테이블로 답할 수 없는 조합(장르 여러 개 교집합, 가격대 경계와 다른 가격 범위)은
+그룹 쿼리로 한 번에 센다.
+"""
+from collections import Counter
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Case, CharField, Count, F, Value, When
+from django.db.models.functions import Greatest
+
+from .models import Game, GameFacetCount
+from .counts import _count_key
+
+DEFAULT_PRICE_BUCKETS = [
+    ('free', 0, 0),
+    ('under_10000', 1, 9999),
+    ('under_30000', 10000, 29999),
+    ('under_50000', 30000, 49999),
+    ('over_50000', 50000, None),
+]
+
+
+def price_buckets():
+    return getattr(settings, 'GAME_PRICE_BUCKETS', DEFAULT_PRICE_BUCKETS)
+
+
+def price_bucket(price):
+    """ 가격이 속한 가격대 키 (어느 가격대에도 속하지 않으면 None) """
+    for key, low, high in price_buckets():
+        if price >= low and (high is None or price <= high):
+            return key
+    return None
+
+
+def _bucket_expression(field='price'):
+    whens = []
+    for key, low, high in price_buckets():
+        bounds = {f'{field}__gte': low}
+        if high is not None:
+            bounds[f'{field}__lte'] = high
+        whens.append(When(**bounds, then=Value(key)))
+    return Case(*whens, default=Value(''), output_field=CharField())
+
+
+def _models(apps=None):
+    if apps is None:
+        return Game, GameFacetCount
+    return apps.get_model('games', 'Game'), apps.get_model('games', 'GameFacetCount')
+
+
+def facet_keys_for(appids):
+    """ 게임별로 현재 집계되어 있는 (장르 id 또는 None, 가격대) 키 집합 {appid: {키, ...}} """
+    appids = list(appids)
+    if not appids:
+        return {}
+    buckets = {
+        appid: price_bucket(price)
+        for appid, price in Game.objects.filter(appid__in=appids).values_list('appid', 'price')
+    }
+    keys = {appid: {(None, bucket)} for appid, bucket in buckets.items() if bucket}
+    Through = Game.genres.through
+    for game_id, genre_id in Through.objects.filter(game_id__in=appids).values_list('game_id', 'genre_id'):
+        if game_id in keys:
+            keys[game_id].add((genre_id, buckets[game_id]))
+    return keys
+
+
+def apply_facet_deltas(before, after):
+    """
+    변경 전/후 facet_keys_for 결과를 비교해서 달라진 (장르, 가격대) 행만 게임 수를 ±로 갱신.
+    가격이나 장르가 바뀌어 집계가 달라졌으면 True를 반환.
+    """
+    deltas = Counter()
+    for keys in after.values():
+        deltas.update(keys)
+    for keys in before.values():
+        deltas.subtract(keys)
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    if not deltas:
+        return False
+
+    with transaction.atomic():
+        for (genre_id, bucket), delta in deltas.items():
+            rows = GameFacetCount.objects.filter(genre_id=genre_id, price_bucket=bucket)
+            if rows.update(count=Greatest(F('count') + delta, 0)) or delta < 0:
+                continue
+            try:
+                with transaction.atomic():
+                    GameFacetCount.objects.create(genre_id=genre_id, price_bucket=bucket, count=delta)
+            except IntegrityError:
+                # 같은 키의 행을 다른 요청이 먼저 만듦 → 그 행에 더함
+                rows.update(count=F('count') + delta)
+        # 전체 재계산 결과와 같도록 0이 된 행은 지움
+        GameFacetCount.objects.filter(count=0).delete()
+    return True
+
+
+def rebuild_facet_counts(apps=None):
+    """ 집계 테이블 전체를 다시 계산 (대량 적재 후, 마이그레이션에서는 과거 모델 apps를 넘김) """
+    Game, GameFacetCount = _models(apps)
+    Through = Game.genres.through
+
+    rows = [
+        GameFacetCount(genre_id=row['genre_id'], price_bucket=row['bucket'], count=row['n'])
+        for row in Through.objects.annotate(bucket=_bucket_expression('game__price'))
+            .values('genre_id', 'bucket').annotate(n=Count('game_id')).order_by()
+        if row['bucket']
+    ]
+    rows += [
+        GameFacetCount(genre=None, price_bucket=row['bucket'], count=row['n'])
+        for row in Game.objects.annotate(bucket=_bucket_expression())
+            .values('bucket').annotate(n=Count('pk')).order_by()
+        if row['bucket']
+    ]
+
+    with transaction.atomic():
+        GameFacetCount.objects.all().delete()
+        GameFacetCount.objects.bulk_create(rows, batch_size=500)
+
+
+def _aligned_buckets(min_price, max_price):
+    """ 가격 범위가 가격대 경계와 딱 맞으면 그 범위에 포함되는 가격대 키 목록, 아니면 None """
+    buckets = price_buckets()
+    lows = {low for _, low, _ in buckets}
+    highs = {high for _, _, high in buckets if high is not None}
+    if min_price is not None and min_price > buckets[0][1] and min_price not in lows:
+        return None
+    if max_price is not None and max_price not in highs:
+        return None
+    return [
+        key for key, low, high in buckets
+        if (min_price is None or low >= min_price)
+        and (max_price is None or (high is not None and high <= max_price))
+    ]
+
+
+def _filter_games(genre_ids, min_price=None, max_price=None):
+    qs = Game.objects.all()
+    for genre_id in genre_ids:
+        qs = qs.filter(genres=genre_id)
+    if min_price is not None:
+        qs = qs.filter(price__gte=min_price)
+    if max_price is not None:
+        qs = qs.filter(price__lte=max_price)
+    return qs
+
+
+def _compute_facets(genre_ids, min_price, max_price):
+    aligned = _aligned_buckets(min_price, max_price)
+
+    # 1. 가격대별 개수: 장르 조건만 적용 (가격 필터를 바꿨을 때의 개수를 보여주기 위함)
+    if len(genre_ids) <= 1:
+        rows = GameFacetCount.objects.filter(
+            genre_id=genre_ids[0] if genre_ids else None
+        ).values_list('price_bucket', 'count')
+        by_bucket = dict(rows)
+    else:
+        by_bucket = dict(
+            _filter_games(genre_ids).annotate(bucket=_bucket_expression())
+            .values_list('bucket').annotate(n=Count('pk')).order_by()
+        )
+
+    # 2. 장르별 개수: 현재 선택에 그 장르를 더했을 때의 개수
+    if not genre_ids and aligned is not None:
+        by_genre = {}
+        for genre_id, count in GameFacetCount.objects.filter(
+            genre__isnull=False, price_bucket__in=aligned
+        ).values_list('genre_id', 'count'):
+            by_genre[genre_id] = by_genre.get(genre_id, 0) + count
+    else:
+        Through = Game.genres.through
+        by_genre = dict(
+            Through.objects.filter(game__in=_filter_games(genre_ids, min_price, max_price))
+            .values_list('genre_id').annotate(n=Count('game_id')).order_by()
+        )
+
+    # 3. 현재 선택의 전체 개수
+    if genre_ids:
+        total = by_genre.get(genre_ids[0], 0)
+    elif aligned is not None:
+        total = sum(by_bucket.get(key, 0) for key in aligned)
+    else:
+        total = _filter_games(genre_ids, min_price, max_price).count()
+
+    return by_genre, by_bucket, total
+
+
+def facet_counts(genre_ids, min_price=None, max_price=None, filters=None):
+    """
+    현재 필터 선택에 대한 장르/가격대별 게임 수.
+    반환값: ({genre_id: 개수}, {가격대 키: 개수}, 현재 선택의 전체 개수)
+    filters가 주어지면 카탈로그 버전 기준으로 결과를 캐시한다.
+    """
+    genre_ids = sorted(set(genre_ids))
+    key = _count_key('facets', filters) if filters is not None else None
+    if key:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    result = _compute_facets(genre_ids, min_price, max_price)
+    if key:
+        cache.set(key, result, getattr(settings, 'GAME_COUNT_CACHE_TTL', 300))
+    return result
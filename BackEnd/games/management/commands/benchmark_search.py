@@ -0,0 +1,61 @@
+import random
+import statistics
+import time
+from django.core.management.base import BaseCommand
+from games.models import Game
+from games.search import search_games_fts, search_games_orm, search_index_available
+
+
+class Command(BaseCommand):
+    help = '게임 제목 검색의 ORM(icontains) 방식과 FTS5(trigram) 색인 방식의 지연 시간을 비교합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('queries', nargs='*', help='측정할 검색어 (없으면 DB의 제목에서 무작위로 추출)')
+        parser.add_argument('--samples', type=int, default=30, help='무작위로 뽑을 검색어 개수')
+        parser.add_argument('--repeat', type=int, default=5, help='검색어마다 반복 측정 횟수')
+        parser.add_argument('--limit', type=int, default=24, help='페이지 크기 (프론트엔드 검색과 동일하게)')
+
+    def handle(self, *args, **options):
+        if not search_index_available():
+            self.stdout.write(self.style.ERROR('FTS 색인이 없습니다. (SQLite에서 migrate를 먼저 실행하세요)'))
+            return
+
+        total_games = Game.objects.count()
+        queries = options['queries'] or self.sample_queries(options['samples'])
+        if not queries:
+            self.stdout.write(self.style.ERROR('측정할 검색어가 없습니다. init_steam_games로 카탈로그를 먼저 채워주세요.'))
+            return
+
+        self.stdout.write(f"카탈로그 {total_games}개, 검색어 {len(queries)}개, 각 {options['repeat']}회 측정")
+
+        results = {}
+        for name, search in (('ORM', search_games_orm), ('FTS5', search_games_fts)):
+            timings = []
+            for query in queries:
+                for _ in range(options['repeat']):
+                    started = time.perf_counter()
+                    search(query, 0, options['limit'])
+                    timings.append((time.perf_counter() - started) * 1000)
+            timings.sort()
+            results[name] = timings
+            self.stdout.write(
+                f"  {name:<5} p50 {statistics.median(timings):8.2f}ms  "
+                f"p95 {timings[int(len(timings) * 0.95) - 1]:8.2f}ms  "
+                f"max {timings[-1]:8.2f}ms"
+            )
+
+        speedup = statistics.median(results['ORM']) / max(statistics.median(results['FTS5']), 1e-6)
+        self.stdout.write(self.style.SUCCESS(f'FTS5 중앙값 기준 {speedup:.1f}배 빠름'))
+
+    def sample_queries(self, count):
+        """ 실제 제목의 일부(3~8글자)를 검색어로 사용 """
+        titles = list(Game.objects.order_by('?').values_list('title', flat=True)[:count])
+        queries = []
+        for title in titles:
+            title = title.strip()
+            if len(title) < 3:
+                continue
+            length = random.randint(3, min(8, len(title)))
+            start = random.randint(0, len(title) - length)
+            queries.append(title[start:start + length])
+        return queries
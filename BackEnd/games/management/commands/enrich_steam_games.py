@@ -0,0 +1,118 @@
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils import timezone
+from games.models import AppDetailsCache, UserGameLibrary
+from games.utils import (
+    enrich_games, games_missing_detail,
+    get_checkpoint, save_checkpoint, clear_checkpoint,
+)
+
+CHECKPOINT_NAME = 'enrich_steam_games'
+
+
+class Command(BaseCommand):
+    help = (
+        '상세 정보(가격, 장르, 이미지 등)가 없는 게임을 스팀 상점에서 수집합니다. '
+        '유저가 보유한 게임 → 최근 조회된 게임 → 나머지(appid 순) 순서로 처리하고, 중단되면 이어서 수집합니다.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help='전체를 한 바퀴 돈 뒤에도 종료하지 않고 새로 빠진 게임을 계속 수집합니다.')
+        parser.add_argument('--interval', type=float, default=60.0, help='--loop 모드에서 수집할 게임이 없을 때 대기 시간(초)')
+        parser.add_argument('--batch-size', type=int, default=None, help='한 번에 수집할 게임 수 (기본값: GAME_ENRICH_CRAWL_BATCH)')
+        parser.add_argument('--limit', type=int, default=None, help='이 개수만큼 처리하면 종료합니다.')
+        parser.add_argument('--restart', action='store_true', help='저장된 진행 지점을 무시하고 appid 처음부터 다시 훑습니다.')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size'] or getattr(settings, 'GAME_ENRICH_CRAWL_BATCH', 200)
+        limit = options['limit']
+        if options['restart']:
+            clear_checkpoint(CHECKPOINT_NAME)
+
+        remaining = games_missing_detail().count()
+        self.stdout.write(f"상세 정보 수집 시작 (상세 정보가 없는 게임: {remaining}개)")
+
+        started_at = time.monotonic()
+        processed = enriched = 0
+        # 이번 실행에서 이미 시도한 우선순위 게임 (네트워크 실패 등으로 계속 비어 있어도 같은 게임만 반복하지 않도록)
+        self.attempted = set()
+        try:
+            while limit is None or processed < limit:
+                size = batch_size if limit is None else min(batch_size, limit - processed)
+                tier, appids = self.next_batch(size)
+                if not appids:
+                    if not options['loop']:
+                        break
+                    # 한 바퀴 끝 → 처음부터 다시 (그동안 새로 추가됐거나 실패했던 게임)
+                    clear_checkpoint(CHECKPOINT_NAME)
+                    self.attempted.clear()
+                    time.sleep(options['interval'])
+                    continue
+
+                # 요청 속도는 steam_client의 'store' 토큰 버킷이 제한
+                batch_enriched = enrich_games(appids)['enriched']
+                if tier == 'catalog':
+                    save_checkpoint(CHECKPOINT_NAME, {'last_appid': appids[-1]})
+                else:
+                    self.attempted.update(appids)
+
+                processed += len(appids)
+                enriched += batch_enriched
+                remaining = max(remaining - batch_enriched, 0)
+                self.report(tier, appids, processed, enriched, remaining, started_at)
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING("중단됨 — 다시 실행하면 저장된 지점부터 이어서 수집합니다."))
+
+        elapsed = time.monotonic() - started_at
+        self.stdout.write(self.style.SUCCESS(
+            f"수집 종료: {processed}개 처리, {enriched}개 채움, {elapsed:.0f}초"
+        ))
+
+    def next_batch(self, size):
+        """ 우선순위가 가장 높은 구간에서 다음에 수집할 appid 목록. 반환값: (구간 이름, appid 목록) """
+        now = timezone.now()
+        # 캐시가 아직 유효한 appid(상점에 없거나 이미지가 없는 게임 등)는 다시 요청해도 그대로이므로 제외
+        ttl = getattr(settings, 'APPDETAILS_CACHE_TTL', timedelta(days=3))
+        negative_ttl = getattr(settings, 'APPDETAILS_NEGATIVE_CACHE_TTL', timedelta(days=1))
+        fresh = AppDetailsCache.objects.filter(
+            Q(success=True, fetched_at__gte=now - ttl) | Q(success=False, fetched_at__gte=now - negative_ttl)
+        ).values('appid')
+        missing = games_missing_detail().exclude(appid__in=fresh)
+        prioritized = missing.exclude(appid__in=list(self.attempted))
+
+        # 1. 유저 라이브러리에 있는 게임
+        owned = list(
+            prioritized.filter(appid__in=UserGameLibrary.objects.values('game_id'))
+            .order_by('appid').values_list('appid', flat=True)[:size]
+        )
+        if owned:
+            return 'owned', owned
+
+        # 2. 최근 조회된 게임 (조회 수 많은 순)
+        window = getattr(settings, 'GAME_ENRICH_RECENT_VIEW_WINDOW', timedelta(days=7))
+        viewed = list(
+            prioritized.filter(last_viewed_at__gte=now - window)
+            .order_by('-view_count', 'appid').values_list('appid', flat=True)[:size]
+        )
+        if viewed:
+            return 'viewed', viewed
+
+        # 3. 나머지 카탈로그: 저장된 지점 다음부터 appid 순
+        last_appid = get_checkpoint(CHECKPOINT_NAME, {}).get('last_appid', 0)
+        rest = list(
+            missing.filter(appid__gt=last_appid)
+            .order_by('appid').values_list('appid', flat=True)[:size]
+        )
+        return 'catalog', rest
+
+    def report(self, tier, appids, processed, enriched, remaining, started_at):
+        elapsed = max(time.monotonic() - started_at, 1e-6)
+        rate = processed / elapsed
+        eta = f"{remaining / rate / 60:.0f}분" if rate > 0 else "-"
+        self.stdout.write(
+            f"  [{tier}] appid {appids[0]}~{appids[-1]}: 누적 {processed}개 처리 / {enriched}개 채움 "
+            f"({rate:.1f}개/초, 남은 게임 {remaining}개, 예상 {eta})"
+        )
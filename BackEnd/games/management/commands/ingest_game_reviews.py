@@ -0,0 +1,48 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+from ai_analysis.reviews import ingest_game_reviews, review_languages
+from games.models import Game
+
+
+class Command(BaseCommand):
+    help = (
+        '스팀 유저 리뷰를 GameReview에 수집합니다. '
+        '기본은 언어별로 저장된 가장 최근 리뷰 이후의 새 리뷰만 받고, --full이면 처음부터 다시 훑습니다 (중복은 건너뜀).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('appids', nargs='*', type=int, help='수집할 appid (없으면 보유 유저가 많은 게임 순)')
+        parser.add_argument('--limit', type=int, default=100, help='appid를 지정하지 않았을 때 수집할 게임 수')
+        parser.add_argument('--languages', nargs='+', default=None, help='수집할 언어 (기본값: STEAM_REVIEW_LANGUAGES)')
+        parser.add_argument('--full', action='store_true', help='증분이 아니라 최신 리뷰부터 최대 개수까지 다시 수집합니다.')
+        parser.add_argument('--max-reviews', type=int, default=None, help='게임/언어별 최대 리뷰 수 (기본값: STEAM_REVIEW_MAX_PER_GAME)')
+
+    def handle(self, *args, **options):
+        appids = options['appids'] or list(
+            Game.objects.annotate(owner_count=Count('usergamelibrary')).filter(owner_count__gt=0)
+            .order_by('-owner_count', 'appid').values_list('appid', flat=True)[:options['limit']]
+        )
+        languages = options['languages'] or review_languages()
+        self.stdout.write(f"리뷰 수집 시작: {len(appids)}개 게임, 언어 {', '.join(languages)}")
+
+        started_at = time.monotonic()
+        saved = failed = 0
+        try:
+            for appid in appids:
+                try:
+                    count = ingest_game_reviews(
+                        appid, languages=languages, full=options['full'], max_reviews=options['max_reviews'],
+                    )
+                except Exception as e:
+                    failed += 1
+                    self.stdout.write(self.style.ERROR(f"  [{appid}] 실패: {e}"))
+                    continue
+                saved += count
+                self.stdout.write(f"  [{appid}] 새 리뷰 {count}개")
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING("중단됨 — 다시 실행하면 저장된 리뷰 이후부터 이어서 수집합니다."))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"수집 종료: 새 리뷰 {saved}개, 실패 {failed}개, {time.monotonic() - started_at:.0f}초"
+        ))
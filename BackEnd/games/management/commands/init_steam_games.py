@@ -1,104 +1,199 @@
+import codecs
+import json
+import queue
+import re
+import threading
 import requests
-import time
 from django.conf import settings
 from django.core.management.base import BaseCommand
 from games.models import Game
+from games.steam_client import steam_get
+from games.counts import bump_catalog_version
+from games.facets import rebuild_facet_counts
+from games.utils import get_checkpoint, save_checkpoint, clear_checkpoint
+
+CHECKPOINT_NAME = 'init_steam_games'
+
+
+_MORE_RESULTS_RE = re.compile(r'"have_more_results"\s*:\s*(true|false)')
+_LAST_APPID_RE = re.compile(r'"last_appid"\s*:\s*(\d+)')
+
+
+def _read_page_info(text, page_info):
+    """ apps 배열 바깥(앞/뒤)의 have_more_results, last_appid 값을 page_info에 채움 """
+    more = _MORE_RESULTS_RE.search(text)
+    if more:
+        page_info['have_more_results'] = more.group(1) == 'true'
+    last = _LAST_APPID_RE.search(text)
+    if last:
+        page_info['last_appid'] = int(last.group(1))
+
+
+def iter_app_list(response, chunk_size=64 * 1024, page_info=None):
+    """
+    GetAppList 응답에서 apps 배열의 항목을 하나씩 꺼냄.
+    응답 전체를 json()으로 읽지 않고 받은 만큼만 파싱하므로 페이지 크기와 관계없이 메모리 사용량이 일정하다.
+    page_info(dict)가 주어지면 배열을 다 읽은 뒤 나머지 응답에서 have_more_results, last_appid를 채운다.
+    """
+    text_decoder = codecs.getincrementaldecoder('utf-8')()
+    json_decoder = json.JSONDecoder()
+    chunks = response.iter_content(chunk_size=chunk_size)
+    buffer = ''
+    head = ''
+    in_array = False
+
+    for chunk in chunks:
+        buffer += text_decoder.decode(chunk)
+
+        if not in_array:
+            # "apps": [ 가 나올 때까지는 앞부분만 버퍼에 유지
+            key_at = buffer.find('"apps"')
+            bracket_at = buffer.find('[', key_at) if key_at != -1 else -1
+            if bracket_at == -1:
+                buffer = buffer[key_at:] if key_at != -1 else buffer[-16:]
+                continue
+            head = buffer[:key_at]
+            buffer = buffer[bracket_at + 1:]
+            in_array = True
+
+        while True:
+            buffer = buffer.lstrip(' \t\r\n,')
+            if not buffer:
+                break
+            if buffer[0] == ']':
+                if page_info is not None:
+                    # 배열 뒤쪽은 작으므로 끝까지 읽어서 페이지 정보를 찾음
+                    tail = buffer + ''.join(text_decoder.decode(chunk) for chunk in chunks)
+                    _read_page_info(head + tail, page_info)
+                return
+            try:
+                item, end = json_decoder.raw_decode(buffer)
+            except json.JSONDecodeError:
+                break # 항목이 아직 덜 들어옴 → 다음 청크와 합쳐서 다시 시도
+            yield item
+            buffer = buffer[end:]
+
 
 class Command(BaseCommand):
-    help = 'Steam IStoreService API를 통해 게임 목록을 페이지네이션하여 수집합니다.'
+    help = 'Steam IStoreService API를 통해 게임 목록을 페이지네이션하여 수집합니다. (중단되면 마지막 저장 지점부터 이어서 수집)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--restart', action='store_true', help='저장된 재시작 지점을 무시하고 처음(appid 0)부터 수집합니다.')
+        parser.add_argument('--page-size', type=int, default=None, help='한 번 요청에 받을 앱 수 (기본값: STEAM_APP_LIST_PAGE_SIZE)')
 
-    def handle(self, *args, **kwargs):
+    def handle(self, *args, **options):
         # settings.py에서 API Key 가져오기
         api_key = getattr(settings, 'STEAM_API_KEY', None)
         if not api_key:
             self.stdout.write(self.style.ERROR('API Key가 설정되지 않았습니다. .env 파일을 확인해주세요.'))
             return
 
-        self.stdout.write("Steam 게임 목록 수집 시작 (IStoreService/GetAppList/v1)...")
+        page_size = options['page_size'] or getattr(settings, 'STEAM_APP_LIST_PAGE_SIZE', 10000)
+        batch_size = getattr(settings, 'STEAM_APP_LIST_WRITE_BATCH', 2000)
 
-        # 초기 설정
-        base_url = "https://api.steampowered.com/IStoreService/GetAppList/v1/"
-        last_appid = 0  # 처음엔 0부터 시작
-        total_collected = 0
-        more_games = True
-
-        # 이미 DB에 있는 appid 캐싱 (중복 저장 방지용)
-        # models.py의 필드명인 'appid'를 사용합니다.
-        existing_appids = set(Game.objects.values_list('appid', flat=True))
-
-        while more_games:
-            params = {
-                "key": api_key,
-                "last_appid": last_appid, # 이 값이 계속 변하면서 다음 페이지를 요청함
-                "max_results": 50000,     # 한 번에 가져올 최대 개수
-                "include_games": "true",  # 게임만 포함
-                "include_dlc": "false",   # DLC 제외
-                "include_software": "false", # 소프트웨어 제외
-            }
+        if options['restart']:
+            clear_checkpoint(CHECKPOINT_NAME)
+        last_appid = get_checkpoint(CHECKPOINT_NAME, {}).get('last_appid', 0)
+        if last_appid:
+            self.stdout.write(f"지난 수집 지점(last_appid: {last_appid})부터 이어서 수집합니다.")
 
-            try:
-                self.stdout.write(f"요청 중... (last_appid: {last_appid})")
-                response = requests.get(base_url, params=params, timeout=30)
-                
-                if response.status_code != 200:
-                    self.stdout.write(self.style.ERROR(f"API 요청 실패: {response.status_code}"))
-                    break
-
-                data = response.json()
-                
-                # 응답 구조 파싱
-                response_data = data.get('response', {})
-                apps = response_data.get('apps', [])
+        self.stdout.write("Steam 게임 목록 수집 시작 (IStoreService/GetAppList/v1)...")
 
-                if not apps:
-                    self.stdout.write("더 이상 가져올 게임이 없습니다.")
-                    more_games = False
+        # 요청/파싱 스레드가 다음 페이지를 받는 동안 이 스레드는 받은 배치를 저장 (큐 크기로 메모리 상한)
+        batches = queue.Queue(maxsize=4)
+        fetcher = threading.Thread(
+            target=self.fetch_batches,
+            args=(api_key, last_appid, page_size, batch_size, batches),
+            daemon=True,
+        )
+        fetcher.start()
+
+        total_processed = 0
+        error = None
+        try:
+            while True:
+                batch = batches.get()
+                if batch is None:
+                    break
+                if isinstance(batch, Exception):
+                    error = batch
                     break
 
-                # DB 저장 준비
-                game_list = []
-                current_batch_last_id = 0
-
-                for app in apps:
-                    # API가 주는 키는 'appid', models.py의 필드명도 'appid'
-                    current_appid = int(app['appid'])
-                    title = app['name']
-                    current_batch_last_id = app['appid'] # 다음 페이지 요청을 위해 숫자형 ID 기억
-
-                    # 1. 중복 체크 (이미 DB에 있으면 패스)
-                    if current_appid in existing_appids:
-                        continue
-                    
-                    # 2. 타이틀 유효성 체크 (빈 제목 제외)
-                    if not title:
-                        continue
-
-                    # 3. 객체 생성
-                    # models.py의 필드명에 맞춰서 생성합니다.
-                    # publisher, description 등의 필드는 null=True이므로 여기서 안 채워도 에러 안 남
-                    game_list.append(
-                        Game(
-                            appid=current_appid,  # models.py의 appid 필드
-                            title=title[:255]     # max_length=255 제한 준수
-                        )
-                    )
-                    # 중복 방지 세트에도 추가 (현재 배치 내 중복 방지)
-                    existing_appids.add(current_appid)
-
-                # Bulk Create (한 번에 저장)
-                if game_list:
-                    Game.objects.bulk_create(game_list, batch_size=5000)
-                    total_collected += len(game_list)
-                    self.stdout.write(f"  -> {len(game_list)}개 저장 완료.")
-                
-                # 다음 페이지를 위해 last_appid 갱신
-                last_appid = current_batch_last_id
-                
-                # API 호출 빈도 조절 (1초 대기)
-                time.sleep(1)
-
-            except Exception as e:
-                self.stdout.write(self.style.ERROR(f"에러 발생: {e}"))
-                break
+                # 이미 있는 appid는 DB의 기본키 충돌로 건너뜀 (기존 appid를 메모리에 올리지 않음)
+                Game.objects.bulk_create(
+                    [Game(appid=appid, title=title[:255]) for appid, title in batch if title],
+                    ignore_conflicts=True,
+                    batch_size=500,
+                )
+                bump_catalog_version()
+                save_checkpoint(CHECKPOINT_NAME, {'last_appid': batch[-1][0]})
+                total_processed += len(batch)
+                self.stdout.write(f"  -> {total_processed}개 처리 (last_appid: {batch[-1][0]})")
+        except KeyboardInterrupt:
+            error = KeyboardInterrupt('사용자 중단')
+
+        # 대량 추가 후에는 facet 집계를 한 번에 다시 계산
+        if total_processed:
+            rebuild_facet_counts()
+
+        if error is not None:
+            self.stdout.write(self.style.ERROR(
+                f"에러 발생: {error} — 다시 실행하면 마지막 저장 지점부터 이어서 수집합니다."
+            ))
+            return
 
-        self.stdout.write(self.style.SUCCESS(f'모든 작업 완료! 총 추가된 게임 수: {total_collected}개'))
\ No newline at end of file
+        clear_checkpoint(CHECKPOINT_NAME)
+        self.stdout.write(self.style.SUCCESS(
+            f'모든 작업 완료! 처리한 앱 수: {total_processed}개, 전체 게임 수: {Game.objects.count()}개'
+        ))
+
+    def fetch_batches(self, api_key, last_appid, page_size, batch_size, out):
+        """ 페이지를 차례로 받아 (appid, 제목) 배치로 out 큐에 넣음. 끝나면 None, 실패하면 예외를 넣음 """
+        max_retries = getattr(settings, 'STEAM_MAX_RETRIES', 3)
+        failures = 0
+        try:
+            while True:
+                params = {
+                    "key": api_key,
+                    "last_appid": last_appid, # 이 값이 계속 변하면서 다음 페이지를 요청함
+                    "max_results": page_size,
+                    "include_games": "true",  # 게임만 포함
+                    "include_dlc": "false",   # DLC 제외
+                    "include_software": "false", # 소프트웨어 제외
+                }
+                count = 0
+                batch = []
+                page_info = {}
+                try:
+                    # 속도 제한과 429/5xx 재시도는 steam_client가 처리
+                    with steam_get('app_list', params, stream=True) as response:
+                        if response.status_code != 200:
+                            raise RuntimeError(f"API 요청 실패: {response.status_code}")
+                        for app in iter_app_list(response, page_info=page_info):
+                            count += 1
+                            last_appid = int(app['appid'])
+                            batch.append((last_appid, app.get('name', '')))
+                            if len(batch) >= batch_size:
+                                out.put(batch)
+                                batch = []
+                except (requests.RequestException, ValueError):
+                    # 응답을 받는 도중 끊김 → 마지막으로 받은 appid 다음부터 같은 페이지를 다시 요청
+                    failures += 1
+                    if failures > max_retries:
+                        raise
+                    if batch:
+                        out.put(batch)
+                    continue
+
+                if batch:
+                    out.put(batch)
+                failures = 0
+                # 한 페이지가 max_results보다 적게 와도 have_more_results가 true면 더 있음.
+                # 값이 없는 응답이면 빈 페이지가 올 때까지 계속 요청
+                next_appid = max(last_appid, page_info.get('last_appid', 0))
+                if page_info.get('have_more_results') is False or (count == 0 and next_appid == last_appid):
+                    break
+                last_appid = next_appid
+            out.put(None)
+        except Exception as e:
+            out.put(e)
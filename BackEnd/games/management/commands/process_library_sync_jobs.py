@@ -0,0 +1,36 @@
+import time
+from django.core.management.base import BaseCommand
+from games.models import LibrarySyncJob
+from games.tasks import expire_stale_sync_jobs, run_library_sync_job
+
+
+class Command(BaseCommand):
+    help = '대기 중인 라이브러리 동기화 작업을 처리합니다. (LIBRARY_SYNC_RUN_IN_PROCESS=False 환경용 워커)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help='작업이 없어도 종료하지 않고 계속 대기합니다.')
+        parser.add_argument('--interval', type=float, default=2.0, help='--loop 모드에서 새 작업 확인 간격(초)')
+
+    def handle(self, *args, **options):
+        self.stdout.write("라이브러리 동기화 워커 시작...")
+
+        while True:
+            expire_stale_sync_jobs()
+            job_ids = list(
+                LibrarySyncJob.objects.filter(status='PENDING')
+                .order_by('created_at').values_list('pk', flat=True)
+            )
+
+            for job_id in job_ids:
+                run_library_sync_job(job_id)
+                job = LibrarySyncJob.objects.get(pk=job_id)
+                self.stdout.write(
+                    f"  -> 작업 #{job.pk} ({job.user.username}): {job.status} "
+                    f"[{job.processed_count}/{job.total_count}, 상세 {job.enriched_count}개, 실패 {job.error_count}개]"
+                )
+
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+        self.stdout.write(self.style.SUCCESS('워커 종료'))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from games.counts import bump_catalog_version
+from games.facets import rebuild_facet_counts
+from games.models import GameFacetCount
+
+
+class Command(BaseCommand):
+    help = '게임 목록 필터 패널용 장르/가격대별 게임 수 집계 테이블을 전체 다시 계산합니다.'
+
+    def handle(self, *args, **options):
+        rebuild_facet_counts()
+        bump_catalog_version()
+        self.stdout.write(self.style.SUCCESS(f'facet 집계 완료: {GameFacetCount.objects.count()}개 행'))
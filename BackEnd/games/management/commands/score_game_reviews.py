@@ -0,0 +1,24 @@
+import time
+from django.core.management.base import BaseCommand
+from ai_analysis.sentiment import score_stored_reviews
+
+
+class Command(BaseCommand):
+    help = '저장된 리뷰(GameReview)의 감정 점수와 유용성을 감정 사전으로 계산합니다. (AI 호출 없음)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('appids', nargs='*', type=int, help='계산할 게임 appid (없으면 전체)')
+        parser.add_argument('--rescore', action='store_true', help='이미 점수가 있는 리뷰도 다시 계산합니다. (감정 사전을 바꾼 뒤)')
+        parser.add_argument('--batch-size', type=int, default=2000, help='한 번에 계산/저장할 리뷰 수')
+
+    def handle(self, *args, **options):
+        started_at = time.monotonic()
+
+        def on_batch(done):
+            self.stdout.write(f"  -> {done}개 ({done / (time.monotonic() - started_at):.0f}개/초)")
+
+        done = score_stored_reviews(
+            appids=options['appids'] or None, rescore=options['rescore'],
+            batch_size=options['batch_size'], on_batch=on_batch,
+        )
+        self.stdout.write(self.style.SUCCESS(f"완료: {done}개, {time.monotonic() - started_at:.1f}초"))
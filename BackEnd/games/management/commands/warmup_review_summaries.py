@@ -0,0 +1,114 @@
+import asyncio
+import time
+from datetime import timedelta
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db.models import Count, Q
+from django.utils import timezone
+from ai_analysis.utils import (
+    REVIEW_SUMMARY_OUTPUT_TOKENS, async_fetch_steam_reviews, estimate_tokens,
+    get_ai_review_summary, review_summary_prompts,
+)
+from games.models import Game
+from games.steam_client import TokenBucket
+from games.tasks import acquire_review_summary_lease, finish_review_summary, review_summary_outcome
+
+
+class Command(BaseCommand):
+    help = (
+        '게임 리뷰 AI 요약(ReviewSummary)을 미리 생성합니다. '
+        '보유 유저가 많은 게임/조회 수가 많은 게임/지정한 appid 중 최근 요약이 없는 게임을 골라 한 이벤트 루프에서 동시에 처리합니다.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('appids', nargs='*', type=int, help='요약할 appid (지정하면 --source는 무시)')
+        parser.add_argument('--source', choices=['owned', 'viewed'], default='owned',
+                            help='owned: 보유 유저가 많은 순, viewed: 상세 페이지 조회 수가 많은 순')
+        parser.add_argument('--limit', type=int, default=100, help='요약할 최대 게임 수')
+        parser.add_argument('--concurrency', type=int, default=None,
+                            help='동시에 처리할 게임 수 (기본값: REVIEW_SUMMARY_WARMUP_CONCURRENCY)')
+        parser.add_argument('--tokens-per-minute', type=int, default=None,
+                            help='분당 사용할 최대 토큰 수 추정치 (기본값: REVIEW_SUMMARY_WARMUP_TOKENS_PER_MINUTE)')
+        parser.add_argument('--max-age', type=float, default=24.0,
+                            help='완료된 요약이 이 시간(시간 단위) 안에 만들어졌으면 건너뜁니다.')
+
+    def handle(self, *args, **options):
+        concurrency = options['concurrency'] or getattr(settings, 'REVIEW_SUMMARY_WARMUP_CONCURRENCY', 8)
+        tokens_per_minute = options['tokens_per_minute'] or getattr(settings, 'REVIEW_SUMMARY_WARMUP_TOKENS_PER_MINUTE', 200000)
+
+        appids = self.select_games(options)
+        if not appids:
+            self.stdout.write(self.style.SUCCESS('새로 요약할 게임이 없습니다.'))
+            return
+        self.stdout.write(
+            f"리뷰 요약 미리 생성 시작: {len(appids)}개 게임, 동시 {concurrency}개, 분당 토큰 {tokens_per_minute}"
+        )
+
+        self.stats = {'COMPLETED': 0, 'FAILED': 0, 'busy': 0, 'tokens': 0}
+        started_at = time.monotonic()
+        try:
+            asyncio.run(self.run(appids, concurrency, tokens_per_minute))
+        except KeyboardInterrupt:
+            # 진행 중이던 게임의 lease는 만료 시각이 지나면 다른 요청이 다시 가져감
+            self.stdout.write(self.style.WARNING('중단됨'))
+
+        elapsed = time.monotonic() - started_at
+        done = self.stats['COMPLETED'] + self.stats['FAILED']
+        self.stdout.write(self.style.SUCCESS(
+            f"완료: 성공 {self.stats['COMPLETED']}개, 실패 {self.stats['FAILED']}개, "
+            f"다른 작업이 진행 중이라 건너뜀 {self.stats['busy']}개 / {elapsed:.0f}초, "
+            f"{done / elapsed * 60:.1f}개/분, 사용 토큰 {self.stats['tokens']}"
+        ))
+
+    def select_games(self, options):
+        """ 요약할 appid 목록 (최근 완료된 요약이 있는 게임은 제외) """
+        fresh = Q(
+            review_summary__status='COMPLETED',
+            review_summary__last_updated_at__gte=timezone.now() - timedelta(hours=options['max_age']),
+        )
+        qs = Game.objects.exclude(fresh)
+        if options['appids']:
+            qs = qs.filter(appid__in=options['appids'])
+        elif options['source'] == 'owned':
+            qs = qs.annotate(owner_count=Count('usergamelibrary')).filter(owner_count__gt=0).order_by('-owner_count', 'appid')
+        else:
+            qs = qs.filter(view_count__gt=0).order_by('-view_count', 'appid')
+        return list(qs.values_list('appid', flat=True)[:options['limit']])
+
+    async def run(self, appids, concurrency, tokens_per_minute):
+        semaphore = asyncio.Semaphore(concurrency)
+        # 분당 예산을 초당 비율로 채우는 토큰 버킷 (버스트는 1분 치)
+        budget = TokenBucket(tokens_per_minute / 60, tokens_per_minute)
+
+        async def limited(appid):
+            async with semaphore:
+                await self.summarize(appid, budget)
+
+        await asyncio.gather(*(limited(appid) for appid in appids))
+
+    async def summarize(self, appid, budget):
+        # 화면에서 요청한 분석과 겹치지 않도록 같은 lease를 사용
+        owner = await sync_to_async(acquire_review_summary_lease)(appid)
+        if owner is None:
+            self.stats['busy'] += 1
+            return
+
+        tokens_used = 0
+        try:
+            reviews = await async_fetch_steam_reviews(appid)
+            ai_text = None
+            prompts = review_summary_prompts(reviews) if reviews else None
+            if prompts:
+                # 호출 전에는 추정치로 예산을 잡고, 보고는 실제 사용량으로
+                await budget.acquire_async(estimate_tokens(''.join(prompts)) + REVIEW_SUMMARY_OUTPUT_TOKENS)
+                ai_text, tokens_used = await get_ai_review_summary(reviews)
+                self.stats['tokens'] += tokens_used
+            status, text = review_summary_outcome(reviews, ai_text)
+        except Exception as e:
+            print(f"❌ [Review Summary Error] {appid}: {e}")
+            status, text = 'FAILED', "분석 중 오류가 발생했습니다."
+
+        await sync_to_async(finish_review_summary)(appid, owner, status, text, tokens_used)
+        self.stats[status] += 1
+        self.stdout.write(f"  [{status}] {appid}")
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 10:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0003_librarysyncjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='librarysyncjob',
+            name='skipped',
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.4 on 2026-10-18 10:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0004_librarysyncjob_skipped'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AppDetailsCache',
+            fields=[
+                ('appid', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('success', models.BooleanField(default=True)),
+                ('data', models.JSONField(blank=True, null=True)),
+                ('fetched_at', models.DateTimeField(db_index=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,58 @@
+from django.db import migrations, models
+
+
+def split_genre_strings(apps, schema_editor):
+    # 기존 "액션, RPG" 형태의 문자열을 Genre 행과 다대다 관계로 옮김
+    Game = apps.get_model('games', 'Game')
+    Genre = apps.get_model('games', 'Genre')
+    Through = Game.genre_set.through
+
+    genre_ids = {}
+    links = []
+    for appid, genres in Game.objects.exclude(genres__isnull=True).exclude(genres='').values_list('appid', 'genres').iterator():
+        for name in {g.strip()[:100] for g in genres.split(',') if g.strip()}:
+            if name not in genre_ids:
+                genre_ids[name] = Genre.objects.get_or_create(name=name)[0].pk
+            links.append(Through(game_id=appid, genre_id=genre_ids[name]))
+    Through.objects.bulk_create(links, batch_size=1000, ignore_conflicts=True)
+
+
+def join_genre_names(apps, schema_editor):
+    Game = apps.get_model('games', 'Game')
+    for game in Game.objects.prefetch_related('genre_set'):
+        names = [g.name for g in game.genre_set.all()]
+        if names:
+            game.genres = ", ".join(names)[:255]
+            game.save(update_fields=['genres'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0005_appdetailscache'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Genre',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='genre_set',
+            field=models.ManyToManyField(blank=True, related_name='games', to='games.genre'),
+        ),
+        migrations.RunPython(split_genre_strings, join_genre_names),
+        migrations.RemoveField(
+            model_name='game',
+            name='genres',
+        ),
+        migrations.RenameField(
+            model_name='game',
+            old_name='genre_set',
+            new_name='genres',
+        ),
+    ]
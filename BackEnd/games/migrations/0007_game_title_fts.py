@@ -0,0 +1,23 @@
+from django.db import migrations
+
+
+def create_fts_index(apps, schema_editor):
+    from games.search import install_search_index
+    install_search_index(schema_editor.connection)
+
+
+def drop_fts_index(apps, schema_editor):
+    from games.search import drop_search_index
+    drop_search_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0006_genre'),
+    ]
+
+    operations = [
+        # SQLite 전용 FTS5(trigram) 제목 검색 색인. 다른 DB에서는 아무것도 하지 않음
+        migrations.RunPython(create_fts_index, drop_fts_index),
+    ]
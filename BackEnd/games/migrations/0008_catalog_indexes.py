@@ -0,0 +1,31 @@
+# Generated by Django 5.2.4 on 2026-10-18 10:42
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0007_game_title_fts'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(fields=['release_date', 'appid'], name='game_release_appid_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(fields=['price', 'appid'], name='game_price_appid_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(fields=['title', 'appid'], name='game_title_appid_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='usergamelibrary',
+            index=models.Index(fields=['user', '-playtime_total'], name='library_user_playtime_idx'),
+        ),
+    ]
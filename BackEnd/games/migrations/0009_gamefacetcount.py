@@ -0,0 +1,34 @@
+# Generated by Django 5.2.4 on 2026-10-18 10:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def populate_facet_counts(apps, schema_editor):
+    from games.facets import rebuild_facet_counts
+    rebuild_facet_counts(apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0008_catalog_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GameFacetCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('price_bucket', models.CharField(max_length=20)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('genre', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='facet_counts', to='games.genre')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('genre', 'price_bucket'), name='unique_game_facet_count'), models.UniqueConstraint(condition=models.Q(('genre__isnull', True)), fields=('price_bucket',), name='unique_game_facet_total')],
+            },
+        ),
+        # 기존 카탈로그로 집계 테이블을 채움
+        migrations.RunPython(populate_facet_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.4 on 2026-10-18 10:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0010_crawlercheckpoint'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='game',
+            name='last_viewed_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='view_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.4 on 2026-10-18 10:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0011_game_view_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchRecommendationCache',
+            fields=[
+                ('query', models.CharField(max_length=255, primary_key=True, serialize=False)),
+                ('appids', models.JSONField(default=list)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('expires_at', models.DateTimeField(db_index=True)),
+                ('last_used_at', models.DateTimeField(db_index=True)),
+                ('hit_count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+    ]
@@ -1,6 +1,16 @@
 # games/models.py
 from django.db import models
+from datetime import timedelta
 from django.conf import settings
+from django.utils import timezone
+
+
+class Genre(models.Model):
+    # 스팀 상점 장르 (상점 API를 한국어로 호출하므로 '액션', 'RPG' 등)
+    name = models.CharField(max_length=100, unique=True)
+
+    def __str__(self):
+        return self.name
 
 
 class Game(models.Model):
@@ -12,7 +22,8 @@ class Game(models.Model):
     developer = models.CharField(max_length=255, blank=True, null=True)
     header_image = models.URLField(max_length=500, blank=True, null=True)
     release_date = models.DateField(null=True, blank=True)
-    genres = models.CharField(max_length=255, null=True, blank=True)
+    # 장르 필터링은 중간 테이블의 genre_id 인덱스를 타도록 다대다로 관리
+    genres = models.ManyToManyField(Genre, related_name='games', blank=True)
 
     # 다대다 관계 설정
     owners = models.ManyToManyField(
@@ -23,6 +34,23 @@ class Game(models.Model):
     
     updated_at = models.DateTimeField(auto_now=True)
 
+    # 상세 페이지 조회 수 (상세 정보 수집 크롤러의 우선순위에 사용)
+    view_count = models.PositiveIntegerField(default=0)
+    last_viewed_at = models.DateTimeField(null=True, blank=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            # GameListView 정렬별 인덱스 (마지막 키 appid는 cursor 페이징용 유일 키)
+            models.Index(fields=['release_date', 'appid'], name='game_release_appid_idx'),
+            models.Index(fields=['price', 'appid'], name='game_price_appid_idx'),
+            models.Index(fields=['title', 'appid'], name='game_title_appid_idx'),
+        ]
+
+    @property
+    def genre_names(self):
+        """ 예전 API 형태("액션, RPG")의 장르 문자열 (prefetch_related('genres')와 함께 사용) """
+        return ", ".join(genre.name for genre in self.genres.all()) or None
+
     def __str__(self):
         return self.title
     
@@ -42,6 +70,10 @@ class UserGameLibrary(models.Model):
 
     class Meta:
         unique_together = ('user', 'game') # 중복 소유 방지
+        indexes = [
+            # 내 라이브러리 조회 (유저별 플레이타임 내림차순)
+            models.Index(fields=['user', '-playtime_total'], name='library_user_playtime_idx'),
+        ]
     def __str__(self):
         return f"{self.user.username}'s {self.game.title}"
 
@@ -63,4 +95,107 @@ class UserFavoriteGame(models.Model):
 
     def __str__(self):
         game_title = self.game.title if self.game else "Not selected"
-        return f"{self.user.username}'s Best Game: {game_title}"
\ No newline at end of file
+        return f"{self.user.username}'s Best Game: {game_title}"
+
+class LibrarySyncJob(models.Model):
+    # 라이브러리 동기화 작업 (요청 → 백그라운드 처리 → 진행 상황 조회)
+    STATUS_CHOICES = [
+        ('PENDING', '대기'),
+        ('RUNNING', '진행중'),
+        ('COMPLETED', '완료'),
+        ('FAILED', '실패'),
+    ]
+    ACTIVE_STATUSES = ('PENDING', 'RUNNING')
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='library_sync_jobs')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='PENDING')
+
+    # 진행 상황 (처리한 게임 수 / 전체 게임 수, 상세 정보 수집 성공/실패 수)
+    total_count = models.IntegerField(default=0)
+    processed_count = models.IntegerField(default=0)
+    enriched_count = models.IntegerField(default=0)
+    error_count = models.IntegerField(default=0)
+    error_message = models.TextField(blank=True, default='')
+    skipped = models.BooleanField(default=False) # 보유 게임 목록이 지난 동기화와 같아 생략된 경우
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True) # 진행 중 작업의 heartbeat 역할
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            # 유저당 진행 중인 동기화 작업은 하나만 (중복 요청은 기존 작업으로 합쳐짐)
+            models.UniqueConstraint(
+                fields=['user'],
+                condition=models.Q(status__in=['PENDING', 'RUNNING']),
+                name='unique_active_library_sync_job',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username}'s library sync #{self.pk} ({self.status})"
+
+
+class AppDetailsCache(models.Model):
+    # 스팀 상점 appdetails 응답 캐시 (Game.updated_at과 별개로 실제 수집 시점을 기록)
+    appid = models.BigIntegerField(primary_key=True)
+    success = models.BooleanField(default=True) # False면 상점에 정보가 없는 appid (negative cache)
+    data = models.JSONField(null=True, blank=True) # 응답의 data 부분 원본
+    fetched_at = models.DateTimeField(db_index=True)
+
+    def is_fresh(self, now=None):
+        now = now or timezone.now()
+        if self.success:
+            ttl = getattr(settings, 'APPDETAILS_CACHE_TTL', timedelta(days=3))
+        else:
+            ttl = getattr(settings, 'APPDETAILS_NEGATIVE_CACHE_TTL', timedelta(days=1))
+        return now - self.fetched_at < ttl
+
+    def __str__(self):
+        return f"appdetails cache {self.appid} ({'ok' if self.success else 'not found'})"
+
+
+class GameFacetCount(models.Model):
+    # 장르 × 가격대별 게임 수 (facets 엔드포인트용 집계 테이블, games/facets.py에서 갱신)
+    # genre가 NULL인 행은 장르와 관계없는 가격대별 전체 게임 수
+    genre = models.ForeignKey(Genre, on_delete=models.CASCADE, null=True, blank=True, related_name='facet_counts')
+    price_bucket = models.CharField(max_length=20)
+    count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['genre', 'price_bucket'], name='unique_game_facet_count'),
+            # NULL은 유니크 비교에서 빠지므로 전체 게임 행은 따로
+            models.UniqueConstraint(
+                fields=['price_bucket'],
+                condition=models.Q(genre__isnull=True),
+                name='unique_game_facet_total',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.genre or '전체'} / {self.price_bucket}: {self.count}"
+
+
+class CrawlerCheckpoint(models.Model):
+    # 오래 걸리는 수집 작업(init_steam_games 등)이 중단되어도 이어서 할 수 있도록 진행 지점을 저장
+    name = models.CharField(max_length=100, primary_key=True)
+    value = models.JSONField(default=dict)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name}: {self.value}"
+
+
+class SearchRecommendationCache(models.Model):
+    # 검색 결과가 없을 때 AI가 추천한 게임 (정규화한 검색어 → appid 목록), 빈 목록이면 추천할 게임이 없었던 검색어
+    query = models.CharField(max_length=255, primary_key=True)
+    appids = models.JSONField(default=list)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+    last_used_at = models.DateTimeField(db_index=True) # LRU 정리 기준
+    hit_count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"'{self.query}' → {self.appids}"
@@ -0,0 +1,125 @@
+# games/pagination.py
+import base64
+import json
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import F, Q
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(kind, values):
+    """ 정렬 기준(kind)과 마지막 행의 정렬 키 값을 불투명한 토큰으로 변환 """
+    raw = json.dumps({'k': kind, 'v': values}, separators=(',', ':'), default=str)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token, kind):
+    """ 토큰을 정렬 키 값 리스트로 복원. 다른 정렬에서 만든 토큰이면 InvalidCursor """
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        data = json.loads(raw)
+    except (ValueError, TypeError):
+        raise InvalidCursor("잘못된 cursor 값입니다.")
+    if not isinstance(data, dict) or data.get('k') != kind or not isinstance(data.get('v'), list):
+        raise InvalidCursor("정렬 조건이 바뀌어 cursor를 사용할 수 없습니다.")
+    return data['v']
+
+
+def _field(model, name):
+    try:
+        return model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return None # annotate로 만든 값
+
+
+def keyset_order_by(qs, ordering):
+    """ ordering(예: ['-release_date', '-appid'])대로 정렬. NULL은 방향과 관계없이 항상 마지막 """
+    exprs = []
+    for key in ordering:
+        name = key.lstrip('-')
+        field = _field(qs.model, name)
+        if field is not None and not field.null:
+            # NULL이 없는 컬럼은 NULLS LAST를 붙이지 않아야 DB가 인덱스 순서를 그대로 사용
+            exprs.append(key)
+        elif key.startswith('-'):
+            exprs.append(F(name).desc(nulls_last=True))
+        else:
+            exprs.append(F(name).asc(nulls_last=True))
+    return qs.order_by(*exprs)
+
+
+def keyset_filter(qs, ordering, values, include_nulls=True):
+    """
+    values(이전 페이지 마지막 행의 정렬 키) 다음에 오는 행만 남김.
+    (a, b, c) 순서라면: a 이후 OR (a 같음 AND b 이후) OR (a, b 같음 AND c 이후)
+    마지막 키는 유일한 값(appid)이어야 한다.
+    include_nulls=False면 맨 뒤에 오는 NULL 구간은 제외한다.
+    """
+    if len(values) != len(ordering):
+        raise InvalidCursor("잘못된 cursor 값입니다.")
+
+    model = qs.model
+    parsed = []
+    for key, value in zip(ordering, values):
+        field = _field(model, key.lstrip('-'))
+        try:
+            parsed.append(field.to_python(value) if field is not None and value is not None else value)
+        except Exception:
+            raise InvalidCursor("잘못된 cursor 값입니다.")
+
+    condition = Q(pk__in=[])
+    equal = Q()
+    for key, value in zip(ordering, parsed):
+        name = key.lstrip('-')
+        if value is None:
+            # NULL은 맨 뒤이므로 이 키만으로는 더 뒤에 올 값이 없음
+            after = Q(pk__in=[])
+            same = Q(**{f'{name}__isnull': True})
+        else:
+            lookup = 'lt' if key.startswith('-') else 'gt'
+            after = Q(**{f'{name}__{lookup}': value})
+            field = _field(model, name)
+            if include_nulls and field is not None and field.null:
+                after |= Q(**{f'{name}__isnull': True})
+            same = Q(**{name: value})
+        condition |= equal & after
+        equal &= same
+
+    # 첫 번째 키에 범위 조건을 한 번 더 걸어서 DB가 인덱스를 처음부터 훑지 않고 바로 찾아가도록
+    first_key, first_value = ordering[0], parsed[0]
+    name = first_key.lstrip('-')
+    if first_value is None:
+        bound = Q(**{f'{name}__isnull': True})
+    else:
+        bound = Q(**{f'{name}__{"lte" if first_key.startswith("-") else "gte"}': first_value})
+        field = _field(model, name)
+        if include_nulls and field is not None and field.null:
+            bound |= Q(**{f'{name}__isnull': True})
+    return qs.filter(bound, condition)
+
+
+def keyset_values(obj, ordering):
+    return [getattr(obj, key.lstrip('-')) for key in ordering]
+
+
+def keyset_paginate(qs, ordering, cursor_values, limit):
+    """ 다음 페이지 행 목록과, 그다음 페이지가 있으면 마지막 행의 정렬 키 값을 반환 """
+    qs = keyset_order_by(qs, ordering)
+    first_name = ordering[0].lstrip('-')
+    first_field = _field(qs.model, first_name)
+
+    if cursor_values is None:
+        items = list(qs[:limit + 1])
+    elif first_field is not None and first_field.null and cursor_values and cursor_values[0] is not None:
+        # NULL 구간은 맨 뒤 → NULL이 아닌 구간은 인덱스 범위 검색으로 읽고, 모자라면 NULL 구간을 처음부터 이어서 읽음
+        items = list(keyset_filter(qs, ordering, cursor_values, include_nulls=False)[:limit + 1])
+        if len(items) <= limit:
+            items += list(qs.filter(**{f'{first_name}__isnull': True})[:limit + 1 - len(items)])
+    else:
+        items = list(keyset_filter(qs, ordering, cursor_values)[:limit + 1])
+    has_more = len(items) > limit
+    items = items[:limit]
+    next_values = keyset_values(items[-1], ordering) if has_more and items else None
+    return items, next_values
@@ -0,0 +1,122 @@
+# games/recommendations.py
+"""
+검색 결과가 없을 때의 AI 추천 캐시.
+같은 오타/검색어마다 LLM을 다시 부르지 않도록 정규화한 검색어 → appid 목록을 DB에 저장한다.
+  - 유효 기간(TTL)이 지나면 다시 물어봄, 추천할 게임이 없었던 검색어도 짧게 저장 (negative cache)
+  - 항목 수가 상한을 넘으면 가장 오래 안 쓰인 검색어부터 삭제 (LRU)
+  - 같은 검색어의 요청이 동시에 들어오면 프로세스 안에서 LLM 호출 한 번만 하고 나머지는 그 결과를 기다림
+"""
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from datetime import timedelta
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+
+from .autocomplete import normalize_title
+from .eviction import evict_overflow
+from .models import SearchRecommendationCache
+
+_inflight = {}
+_inflight_lock = threading.Lock()
+_writes_since_eviction = 0
+
+
+def normalize_query(query):
+    return normalize_title(query)[:255]
+
+
+def get_cached_appids(key, now=None):
+    """ 유효한 캐시가 있으면 appid 목록(빈 목록 포함), 없으면 None """
+    now = now or timezone.now()
+    entry = SearchRecommendationCache.objects.filter(query=key, expires_at__gt=now).first()
+    if entry is None:
+        return None
+    SearchRecommendationCache.objects.filter(query=key).update(last_used_at=now, hit_count=F('hit_count') + 1)
+    return entry.appids
+
+
+def store_appids(key, appids):
+    now = timezone.now()
+    if appids:
+        ttl = getattr(settings, 'SEARCH_RECOMMENDATION_CACHE_TTL', timedelta(days=7))
+    else:
+        ttl = getattr(settings, 'SEARCH_RECOMMENDATION_NEGATIVE_CACHE_TTL', timedelta(hours=6))
+    SearchRecommendationCache.objects.update_or_create(
+        query=key,
+        defaults={'appids': list(appids), 'expires_at': now + ttl, 'last_used_at': now},
+    )
+    _maybe_evict()
+
+
+def _maybe_evict():
+    global _writes_since_eviction
+    _writes_since_eviction += 1
+    if _writes_since_eviction >= getattr(settings, 'SEARCH_RECOMMENDATION_CACHE_EVICT_EVERY', 100):
+        _writes_since_eviction = 0
+        evict_recommendation_cache()
+
+
+def evict_recommendation_cache(max_entries=None):
+    """ 만료된 항목과, 상한을 넘는 만큼 가장 오래 안 쓰인 항목을 삭제. 삭제한 개수 반환 """
+    max_entries = max_entries or getattr(settings, 'SEARCH_RECOMMENDATION_CACHE_MAX_ENTRIES', 20000)
+    deleted, _ = SearchRecommendationCache.objects.filter(expires_at__lte=timezone.now()).delete()
+    return deleted + evict_overflow(SearchRecommendationCache.objects.all(), 'last_used_at', max_entries)
+
+
+def _single_flight(key, func, default=None):
+    """
+    같은 key로 진행 중인 호출이 있으면 그 결과를 기다리고, 없으면 직접 func()를 호출.
+    기다리다 SEARCH_RECOMMENDATION_WAIT_TIMEOUT초가 지나면 default를 반환 (먼저 호출한 쪽은 계속 진행)
+    """
+    with _inflight_lock:
+        future = _inflight.get(key)
+        leader = future is None
+        if leader:
+            future = Future()
+            _inflight[key] = future
+
+    if not leader:
+        try:
+            return future.result(timeout=getattr(settings, 'SEARCH_RECOMMENDATION_WAIT_TIMEOUT', 40))
+        except FutureTimeoutError:
+            print(f"❌ [Search Recommendation] '{key}' 추천 대기 시간 초과")
+            return default
+
+    try:
+        result = func()
+        future.set_result(result)
+        return result
+    except Exception as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+
+
+def cached_recommendations(query, resolve):
+    """
+    검색어에 대한 추천 appid 목록.
+    캐시에 없으면 resolve()(LLM 호출 → appid 목록, 실패하면 None)를 부르고 결과를 저장한다.
+    None(일시적 실패)은 저장하지 않으므로 다음 요청에서 다시 시도한다.
+    """
+    key = normalize_query(query)
+    if not key:
+        return []
+    appids = get_cached_appids(key)
+    if appids is not None:
+        return appids
+
+    def load():
+        # 기다리는 동안 다른 프로세스가 채웠을 수도 있으므로 한 번 더 확인
+        cached = get_cached_appids(key)
+        if cached is not None:
+            return cached
+        resolved = resolve()
+        if resolved is not None:
+            store_appids(key, resolved)
+        return resolved or []
+
+    # 먼저 들어온 요청의 LLM 호출이 너무 오래 걸리면 추천 없이 응답 (실패했을 때와 같음)
+    return _single_flight(key, load, default=[])
@@ -0,0 +1,211 @@
+# games/search.py
+from django.db import connection
+from django.db.models import Case, When, Value, IntegerField
+
+from .models import Game
+from .pagination import InvalidCursor, keyset_paginate
+
+# SQLite FTS5(trigram) 가상 테이블. rowid = appid, games_game의 트리거로 동기화된다.
+FTS_TABLE = 'games_game_fts'
+
+# trigram 토크나이저는 3글자 미만 검색어를 매칭할 수 없음
+FTS_MIN_QUERY_LENGTH = 3
+
+FTS_TRIGGERS = {
+    f'{FTS_TABLE}_ai': f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON games_game BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, title) VALUES (new.appid, new.title);
+        END
+    """,
+    f'{FTS_TABLE}_ad': f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON games_game BEGIN
+            DELETE FROM {FTS_TABLE} WHERE rowid = old.appid;
+        END
+    """,
+    f'{FTS_TABLE}_au': f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF appid, title ON games_game BEGIN
+            DELETE FROM {FTS_TABLE} WHERE rowid = old.appid;
+            INSERT INTO {FTS_TABLE}(rowid, title) VALUES (new.appid, new.title);
+        END
+    """,
+}
+
+
+def install_search_index(conn=None):
+    """
+    FTS 테이블과 동기화 트리거를 생성 (SQLite 전용, 이미 있으면 그대로 둠).
+    SQLite에서 테이블을 재생성하는 마이그레이션은 트리거를 지우므로,
+    트리거가 하나라도 없었으면 색인을 games_game 기준으로 다시 만든다.
+    """
+    conn = conn or connection
+    if conn.vendor != 'sqlite':
+        return False
+
+    with conn.cursor() as cursor:
+        try:
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(title, tokenize='trigram')"
+            )
+        except Exception:
+            # trigram 토크나이저가 없는 오래된 SQLite → ORM 검색으로 동작
+            return False
+
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'games_game'"
+        )
+        existing = {row[0] for row in cursor.fetchall()}
+        missing = [name for name in FTS_TRIGGERS if name not in existing]
+        for name in missing:
+            cursor.execute(FTS_TRIGGERS[name])
+        if missing:
+            rebuild_search_index(conn)
+    return True
+
+
+def rebuild_search_index(conn=None):
+    """ FTS 색인을 games_game 전체로 다시 채움 (대량 적재 후나 트리거 복구 시) """
+    conn = conn or connection
+    with conn.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE}")
+        cursor.execute(f"INSERT INTO {FTS_TABLE}(rowid, title) SELECT appid, title FROM games_game")
+
+
+def drop_search_index(conn=None):
+    conn = conn or connection
+    if conn.vendor != 'sqlite':
+        return
+    with conn.cursor() as cursor:
+        for name in FTS_TRIGGERS:
+            cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+        cursor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+_index_available = False
+
+
+def search_index_available():
+    """ FTS 색인 사용 가능 여부 (한 번 확인되면 프로세스 동안 기억) """
+    global _index_available
+    if _index_available or connection.vendor != 'sqlite':
+        return _index_available
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE])
+        _index_available = cursor.fetchone() is not None
+    return _index_available
+
+
+def _fts_phrase(query):
+    # 검색어 전체를 하나의 구문으로 → trigram 색인에서 부분 문자열 일치와 같음
+    return '"' + query.replace('"', '""') + '"'
+
+
+def _like_prefix(query):
+    escaped = query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return escaped + '%'
+
+
+def search_games_fts(query, offset=0, limit=None):
+    """ FTS 색인 검색: 제목이 검색어로 시작하는 게임 우선, 그다음 bm25 점수순 """
+    phrase = _fts_phrase(query)
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT count(*) FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [phrase])
+        total_count = cursor.fetchone()[0]
+
+        cursor.execute(
+            f"""
+            SELECT rowid FROM {FTS_TABLE}
+            WHERE {FTS_TABLE} MATCH %s
+            ORDER BY (title LIKE %s ESCAPE '\\') DESC, bm25({FTS_TABLE}), rowid
+            LIMIT %s OFFSET %s
+            """,
+            [phrase, _like_prefix(query), -1 if limit is None else limit, offset],
+        )
+        appids = [row[0] for row in cursor.fetchall()]
+
+    games = Game.objects.in_bulk(appids)
+    return total_count, [games[appid] for appid in appids if appid in games]
+
+
+def search_games_fts_after(query, cursor_values, limit):
+    """ FTS 검색의 keyset 페이지: (접두어 일치 여부, bm25, appid) 순서에서 cursor 다음 행들 """
+    params = [_like_prefix(query), _fts_phrase(query)]
+    after = ''
+    if cursor_values is not None:
+        # 접두어 일치(1)가 먼저 나오므로 비교할 때는 부호를 뒤집음
+        after = 'WHERE (-is_prefix, score, rowid) > (%s, %s, %s)'
+        try:
+            prefix, score, appid = cursor_values
+            params += [-int(prefix), float(score), int(appid)]
+        except (TypeError, ValueError):
+            raise InvalidCursor("잘못된 cursor 값입니다.")
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            SELECT rowid, is_prefix, score FROM (
+                SELECT rowid, (title LIKE %s ESCAPE '\\') AS is_prefix, bm25({FTS_TABLE}) AS score
+                FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s
+            ) {after}
+            ORDER BY is_prefix DESC, score, rowid
+            LIMIT %s
+            """,
+            params + [limit + 1],
+        )
+        rows = cursor.fetchall()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    games = Game.objects.in_bulk([row[0] for row in rows])
+    next_values = None
+    if has_more and rows:
+        appid, prefix, score = rows[-1]
+        next_values = [prefix, score, appid]
+    return [games[row[0]] for row in rows if row[0] in games], next_values
+
+
+def _orm_search_queryset(query):
+    return Game.objects.filter(title__icontains=query).annotate(
+        search_priority=Case(
+            When(title__istartswith=query, then=Value(0)),
+            default=Value(1),
+            output_field=IntegerField(),
+        )
+    )
+
+
+def search_games_orm(query, offset=0, limit=None):
+    """ ORM 검색 (SQLite가 아니거나 검색어가 짧을 때) """
+    qs = _orm_search_queryset(query).order_by('search_priority', 'title')
+
+    total_count = qs.count()
+    if limit is not None:
+        qs = qs[offset : offset + limit]
+    elif offset:
+        qs = qs[offset:]
+    return total_count, list(qs)
+
+
+def search_games(query, offset=0, limit=None):
+    """ 제목 검색. 반환값: (전체 결과 수, 해당 페이지의 Game 목록) """
+    if len(query) >= FTS_MIN_QUERY_LENGTH and search_index_available():
+        return search_games_fts(query, offset, limit)
+    return search_games_orm(query, offset, limit)
+
+
+def search_games_after(query, cursor_values, limit, with_count=False):
+    """
+    cursor(keyset) 방식 제목 검색.
+    반환값: (전체 결과 수 또는 None, 해당 페이지의 Game 목록, 다음 페이지 cursor 값 또는 None)
+    """
+    if len(query) >= FTS_MIN_QUERY_LENGTH and search_index_available():
+        games, next_values = search_games_fts_after(query, cursor_values, limit)
+        total_count = None
+        if with_count:
+            with connection.cursor() as cursor:
+                cursor.execute(f"SELECT count(*) FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [_fts_phrase(query)])
+                total_count = cursor.fetchone()[0]
+        return total_count, games, next_values
+
+    qs = _orm_search_queryset(query)
+    games, next_values = keyset_paginate(qs, ['search_priority', 'title', 'appid'], cursor_values, limit)
+    return (qs.count() if with_count else None), games, next_values
@@ -1,7 +1,7 @@
 # games/serializers.py
 
 from rest_framework import serializers
-from .models import Game, UserGameLibrary
+from .models import Game, UserGameLibrary, LibrarySyncJob
 from ai_analysis.serializers import ReviewSummarySerializer
 
 class GameSerializer(serializers.ModelSerializer):
@@ -10,6 +10,9 @@ class GameSerializer(serializers.ModelSerializer):
     
     review_summary = ReviewSummarySerializer(read_only=True)
 
+    # 장르는 Genre 테이블로 분리되었지만 응답은 기존처럼 "액션, RPG" 문자열 유지
+    genres = serializers.CharField(source='genre_names', read_only=True)
+
     class Meta:
         model = Game
         fields = [
@@ -28,3 +31,15 @@ class UserGameLibrarySerializer(serializers.ModelSerializer):
     class Meta:
         model = UserGameLibrary
         fields = ['game', 'playtime_total', 'playtime_recent_2weeks', 'last_updated_at']
+
+
+class LibrarySyncJobSerializer(serializers.ModelSerializer):
+    job_id = serializers.IntegerField(source='id', read_only=True)
+
+    class Meta:
+        model = LibrarySyncJob
+        fields = [
+            'job_id', 'status', 'total_count', 'processed_count',
+            'enriched_count', 'error_count', 'error_message', 'skipped',
+            'created_at', 'updated_at', 'finished_at',
+        ]
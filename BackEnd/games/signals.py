@@ -1,11 +1,51 @@
 # games/signals.py
-from django.db.models.signals import post_save
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete, post_migrate
 from django.dispatch import receiver
 from django.conf import settings
-from .models import UserFavoriteGame
+from .models import Game, UserFavoriteGame
+from .counts import bump_catalog_version
+from .facets import apply_facet_deltas, facet_keys_for
+from .search import install_search_index
 
 # 유저가 생성되면 자동으로 좋아하는 게임 테이블에 생성!
 @receiver(post_save, sender=settings.AUTH_USER_MODEL)
 def create_user_favorite_game(sender, instance, created, **kwargs):
     if created:
-        UserFavoriteGame.objects.create(user=instance)
\ No newline at end of file
+        UserFavoriteGame.objects.create(user=instance)
+
+# 목록 개수/facet/자동완성 색인이 의존하는 Game 필드 (장르는 save_game_genres에서 따로 반영)
+CATALOG_FIELDS = {'title', 'price'}
+
+# 저장/삭제 전 게임의 제목/가격과 (장르, 가격대) 집계 키를 기억 → 저장 후와 비교해서 달라진 것만 반영
+@receiver(pre_save, sender=Game)
+@receiver(pre_delete, sender=Game)
+def remember_catalog_state(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not CATALOG_FIELDS & set(update_fields):
+        # 설명/이미지/조회 수 등만 저장하면 카탈로그는 그대로
+        instance._catalog_row = instance._facet_keys = None
+        return
+    instance._catalog_row = Game.objects.filter(pk=instance.pk).values_list('title', 'price').first()
+    instance._facet_keys = facet_keys_for([instance.pk])
+
+# 게임이 추가/삭제되거나 제목/가격/가격대가 바뀐 경우에만 facet 집계를 고치고 카탈로그 버전을 올림
+# (결과 개수/facet 캐시와 자동완성 색인 무효화, bulk 작업은 호출하는 쪽에서 직접)
+@receiver(post_save, sender=Game)
+@receiver(post_delete, sender=Game)
+def invalidate_catalog_caches(sender, instance, signal, **kwargs):
+    before = getattr(instance, '_facet_keys', None)
+    if before is None:
+        return
+    if signal is post_delete:
+        apply_facet_deltas(before, {})
+        bump_catalog_version()
+        return
+    changed = apply_facet_deltas(before, facet_keys_for([instance.pk]))
+    if changed or instance._catalog_row != (instance.title, instance.price):
+        bump_catalog_version()
+
+# SQLite에서 games_game을 재생성하는 마이그레이션은 FTS 트리거를 지우므로 마이그레이션 후 복구
+@receiver(post_migrate)
+def ensure_game_search_index(sender, using, **kwargs):
+    if sender.name == 'games':
+        from django.db import connections
+        install_search_index(connections[using])
@@ -0,0 +1,227 @@
+# games/steam_client.py
+"""
+스팀 API 공용 클라이언트.
+모든 스팀 호출(상점/웹 API/커뮤니티)은 이 모듈을 거쳐서 나간다.
+  - keep-alive 커넥션 풀 (요청마다 TLS 핸드셰이크를 하지 않도록)
+  - 엔드포인트별 타임아웃
+  - 429/5xx 응답과 네트워크 오류에 대한 지터 백오프 재시도 (대기 시간 상한, GET만 기본 재시도)
+  - 프로세스 전체가 공유하는 토큰 버킷 속도 제한 (호스트 그룹별, 사용자 요청용 버킷은 따로)
+  - 동기(requests) / 비동기(httpx) 버전
+"""
+import asyncio
+import random
+import threading
+import time
+import weakref
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from django.conf import settings
+
+# 엔드포인트 이름 → URL, 타임아웃(초), 속도 제한 버킷
+ENDPOINTS = {
+    'appdetails': {
+        'url': "https://store.steampowered.com/api/appdetails",
+        'timeout': 5, 'bucket': 'store',
+    },
+    'appreviews': {
+        'url': "https://store.steampowered.com/appreviews/{appid}",
+        'timeout': 5, 'bucket': 'store',
+    },
+    'owned_games': {
+        'url': "https://api.steampowered.com/IPlayerService/GetOwnedGames/v0001/",
+        'timeout': 10, 'bucket': 'webapi',
+    },
+    'player_summaries': {
+        'url': "https://api.steampowered.com/ISteamUser/GetPlayerSummaries/v0002/",
+        'timeout': 5, 'bucket': 'webapi',
+    },
+    'app_list': {
+        'url': "https://api.steampowered.com/IStoreService/GetAppList/v1/",
+        'timeout': 30, 'bucket': 'webapi',
+    },
+    'openid': {
+        'url': "https://steamcommunity.com/openid/login",
+        'timeout': 10, 'bucket': 'community',
+    },
+}
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# 같은 요청을 다시 보내도 되는 메서드 (POST 등은 기본적으로 재시도하지 않음)
+IDEMPOTENT_METHODS = {'GET', 'HEAD', 'OPTIONS'}
+
+
+class TokenBucket:
+    """
+    스레드/코루틴이 함께 쓰는 토큰 버킷.
+    rate: 초당 채워지는 토큰 수, capacity: 최대 버스트
+    토큰을 미리 예약(음수 허용)하고 필요한 만큼만 기다리므로 대기 순서가 공정하다.
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self, amount=1):
+        """ 토큰 amount개를 예약하고, 사용 가능해질 때까지 기다려야 하는 시간(초)을 반환 """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            self.tokens -= amount
+            return 0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def acquire(self, amount=1):
+        wait_for = self.reserve(amount)
+        if wait_for > 0:
+            time.sleep(wait_for)
+
+    async def acquire_async(self, amount=1):
+        wait_for = self.reserve(amount)
+        if wait_for > 0:
+            await asyncio.sleep(wait_for)
+
+
+def _build_buckets():
+    limits = getattr(settings, 'STEAM_RATE_LIMITS', {})
+    return {name: TokenBucket(rate, burst) for name, (rate, burst) in limits.items()}
+
+
+_buckets = _build_buckets()
+
+
+def _bucket_for(endpoint, interactive=False):
+    """
+    엔드포인트의 토큰 버킷. interactive면 '<버킷>:interactive' 버킷을 써서
+    대량 수집이 미리 예약해 둔 토큰 뒤에 사용자 요청이 줄 서지 않도록 함 (없으면 공용 버킷)
+    """
+    name = ENDPOINTS[endpoint]['bucket']
+    if interactive and f'{name}:interactive' in _buckets:
+        return _buckets[f'{name}:interactive']
+    return _buckets.get(name)
+
+
+def _build_session():
+    pool_size = getattr(settings, 'STEAM_HTTP_POOL_SIZE', 16)
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+_session = _build_session()
+
+# httpx.AsyncClient는 생성된 이벤트 루프에 묶이므로 루프별로 하나씩 유지
+_async_clients = weakref.WeakKeyDictionary()
+
+
+def _get_async_client():
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        pool_size = getattr(settings, 'STEAM_HTTP_POOL_SIZE', 16)
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+        )
+        _async_clients[loop] = client
+    return client
+
+
+def _backoff(attempt, retry_after=None):
+    """
+    재시도 전 대기 시간: Retry-After가 있으면 따르고, 없으면 full jitter 지수 백오프.
+    요청 스레드를 오래 붙잡지 않도록 STEAM_MAX_BACKOFF초를 넘지 않음.
+    """
+    max_backoff = getattr(settings, 'STEAM_MAX_BACKOFF', 5.0)
+    if retry_after:
+        try:
+            return min(max(float(retry_after), 0), max_backoff)
+        except ValueError:
+            pass
+    base = getattr(settings, 'STEAM_RETRY_BACKOFF', 0.5)
+    return min(random.uniform(0, base * (2 ** attempt)), max_backoff)
+
+
+def _max_retries(method, max_retries, interactive=False):
+    if max_retries is not None:
+        return max_retries
+    if method.upper() not in IDEMPOTENT_METHODS:
+        return 0
+    if interactive:
+        return getattr(settings, 'STEAM_INTERACTIVE_MAX_RETRIES', 0)
+    return getattr(settings, 'STEAM_MAX_RETRIES', 3)
+
+
+def _resolve(endpoint, path_params, timeout):
+    spec = ENDPOINTS[endpoint]
+    url = spec['url'].format(**(path_params or {}))
+    return url, timeout or spec['timeout']
+
+
+def steam_request(method, endpoint, path_params=None, timeout=None, max_retries=None, interactive=False, **kwargs):
+    """
+    스팀 엔드포인트로 요청을 보내고 requests.Response를 반환.
+    재시도 가능한 상태코드(429/5xx)는 마지막 시도의 응답을 그대로 돌려주고,
+    네트워크 오류는 재시도 후에도 실패하면 예외를 그대로 올린다.
+    max_retries: 기본값은 GET이면 STEAM_MAX_RETRIES, POST 등은 0.
+    interactive: 사용자 요청 안에서 바로 응답해야 하는 호출. 별도 토큰 버킷을 쓰고
+                 기본 재시도 횟수는 STEAM_INTERACTIVE_MAX_RETRIES (빠르게 실패)
+    """
+    url, timeout = _resolve(endpoint, path_params, timeout)
+    bucket = _bucket_for(endpoint, interactive)
+    max_retries = _max_retries(method, max_retries, interactive)
+
+    for attempt in range(max_retries + 1):
+        if bucket:
+            bucket.acquire()
+        try:
+            response = _session.request(method, url, timeout=timeout, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == max_retries:
+                raise
+            time.sleep(_backoff(attempt))
+            continue
+
+        if response.status_code not in RETRY_STATUSES or attempt == max_retries:
+            return response
+        time.sleep(_backoff(attempt, response.headers.get('Retry-After')))
+
+
+def steam_get(endpoint, params=None, **kwargs):
+    return steam_request('GET', endpoint, params=params, **kwargs)
+
+
+def steam_post(endpoint, data=None, **kwargs):
+    return steam_request('POST', endpoint, data=data, **kwargs)
+
+
+async def async_steam_request(method, endpoint, path_params=None, timeout=None, max_retries=None, interactive=False,
+                              **kwargs):
+    """ steam_request의 비동기 버전 (httpx.Response 반환) """
+    url, timeout = _resolve(endpoint, path_params, timeout)
+    bucket = _bucket_for(endpoint, interactive)
+    max_retries = _max_retries(method, max_retries, interactive)
+    client = _get_async_client()
+
+    for attempt in range(max_retries + 1):
+        if bucket:
+            await bucket.acquire_async()
+        try:
+            response = await client.request(method, url, timeout=timeout, **kwargs)
+        except (httpx.TransportError, httpx.TimeoutException):
+            if attempt == max_retries:
+                raise
+            await asyncio.sleep(_backoff(attempt))
+            continue
+
+        if response.status_code not in RETRY_STATUSES or attempt == max_retries:
+            return response
+        await asyncio.sleep(_backoff(attempt, response.headers.get('Retry-After')))
+
+
+async def async_steam_get(endpoint, params=None, **kwargs):
+    return await async_steam_request('GET', endpoint, params=params, **kwargs)
@@ -0,0 +1,288 @@
+# games/tasks.py
+import math
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Game, LibrarySyncJob
+from .utils import (
+    fetch_owned_games, library_fingerprint, sync_user_library, enrich_games,
+    fetch_game_detail_internal, save_game_detail,
+)
+from ai_analysis.models import ReviewSummary
+from ai_analysis.utils import fetch_steam_reviews, get_ai_review_summary, run_ai
+
+# 웹 프로세스 안에서 오래 걸리는 작업을 처리하는 공용 스레드 풀
+_executor = ThreadPoolExecutor(
+    max_workers=getattr(settings, 'BACKGROUND_TASK_WORKERS', 4),
+    thread_name_prefix='background-task',
+)
+# 리뷰 요약 전용 스레드 풀 (수십 분 걸리는 라이브러리 동기화 뒤에 줄 서지 않도록 분리)
+_review_summary_executor = ThreadPoolExecutor(
+    max_workers=getattr(settings, 'REVIEW_SUMMARY_WORKERS', 2),
+    thread_name_prefix='review-summary',
+)
+
+
+def _submit(executor, func, *args, **kwargs):
+    def run():
+        try:
+            return func(*args, **kwargs)
+        except Exception:
+            print(f"❌ [Background Task Error] {func.__name__}")
+            traceback.print_exc()
+        finally:
+            close_old_connections()
+    return executor.submit(run)
+
+
+def submit_background(func, *args, **kwargs):
+    """ 함수를 백그라운드 스레드에서 실행 (스레드별 DB 연결은 작업이 끝나면 정리) """
+    return _submit(_executor, func, *args, **kwargs)
+
+
+# --- 게임 상세 정보 백그라운드 갱신 (stale-while-revalidate) ---
+_refreshing_appids = set()
+_refreshing_lock = threading.Lock()
+
+
+def refresh_game_detail(appid, force=False):
+    """ 상점 정보를 다시 가져와 Game에 반영 """
+    detail = fetch_game_detail_internal(appid, force=force)
+    game = Game.objects.filter(appid=appid).first()
+    if detail and game:
+        save_game_detail(game, detail)
+
+
+def schedule_game_detail_refresh(appid, force=False):
+    """ 같은 게임의 갱신이 이미 진행 중이면 새로 예약하지 않음. 예약했으면 True """
+    with _refreshing_lock:
+        if appid in _refreshing_appids:
+            return False
+        _refreshing_appids.add(appid)
+
+    def run():
+        try:
+            refresh_game_detail(appid, force=force)
+        finally:
+            with _refreshing_lock:
+                _refreshing_appids.discard(appid)
+
+    submit_background(run)
+    return True
+
+
+# --- 라이브러리 동기화 작업 ---
+def expire_stale_sync_jobs(user=None):
+    """ heartbeat(updated_at)가 끊긴 진행 중 작업은 실패 처리 (프로세스가 죽은 경우 대비) """
+    timeout = getattr(settings, 'LIBRARY_SYNC_JOB_TIMEOUT', timedelta(minutes=30))
+    qs = LibrarySyncJob.objects.filter(
+        status__in=LibrarySyncJob.ACTIVE_STATUSES,
+        updated_at__lt=timezone.now() - timeout,
+    )
+    if user is not None:
+        qs = qs.filter(user=user)
+    return qs.update(status='FAILED', error_message='작업이 시간 내에 끝나지 않았습니다.', finished_at=timezone.now())
+
+
+def library_sync_retry_after(user):
+    """ 최소 재동기화 간격이 지나지 않았으면 남은 초를, 아니면 0을 반환 """
+    min_interval = getattr(settings, 'LIBRARY_SYNC_MIN_INTERVAL', timedelta(minutes=5))
+    if not user.last_synced_at:
+        return 0
+    remaining = (user.last_synced_at + min_interval - timezone.now()).total_seconds()
+    return math.ceil(remaining) if remaining > 0 else 0
+
+
+def enqueue_library_sync(user):
+    """
+    유저의 라이브러리 동기화 작업을 등록하고 (job, created)를 반환.
+    이미 대기/진행 중인 작업이 있으면 새로 만들지 않고 그 작업을 돌려준다.
+    """
+    expire_stale_sync_jobs(user)
+    active = LibrarySyncJob.objects.filter(user=user, status__in=LibrarySyncJob.ACTIVE_STATUSES).first()
+    if active:
+        return active, False
+
+    try:
+        with transaction.atomic():
+            job = LibrarySyncJob.objects.create(user=user)
+    except IntegrityError:
+        # 동시에 들어온 요청이 먼저 작업을 만든 경우
+        return LibrarySyncJob.objects.get(user=user, status__in=LibrarySyncJob.ACTIVE_STATUSES), False
+
+    if getattr(settings, 'LIBRARY_SYNC_RUN_IN_PROCESS', True):
+        submit_background(run_library_sync_job, job.pk)
+    return job, True
+
+
+def claim_library_sync_job(job_id):
+    """ 대기 중인 작업을 진행 중으로 바꿈. 다른 워커가 먼저 가져갔으면 False """
+    return LibrarySyncJob.objects.filter(pk=job_id, status='PENDING').update(status='RUNNING') == 1
+
+
+def run_library_sync_job(job_id):
+    """ 스팀 보유 게임 조회 → 라이브러리 반영 → 상세 정보 수집을 진행 상황과 함께 실행 """
+    if not claim_library_sync_job(job_id):
+        return
+
+    job = LibrarySyncJob.objects.select_related('user').get(pk=job_id)
+    user = job.user
+    try:
+        games_data = fetch_owned_games(user.username)
+        fingerprint = library_fingerprint(games_data)
+
+        # 지난 동기화 이후 보유 게임/플레이타임이 그대로면 DB는 건드리지 않음
+        if fingerprint == user.library_fingerprint:
+            user.last_synced_at = timezone.now()
+            user.save(update_fields=['last_synced_at'])
+            job.total_count = job.processed_count = len(games_data)
+            job.skipped = True
+            job.status = 'COMPLETED'
+            job.finished_at = timezone.now()
+            job.save()
+            return
+
+        result = sync_user_library(user, games_data)
+
+        missing = result['missing_detail_appids']
+        job.total_count = len(games_data)
+        job.processed_count = job.total_count - len(missing)
+        job.save(update_fields=['total_count', 'processed_count', 'updated_at'])
+
+        base_processed = job.processed_count
+        progress_interval = getattr(settings, 'LIBRARY_SYNC_PROGRESS_INTERVAL', 20)
+
+        def on_progress(done, enriched, failed):
+            if done % progress_interval and done != len(missing):
+                return
+            LibrarySyncJob.objects.filter(pk=job_id).update(
+                processed_count=base_processed + done,
+                enriched_count=enriched,
+                error_count=failed,
+                updated_at=timezone.now(),
+            )
+
+        enrich_result = enrich_games(missing, on_progress=on_progress)
+
+        job.processed_count = job.total_count
+        job.enriched_count = enrich_result['enriched']
+        # 상점에 없는 게임(삭제/지역 제한)은 다시 시도해도 그대로이므로 오류로 세지 않음
+        job.error_count = enrich_result['failed']
+    except Exception as e:
+        LibrarySyncJob.objects.filter(pk=job_id).update(
+            status='FAILED', error_message=str(e), finished_at=timezone.now(),
+        )
+        return
+
+    user.last_synced_at = timezone.now()
+    # 네트워크 오류 등으로 상세 정보를 못 채운 게임이 있으면 지문을 남기지 않음 → 다음 동기화에서 다시 수집
+    user.library_fingerprint = fingerprint if job.error_count == 0 else ''
+    user.save(update_fields=['last_synced_at', 'library_fingerprint'])
+
+    job.status = 'COMPLETED'
+    job.finished_at = timezone.now()
+    job.save()
+
+
+# --- 리뷰 AI 요약 작업 (게임당 한 작업, 만료 시각이 있는 lease로 보장) ---
+REVIEW_SUMMARY_ERROR_MESSAGES = ["요약을 생성할 수 없습니다.", "분석 결과가 유효하지 않습니다.", "표시할 리뷰가 없습니다."]
+
+
+def expire_review_summary_lease(game_id):
+    """ lease가 만료된 분석 중 상태는 실패 처리 (작업 스레드/프로세스가 죽은 경우 대비) """
+    return ReviewSummary.objects.filter(
+        game_id=game_id, status='PROCESSING', lease_expires_at__lt=timezone.now(),
+    ).update(status='FAILED', lease_owner='', lease_expires_at=None, last_updated_at=timezone.now())
+
+
+def acquire_review_summary_lease(game_id):
+    """
+    게임의 요약 작업 lease를 얻으면 owner 토큰을, 다른 작업이 진행 중이면 None을 반환.
+    조건부 UPDATE 한 번으로 가져가므로 여러 프로세스가 동시에 요청해도 한 곳만 성공한다.
+    """
+    try:
+        with transaction.atomic():
+            ReviewSummary.objects.get_or_create(game_id=game_id, defaults={'summary_text': ''})
+    except IntegrityError:
+        pass # 동시에 들어온 요청이 먼저 행을 만든 경우
+
+    now = timezone.now()
+    owner = uuid.uuid4().hex
+    timeout = getattr(settings, 'REVIEW_SUMMARY_LEASE_TIMEOUT', timedelta(minutes=5))
+    acquired = ReviewSummary.objects.filter(game_id=game_id).filter(
+        ~Q(status='PROCESSING') | Q(lease_expires_at__isnull=True) | Q(lease_expires_at__lt=now)
+    ).update(status='PROCESSING', lease_owner=owner, lease_expires_at=now + timeout, last_updated_at=now)
+    return owner if acquired else None
+
+
+def renew_review_summary_lease(game_id, owner):
+    """
+    작업이 실제로 시작될 때 lease 만료 시각을 다시 잡음.
+    대기하는 동안 lease가 만료되어 다른 작업이 가져갔으면 False (이 작업은 아무것도 하지 않고 끝냄)
+    """
+    now = timezone.now()
+    timeout = getattr(settings, 'REVIEW_SUMMARY_LEASE_TIMEOUT', timedelta(minutes=5))
+    return ReviewSummary.objects.filter(
+        game_id=game_id, lease_owner=owner, status='PROCESSING', lease_expires_at__gte=now,
+    ).update(lease_expires_at=now + timeout, last_updated_at=now) == 1
+
+
+def finish_review_summary(game_id, owner, status, summary_text, tokens_used=0):
+    """ lease를 가진 작업만 결과를 기록 (만료 후 다른 작업이 가져갔으면 False) """
+    return ReviewSummary.objects.filter(game_id=game_id, lease_owner=owner).update(
+        status=status, summary_text=summary_text, tokens_used=tokens_used,
+        lease_owner='', lease_expires_at=None, last_updated_at=timezone.now(),
+    ) == 1
+
+
+def review_summary_outcome(reviews, ai_text):
+    """ 수집한 리뷰와 AI 응답으로 저장할 (상태, 요약문)을 결정 """
+    if not reviews:
+        return 'FAILED', "분석할 리뷰가 없습니다."
+    if not ai_text or ai_text in REVIEW_SUMMARY_ERROR_MESSAGES:
+        return 'FAILED', ai_text or "AI 응답이 비어있습니다."
+    return 'COMPLETED', ai_text
+
+
+def run_review_summary_job(game_id, owner):
+    """ 스팀 리뷰 수집 → AI 요약 → 결과 저장 """
+    if not renew_review_summary_lease(game_id, owner):
+        print(f"❌ [Review Summary Error] {game_id}: 시작 전에 lease가 만료되었습니다.")
+        return
+    try:
+        reviews = fetch_steam_reviews(game_id)
+        ai_text, tokens = run_ai(get_ai_review_summary(reviews), default=(None, 0)) if reviews else (None, 0)
+        finish_review_summary(game_id, owner, *review_summary_outcome(reviews, ai_text), tokens_used=tokens)
+    except Exception as e:
+        print(f"❌ [Review Summary Error] {game_id}: {e}")
+        finish_review_summary(game_id, owner, 'FAILED', "분석 중 오류가 발생했습니다.")
+
+
+def enqueue_review_summary(game_id):
+    """ lease를 얻었으면 백그라운드에서 요약을 시작하고 True, 이미 진행 중이면 False """
+    owner = acquire_review_summary_lease(game_id)
+    if owner is None:
+        return False
+    _submit(_review_summary_executor, run_review_summary_job, game_id, owner)
+    return True
+
+
+def wait_for_review_summary(game_id, timeout):
+    """ 분석 중 상태가 끝나거나 timeout(초)이 지날 때까지 기다린 뒤 현재 ReviewSummary를 반환 (long-poll) """
+    interval = getattr(settings, 'REVIEW_SUMMARY_POLL_INTERVAL', 0.5)
+    deadline = time.monotonic() + timeout
+    while True:
+        expire_review_summary_lease(game_id)
+        summary = ReviewSummary.objects.filter(game_id=game_id).first()
+        remaining = deadline - time.monotonic()
+        if summary is None or summary.status != 'PROCESSING' or remaining <= 0:
+            return summary
+        time.sleep(min(interval, remaining))
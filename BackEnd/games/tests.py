@@ -1,3 +1,913 @@
-from django.test import TestCase
+# games/tests.py
+import datetime
+import io
+import json
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from unittest import mock, skipUnless
 
-# Create your tests here.
+import requests
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from accounts.models import User
+from ai_analysis.models import ReviewSummary
+from community.models import Review
+from . import autocomplete, recommendations, steam_client, tasks
+from .autocomplete import TitleIndex
+from .management.commands.init_steam_games import iter_app_list
+from .counts import approximate_count, catalog_version
+from .facets import facet_counts, rebuild_facet_counts
+from .models import (
+    AppDetailsCache, Game, GameFacetCount, Genre, LibrarySyncJob, SearchRecommendationCache, UserGameLibrary,
+)
+from .pagination import decode_cursor, encode_cursor, keyset_filter, keyset_order_by, keyset_paginate
+from .search import FTS_TABLE, _fts_phrase, search_index_available
+from .tasks import (
+    acquire_review_summary_lease, enqueue_library_sync, expire_review_summary_lease, finish_review_summary,
+    run_library_sync_job,
+)
+from .utils import (
+    enrich_games, evict_app_details_cache, fetch_game_detail_internal, games_missing_detail, get_checkpoint,
+    library_fingerprint, save_game_detail, save_game_genres, store_app_details, sync_user_library,
+)
+from .views import GameListView
+
+
+@skipUnless(connection.vendor == 'sqlite', "SQLite 실행 계획 기준 테스트")
+class QueryPlanTests(TestCase):
+    """
+    카탈로그/라이브러리/리뷰 주요 쿼리가 인덱스를 타는지 EXPLAIN QUERY PLAN으로 확인.
+    인덱스가 빠지거나 정렬이 바뀌어 전체 스캔 + 임시 정렬로 돌아가면 실패한다.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        rng = random.Random(12)
+        genres = Genre.objects.bulk_create([Genre(name=f'장르{i}') for i in range(10)])
+        Game.objects.bulk_create([
+            Game(
+                appid=appid,
+                title=f'Game {rng.randint(0, 99999)}',
+                price=rng.choice([0, 5000, 12000, 30000]),
+                release_date=rng.choice([None, datetime.date(2020, rng.randint(1, 12), rng.randint(1, 28))]),
+            )
+            for appid in range(1, 3001)
+        ])
+        Through = Game.genres.through
+        Through.objects.bulk_create([
+            Through(game_id=appid, genre_id=genre.id)
+            for appid in range(1, 3001) for genre in rng.sample(genres, 2)
+        ])
+
+        cls.user = User.objects.create_user(username='plan', password='plan')
+        others = [User.objects.create_user(username=f'plan{i}', password='plan') for i in range(3)]
+        UserGameLibrary.objects.bulk_create([
+            UserGameLibrary(user=user, game_id=appid, playtime_total=rng.randint(0, 5000))
+            for user in [cls.user] + others for appid in rng.sample(range(1, 3001), 300)
+        ])
+        Review.objects.bulk_create([
+            Review(user=user, game_id=appid, content='리뷰')
+            for user in [cls.user] + others for appid in rng.sample(range(1, 3001), 200)
+        ])
+        cls.genre_ids = [genre.id for genre in genres]
+
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def assertUsesIndex(self, qs, index_name=None):
+        plan = qs.explain()
+        self.assertNotIn('USE TEMP B-TREE', plan, plan)
+        if index_name:
+            self.assertIn(f'INDEX {index_name}', plan, plan)
+        else:
+            self.assertIn('INDEX', plan, plan)
+        return plan
+
+    def test_list_sorts_use_index_order(self):
+        indexes = {
+            'recent': 'game_release_appid_idx',
+            'price_asc': 'game_price_appid_idx',
+            'price_desc': 'game_price_appid_idx',
+            'name': 'game_title_appid_idx',
+        }
+        for sort, ordering in GameListView.SORT_ORDERINGS.items():
+            with self.subTest(sort=sort):
+                self.assertUsesIndex(keyset_order_by(Game.objects.all(), ordering)[:24], indexes[sort])
+
+    def test_price_filter_searches_index(self):
+        qs = Game.objects.filter(price__gte=5000, price__lte=20000)
+        plan = self.assertUsesIndex(keyset_order_by(qs, ['price', 'appid'])[:24], 'game_price_appid_idx')
+        self.assertIn('SEARCH', plan, plan)
+
+    def test_cursor_pages_search_index(self):
+        cases = [
+            (['price', 'appid'], [5000, 100], True, 'game_price_appid_idx'),
+            (['-price', '-appid'], [5000, 100], True, 'game_price_appid_idx'),
+            (['title', 'appid'], ['Game 5', 100], True, 'game_title_appid_idx'),
+            # 출시일 정렬: NULL이 아닌 구간과 NULL 구간을 나눠서 읽음 (keyset_paginate)
+            (['-release_date', '-appid'], ['2020-06-01', 100], False, 'game_release_appid_idx'),
+            (['-release_date', '-appid'], [None, 100], True, 'game_release_appid_idx'),
+        ]
+        for ordering, values, include_nulls, index_name in cases:
+            with self.subTest(ordering=ordering, values=values):
+                qs = keyset_filter(keyset_order_by(Game.objects.all(), ordering), ordering, values, include_nulls)
+                plan = self.assertUsesIndex(qs[:24], index_name)
+                self.assertIn('SEARCH', plan, plan)
+
+    def test_genre_filter_uses_through_indexes(self):
+        qs = Game.objects.filter(genres=self.genre_ids[0]).filter(genres=self.genre_ids[1])
+        plan = qs.explain()
+        self.assertNotIn('SCAN games_game_genres', plan, plan)
+        self.assertIn('games_game_genres', plan, plan)
+
+    def test_title_search_uses_fts(self):
+        if not search_index_available():
+            self.skipTest("FTS5 trigram 미지원 SQLite")
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"EXPLAIN QUERY PLAN SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s",
+                [_fts_phrase('Game 1')],
+            )
+            plan = '\n'.join(str(row[-1]) for row in cursor.fetchall())
+        self.assertIn('VIRTUAL TABLE', plan, plan)
+
+    def test_library_by_playtime(self):
+        qs = UserGameLibrary.objects.filter(user=self.user).order_by('-playtime_total')
+        plan = self.assertUsesIndex(qs, 'library_user_playtime_idx')
+        self.assertIn('SEARCH', plan, plan)
+
+    def test_review_lists(self):
+        self.assertUsesIndex(Review.objects.order_by('-created_at')[:10], 'review_created_idx')
+        qs = Review.objects.filter(game_id=1).order_by('-created_at')
+        plan = self.assertUsesIndex(qs, 'review_game_created_idx')
+        self.assertIn('SEARCH', plan, plan)
+
+
+class FacetCountTests(TestCase):
+    """ 변경분(±1)만 반영한 facet 집계가 전체 재계산 결과와 같은지 확인 """
+
+    def setUp(self):
+        Game.objects.bulk_create([
+            Game(appid=appid, title=f'Game {appid}', price=[0, 5000, 15000, 60000][appid % 4])
+            for appid in range(1, 41)
+        ])
+        # bulk_create는 시그널이 없으므로 대량 적재 때처럼 전체 재계산
+        rebuild_facet_counts()
+        save_game_genres({appid: ['액션', 'RPG'][: appid % 3] for appid in range(1, 41)})
+
+    def snapshot(self):
+        return sorted(GameFacetCount.objects.values_list('genre_id', 'price_bucket', 'count'), key=str)
+
+    def assertMatchesRebuild(self):
+        incremental = self.snapshot()
+        rebuild_facet_counts()
+        self.assertEqual(incremental, self.snapshot())
+
+    def test_incremental_refresh_matches_rebuild(self):
+        self.assertMatchesRebuild()
+
+        game = Game.objects.get(appid=1)
+        game.price = 60000
+        game.save()
+        save_game_genres({2: ['인디'], 3: []})
+        Game.objects.get(appid=4).delete()
+        Game.objects.create(appid=100, title='New', price=15000)
+        save_game_detail(Game.objects.get(appid=5), {
+            'publisher': '', 'developer': '', 'release_date': None, 'price': 0,
+            'description': '', 'header_image': '', 'genres': ['액션', '인디'],
+        })
+        self.assertMatchesRebuild()
+
+    def test_facet_counts_for_selection(self):
+        action = Genre.objects.get(name='액션').id
+        rpg = Genre.objects.get(name='RPG').id
+        by_genre, by_bucket, total = facet_counts([action])
+        self.assertEqual(total, Game.objects.filter(genres=action).count())
+        self.assertEqual(by_genre[rpg], Game.objects.filter(genres=action).filter(genres=rpg).count())
+        self.assertEqual(by_bucket['free'], Game.objects.filter(genres=action, price=0).count())
+
+        # 가격대 경계와 다른 범위는 그룹 쿼리로 계산
+        by_genre, _, total = facet_counts([], 3000, 20000)
+        self.assertEqual(total, Game.objects.filter(price__gte=3000, price__lte=20000).count())
+        self.assertEqual(by_genre[action], Game.objects.filter(genres=action, price__gte=3000, price__lte=20000).count())
+
+
+@override_settings(GAME_COUNT_EXACT_LIMIT=100, GAME_COUNT_SAMPLE_SIZE=600)
+class ApproximateCountTests(TestCase):
+    """ count=approx 추정치는 appid 순서(등록 시기)에 치우친 카탈로그에서도 정확한 개수에 가까워야 함 """
+
+    @classmethod
+    def setUpTestData(cls):
+        rng = random.Random(7)
+        # 스팀처럼 appid는 10의 배수, 앞쪽(오래된) 절반은 무료에 출시일 없음, 뒤쪽 절반만 유료/최근 출시
+        Game.objects.bulk_create([
+            Game(
+                appid=appid, title=f'Game {appid}',
+                price=0 if appid <= 30000 else rng.choice([5000, 12000, 30000]),
+                release_date=None if appid <= 30000 else datetime.date(2024, rng.randint(1, 12), 1),
+            )
+            for appid in range(10, 60001, 10)
+        ])
+
+    def setUp(self):
+        cache.clear()
+
+    def test_estimate_is_close_to_exact_count(self):
+        for filters, qs in [
+            ({'min_price': 1}, Game.objects.filter(price__gt=0)),
+            ({'min_price': 10000}, Game.objects.filter(price__gte=10000)),
+            ({'released': 2024}, Game.objects.filter(release_date__year=2024, price=30000)),
+        ]:
+            exact = qs.count()
+            estimate, is_approximate = approximate_count(qs, filters)
+            self.assertTrue(is_approximate)
+            self.assertAlmostEqual(estimate / exact, 1, delta=0.15, msg=f'{filters}: {estimate} vs {exact}')
+
+    def test_small_results_are_exact(self):
+        qs = Game.objects.filter(appid__lte=500)
+        self.assertEqual(approximate_count(qs, {'max_appid': 500}), (50, False))
+
+
+class CatalogVersionTests(TestCase):
+    """ 카탈로그 버전(개수/facet 캐시, 자동완성 색인 무효화)은 목록에 영향을 주는 변경에서만 올라감 """
+
+    def setUp(self):
+        self.game = Game.objects.create(appid=1, title='Game', price=5000)
+        save_game_genres({1: ['액션']})
+
+    def assertBumps(self, expected, change):
+        version = catalog_version()
+        change()
+        self.assertEqual(catalog_version() != version, expected)
+
+    def test_only_catalog_changes_bump(self):
+        detail = {
+            'publisher': 'P', 'developer': 'D', 'release_date': None, 'price': 5000,
+            'description': '새 설명', 'header_image': '', 'genres': ['액션'],
+        }
+        self.assertBumps(False, lambda: save_game_detail(self.game, detail))
+        self.assertBumps(False, lambda: Game.objects.get(appid=1).save(update_fields=['description']))
+        self.assertBumps(True, lambda: save_game_detail(self.game, {**detail, 'price': 6000}))
+        self.assertBumps(True, lambda: save_game_genres({1: ['액션', 'RPG']}))
+        self.assertBumps(True, lambda: Game.objects.create(appid=2, title='Other'))
+        self.assertBumps(True, lambda: Game.objects.get(appid=2).delete())
+
+
+class AutocompleteWarmupTests(TestCase):
+    """ 첫 색인은 백그라운드에서 만들고, 그동안은 DB 검색으로 응답 """
+
+    def setUp(self):
+        Game.objects.bulk_create([Game(appid=1, title='Dark Souls'), Game(appid=2, title='Darkest Dungeon')])
+        autocomplete._index = None
+        self.addCleanup(setattr, autocomplete, '_index', None)
+
+    def test_cold_start_falls_back_to_db(self):
+        with mock.patch('games.tasks.submit_background') as submit:
+            self.assertEqual(autocomplete.autocomplete('dark', 5), [(1, 'Dark Souls'), (2, 'Darkest Dungeon')])
+            self.assertEqual(autocomplete.fuzzy_search('darc souls'), [])
+            self.assertEqual(submit.call_count, 1) # 만드는 중에는 다시 예약하지 않음
+
+            func, version = submit.call_args.args
+            func(version)
+        self.assertEqual([appid for appid, _ in autocomplete.autocomplete('darke', 5)], [2])
+
+
+class TitleIndexTests(SimpleTestCase):
+    """ 자동완성 색인: 넓은 접두어 구간(블록 top-k 경로)도 전체를 직접 비교한 결과와 같아야 함 """
+
+    def setUp(self):
+        rng = random.Random(16)
+        words = ['Dark', 'Souls', 'The', 'Legend', '배틀', '그라운드', 'Space', 'Quest']
+        self.rows = [
+            (appid, ' '.join(rng.choice(words) for _ in range(rng.randint(1, 3))) + f' {appid % 13}', rng.randint(0, 500))
+            for appid in range(1, 3001)
+        ]
+        self.index = TitleIndex(self.rows, top_k=10)
+
+    def brute_prefix(self, query, limit):
+        key = query.casefold()
+        matches = [row for row in self.rows if row[1].casefold().startswith(key)]
+        matches.sort(key=lambda row: (-row[2], row[1].casefold(), row[0]))
+        return [row[0] for row in matches[:limit]]
+
+    def test_prefix_matches_brute_force(self):
+        for query in ['d', 'da', 'dark', 'the legend', '배틀 그', 'space quest 1']:
+            with self.subTest(query=query):
+                results = [appid for appid, _ in self.index.search(query, 10)]
+                self.assertEqual(results[:len(self.brute_prefix(query, 10))], self.brute_prefix(query, 10))
+
+    def test_infix_after_prefix(self):
+        results = self.index.search('ouls', 5)
+        self.assertEqual(len(results), 5)
+        self.assertTrue(all('souls' in title.casefold() for _, title in results))
+        self.assertEqual(self.index.search('없는 제목', 5), [])
+
+    def test_fuzzy_corrects_typos(self):
+        titles = ['Elden Ring', 'Stardew Valley', 'The Witcher 3: Wild Hunt', '배틀그라운드']
+        index = TitleIndex(self.rows + [(10000 + i, title, 0) for i, title in enumerate(titles)])
+        for query, expected in [('eldne ring', 'Elden Ring'), ('stardw valey', 'Stardew Valley'),
+                                ('witcher 3', 'The Witcher 3: Wild Hunt'), ('배틀그라운트', '배틀그라운드')]:
+            with self.subTest(query=query):
+                appid, title, score = index.fuzzy(query, 1)[0]
+                self.assertEqual(title, expected)
+                self.assertGreaterEqual(score, 0.5)
+        self.assertTrue(all(score < 0.5 for _, _, score in index.fuzzy('zzqx wvut', 3)))
+
+
+class ReviewSummaryLeaseTests(TestCase):
+    """ 리뷰 요약 작업은 게임당 하나만 실행되고, 죽은 작업의 lease는 만료 후 다시 가져갈 수 있어야 함 """
+
+    def setUp(self):
+        Game.objects.create(appid=1, title='Game 1')
+
+    def test_only_one_job_per_game(self):
+        owner = acquire_review_summary_lease(1)
+        self.assertIsNotNone(owner)
+        self.assertIsNone(acquire_review_summary_lease(1))
+        self.assertEqual(ReviewSummary.objects.get(game_id=1).status, 'PROCESSING')
+
+        self.assertTrue(finish_review_summary(1, owner, 'COMPLETED', '요약'))
+        self.assertIsNotNone(acquire_review_summary_lease(1))
+
+    def test_expired_lease_is_taken_over(self):
+        stale_owner = acquire_review_summary_lease(1)
+        ReviewSummary.objects.filter(game_id=1).update(lease_expires_at=timezone.now() - datetime.timedelta(seconds=1))
+
+        owner = acquire_review_summary_lease(1)
+        self.assertIsNotNone(owner)
+        # 늦게 끝난 이전 작업의 결과는 기록하지 않음
+        self.assertFalse(finish_review_summary(1, stale_owner, 'COMPLETED', '이전 결과'))
+        self.assertEqual(ReviewSummary.objects.get(game_id=1).lease_owner, owner)
+
+        ReviewSummary.objects.filter(game_id=1).update(lease_expires_at=timezone.now() - datetime.timedelta(seconds=1))
+        self.assertEqual(expire_review_summary_lease(1), 1)
+        self.assertEqual(ReviewSummary.objects.get(game_id=1).status, 'FAILED')
+
+    def test_lease_is_renewed_when_the_job_starts(self):
+        owner = acquire_review_summary_lease(1)
+        # 대기열에서 기다리는 동안 만료 직전이 된 lease
+        ReviewSummary.objects.filter(game_id=1).update(lease_expires_at=timezone.now() + datetime.timedelta(seconds=1))
+        leases = []
+
+        def fetch_reviews(game_id):
+            leases.append(ReviewSummary.objects.get(game_id=game_id).lease_expires_at)
+            return []
+
+        with mock.patch('games.tasks.fetch_steam_reviews', side_effect=fetch_reviews):
+            tasks.run_review_summary_job(1, owner)
+        self.assertGreater(leases[0], timezone.now() + datetime.timedelta(minutes=4))
+        self.assertEqual(ReviewSummary.objects.get(game_id=1).status, 'FAILED') # 리뷰 없음
+
+    def test_job_whose_lease_expired_in_queue_does_nothing(self):
+        owner = acquire_review_summary_lease(1)
+        ReviewSummary.objects.filter(game_id=1).update(lease_expires_at=timezone.now() - datetime.timedelta(seconds=1))
+        with mock.patch('games.tasks.fetch_steam_reviews') as fetch_reviews:
+            tasks.run_review_summary_job(1, owner)
+        fetch_reviews.assert_not_called()
+
+        # 이미 다른 요청이 새로 가져간 경우에도 이전 작업은 시작하지 않음
+        stale_owner, owner = owner, acquire_review_summary_lease(1)
+        with mock.patch('games.tasks.fetch_steam_reviews') as fetch_reviews:
+            tasks.run_review_summary_job(1, stale_owner)
+        fetch_reviews.assert_not_called()
+        self.assertEqual(ReviewSummary.objects.get(game_id=1).lease_owner, owner)
+
+    def test_summaries_run_on_their_own_executor(self):
+        with mock.patch.object(tasks, '_review_summary_executor') as summary_executor, \
+                mock.patch.object(tasks, '_executor') as shared_executor:
+            self.assertTrue(tasks.enqueue_review_summary(1))
+        summary_executor.submit.assert_called_once()
+        shared_executor.submit.assert_not_called()
+
+
+class LibrarySyncTests(TestCase):
+    """ 라이브러리 동기화: 새 게임 추가, 바뀐 플레이타임만 갱신, 더 이상 없는 게임 삭제 """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='sync', password='sync')
+        Game.objects.bulk_create([Game(appid=appid, title=f'Game {appid}', header_image='img.jpg') for appid in (1, 2, 3)])
+        UserGameLibrary.objects.bulk_create([
+            UserGameLibrary(user=self.user, game_id=appid, playtime_total=100, playtime_recent_2weeks=0)
+            for appid in (1, 2, 3)
+        ])
+
+    def test_diff_and_upsert(self):
+        untouched = UserGameLibrary.objects.get(user=self.user, game_id=1).last_updated_at
+        result = sync_user_library(self.user, [
+            {'appid': 1, 'name': 'Game 1', 'playtime_forever': 100, 'playtime_2weeks': 0},
+            {'appid': 2, 'name': 'Game 2', 'playtime_forever': 250, 'playtime_2weeks': 30},
+            {'appid': 4, 'name': 'New Game', 'playtime_forever': 10},
+        ])
+        self.assertEqual((result['created'], result['updated'], result['deleted']), (1, 1, 1))
+        self.assertEqual(result['missing_detail_appids'], [4])
+
+        library = {row.game_id: row for row in UserGameLibrary.objects.filter(user=self.user)}
+        self.assertEqual(set(library), {1, 2, 4})
+        self.assertEqual(library[1].last_updated_at, untouched) # 바뀌지 않은 행은 다시 쓰지 않음
+        self.assertEqual((library[2].playtime_total, library[2].playtime_recent_2weeks), (250, 30))
+        self.assertEqual(Game.objects.get(appid=4).title, 'New Game')
+
+        # 같은 응답으로 다시 동기화하면 바뀌는 행이 없음
+        result = sync_user_library(self.user, [
+            {'appid': 1, 'playtime_forever': 100, 'playtime_2weeks': 0},
+            {'appid': 2, 'playtime_forever': 250, 'playtime_2weeks': 30},
+            {'appid': 4, 'playtime_forever': 10},
+        ])
+        self.assertEqual((result['created'], result['updated'], result['deleted']), (0, 0, 0))
+
+
+class EnrichGamesTests(TestCase):
+    """ 상세 정보 수집: 동시 요청 수 제한, 배치 단위 저장, 캐시된 게임은 네트워크 없이 반영 """
+
+    def setUp(self):
+        Game.objects.bulk_create([Game(appid=appid, title=f'Game {appid}') for appid in range(1, 24)])
+        # 1~3은 캐시에 있음 (3은 상점에 없는 게임)
+        now = timezone.now()
+        AppDetailsCache.objects.bulk_create([
+            AppDetailsCache(appid=1, success=True, data=self.store_data(1), fetched_at=now),
+            AppDetailsCache(appid=2, success=True, data=self.store_data(2), fetched_at=now),
+            AppDetailsCache(appid=3, success=False, data=None, fetched_at=now),
+        ])
+
+    @staticmethod
+    def store_data(appid):
+        return {
+            'short_description': f'설명 {appid}', 'header_image': f'{appid}.jpg',
+            'price_overview': {'final': appid * 100}, 'genres': [{'description': '액션'}],
+        }
+
+    def test_concurrent_fetch_in_batches(self):
+        lock = threading.Lock()
+        in_flight = peak = 0
+        requested = []
+
+        def fake_fetch(appid, interactive=False):
+            nonlocal in_flight, peak
+            with lock:
+                requested.append(appid)
+                in_flight += 1
+                peak = max(peak, in_flight)
+            time.sleep(0.01)
+            with lock:
+                in_flight -= 1
+            if appid == 22:
+                return None # 네트워크 오류
+            return (False, None) if appid == 23 else (True, self.store_data(appid))
+
+        # 저장 후 같은 리스트를 비워 재사용하므로 호출 시점의 크기를 기록
+        game_batches, cache_batches, progress = [], [], []
+
+        def record(batches, func):
+            def wrapper(objs, *args, **kwargs):
+                batches.append(len(objs))
+                return func(objs, *args, **kwargs)
+            return wrapper
+
+        with mock.patch('games.utils.fetch_app_details_raw', side_effect=fake_fetch), \
+                mock.patch.object(Game.objects, 'bulk_update', record(game_batches, Game.objects.bulk_update)), \
+                mock.patch('games.utils.store_app_details', record(cache_batches, store_app_details)):
+            result = enrich_games(range(1, 24), max_workers=3, batch_size=5,
+                                    on_progress=lambda *counts: progress.append(counts))
+
+        self.assertEqual(sorted(requested), list(range(4, 24))) # 캐시에 있는 1~3은 요청하지 않음
+        self.assertLessEqual(peak, 3)
+        self.assertGreater(peak, 1)
+        self.assertTrue(game_batches and max(game_batches) <= 5)
+        self.assertTrue(cache_batches and max(cache_batches) <= 5)
+        self.assertEqual(sum(game_batches), 20)
+        self.assertEqual(sum(cache_batches), 19) # 네트워크 오류는 캐시하지 않음
+
+        # 게임 하나마다 한 번씩, 마지막 호출은 전체 개수
+        self.assertEqual([done for done, _, _ in progress], list(range(1, 24)))
+        self.assertEqual(progress[-1], (23, 20, 1))
+        # 상점에 없는 3, 23은 실패로 세지 않고 네트워크 오류가 난 22만 실패
+        self.assertEqual(result, {'enriched': 20, 'failed': 1})
+        self.assertEqual(set(games_missing_detail().values_list('appid', flat=True)), {3, 22, 23})
+        self.assertEqual(Game.objects.get(appid=5).price, 5)
+
+
+@override_settings(LIBRARY_SYNC_RUN_IN_PROCESS=False)
+class LibrarySyncJobTests(TestCase):
+    """ 유저당 대기/진행 중인 동기화 작업은 하나만 (중복 요청은 같은 작업을 돌려받음) """
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='job', password='job')
+
+    def test_collapses_into_active_job(self):
+        job, created = enqueue_library_sync(self.user)
+        self.assertTrue(created)
+        self.assertEqual(enqueue_library_sync(self.user), (job, False))
+
+        LibrarySyncJob.objects.filter(pk=job.pk).update(status='COMPLETED')
+        next_job, created = enqueue_library_sync(self.user)
+        self.assertTrue(created)
+        self.assertNotEqual(next_job.pk, job.pk)
+
+    def test_integrity_error_returns_concurrent_job(self):
+        # 활성 작업 조회와 생성 사이에 다른 요청이 먼저 만든 경우 → 유니크 제약 위반 후 그 작업을 반환
+        existing = LibrarySyncJob.objects.create(user=self.user)
+        with mock.patch('games.tasks.LibrarySyncJob.objects.filter') as stale_lookup:
+            stale_lookup.return_value.first.return_value = None
+            job, created = enqueue_library_sync(self.user)
+        self.assertFalse(created)
+        self.assertEqual(job.pk, existing.pk)
+        self.assertEqual(LibrarySyncJob.objects.filter(user=self.user).count(), 1)
+
+    def run_sync(self, owned_games, fetch_result):
+        job, _ = enqueue_library_sync(self.user)
+        with mock.patch('games.tasks.fetch_owned_games', return_value=owned_games), \
+                mock.patch('games.utils.fetch_app_details_raw', side_effect=fetch_result) as fetch:
+            run_library_sync_job(job.pk)
+        self.user.refresh_from_db()
+        return LibrarySyncJob.objects.get(pk=job.pk), fetch
+
+    def test_delisted_app_does_not_block_skipping(self):
+        Game.objects.create(appid=1, title='Game 1', header_image='1.jpg')
+        owned = [{'appid': 1, 'playtime_forever': 10}, {'appid': 2, 'name': '삭제된 게임', 'playtime_forever': 5}]
+
+        job, fetch = self.run_sync(owned, lambda appid, interactive=False: (False, None))
+        self.assertEqual((job.status, job.skipped, job.error_count, job.enriched_count), ('COMPLETED', False, 0, 0))
+        fetch.assert_called_once()
+        self.assertEqual(self.user.library_fingerprint, library_fingerprint(owned))
+
+        # 같은 라이브러리로 다시 동기화하면 건너뜀
+        job, fetch = self.run_sync(owned, lambda appid, interactive=False: (False, None))
+        self.assertTrue(job.skipped)
+        fetch.assert_not_called()
+
+    def test_network_error_clears_fingerprint(self):
+        owned = [{'appid': 3, 'name': 'Game 3', 'playtime_forever': 1}]
+        job, _ = self.run_sync(owned, lambda appid, interactive=False: None)
+        self.assertEqual((job.status, job.error_count), ('COMPLETED', 1))
+        self.assertEqual(self.user.library_fingerprint, '')
+
+        # 다음 동기화에서 다시 수집
+        job, fetch = self.run_sync(owned, lambda appid, interactive=False: (True, {'header_image': '3.jpg'}))
+        self.assertFalse(job.skipped)
+        self.assertEqual((job.enriched_count, job.error_count), (1, 0))
+        self.assertEqual(self.user.library_fingerprint, library_fingerprint(owned))
+
+
+class GameDetailViewTests(TestCase):
+    """ 상세 조회: 설명이 있으면 바로 응답하고 갱신은 백그라운드에서 한 번만, 없으면 그 자리에서 가져옴 """
+
+    def setUp(self):
+        patch = mock.patch('games.tasks.submit_background')
+        self.submit_background = patch.start()
+        self.addCleanup(patch.stop)
+        self.addCleanup(tasks._refreshing_appids.clear)
+
+    def test_stale_row_is_served_and_refreshed_once(self):
+        Game.objects.create(appid=1, title='Game 1', description='예전 설명', developer='dev', view_count=5)
+        with mock.patch('games.views.fetch_game_detail_internal') as fetch:
+            responses = [self.client.get('/games/1/') for _ in range(3)]
+        fetch.assert_not_called()
+        self.assertTrue(all(response.status_code == 200 for response in responses))
+        self.assertTrue(all(response.json()['is_stale'] for response in responses))
+        self.assertEqual(responses[0].json()['description'], '예전 설명')
+        # 같은 게임의 갱신이 진행 중이면 다시 예약하지 않음
+        self.submit_background.assert_called_once()
+        self.assertEqual(tasks._refreshing_appids, {1})
+
+    def test_missing_description_is_fetched_inline(self):
+        Game.objects.create(appid=2, title='Game 2')
+        detail = {'publisher': 'pub', 'developer': 'dev', 'release_date': None, 'price': 1000,
+                  'description': '새 설명', 'header_image': '2.jpg', 'genres': ['액션']}
+        with mock.patch('games.views.fetch_game_detail_internal', return_value=detail) as fetch:
+            response = self.client.get('/games/2/')
+        fetch.assert_called_once_with(2, force=False, interactive=True)
+        self.submit_background.assert_not_called()
+        self.assertFalse(response.json()['is_stale'])
+        self.assertEqual(response.json()['description'], '새 설명')
+        self.assertEqual(Game.objects.get(appid=2).description, '새 설명')
+
+    def test_view_count_uses_f_expression(self):
+        Game.objects.create(appid=3, title='Game 3', description='설명', developer='dev')
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get('/games/3/')
+        updates = [query['sql'] for query in queries if query['sql'].startswith('UPDATE "games_game"')]
+        self.assertEqual(len(updates), 1)
+        self.assertIn('"view_count" = ("games_game"."view_count" + ', updates[0])
+
+        # 다른 경로에서 바뀐 조회 수를 덮어쓰지 않고 더함
+        Game.objects.filter(appid=3).update(view_count=100)
+        self.client.get('/games/3/')
+        self.assertEqual(Game.objects.get(appid=3).view_count, 101)
+
+
+class SteamClientTests(SimpleTestCase):
+    """ 429/5xx는 백오프 후 재시도(대기 시간 상한), POST와 그 외 상태코드는 재시도하지 않음 """
+
+    def setUp(self):
+        patches = [
+            mock.patch.object(steam_client, '_bucket_for', return_value=None),
+            mock.patch.object(steam_client.time, 'sleep'),
+            mock.patch.object(steam_client._session, 'request'),
+        ]
+        _, self.sleep, self.request = [patch.start() for patch in patches]
+        for patch in patches:
+            self.addCleanup(patch.stop)
+
+    def respond(self, *statuses, retry_after=None):
+        self.request.side_effect = [
+            mock.Mock(status_code=code, headers={'Retry-After': retry_after} if retry_after else {})
+            for code in statuses
+        ]
+
+    @override_settings(STEAM_MAX_RETRIES=3)
+    def test_retries_retryable_statuses(self):
+        self.respond(429, 503, 200)
+        self.assertEqual(steam_client.steam_get('appdetails').status_code, 200)
+        self.assertEqual(self.request.call_count, 3)
+
+        # 재시도 횟수를 다 쓰면 마지막 응답을 그대로 반환, 404 등은 바로 반환
+        self.respond(500, 502, 503, 504)
+        self.assertEqual(steam_client.steam_get('appdetails').status_code, 504)
+        self.respond(404)
+        self.assertEqual(steam_client.steam_get('appdetails').status_code, 404)
+
+    @override_settings(STEAM_MAX_BACKOFF=5.0)
+    def test_retry_after_is_capped(self):
+        self.respond(429, 200, retry_after='300')
+        steam_client.steam_get('appdetails')
+        self.sleep.assert_called_once_with(5.0)
+
+    def test_post_and_fail_fast_do_not_retry(self):
+        self.respond(503, 200)
+        self.assertEqual(steam_client.steam_post('openid').status_code, 503)
+        self.respond(429, 200)
+        self.assertEqual(steam_client.steam_get('appdetails', max_retries=0).status_code, 429)
+        self.sleep.assert_not_called()
+
+    @override_settings(STEAM_MAX_RETRIES=2)
+    def test_network_errors_raise_after_retries(self):
+        self.request.side_effect = requests.ConnectionError
+        with self.assertRaises(requests.ConnectionError):
+            steam_client.steam_get('appdetails')
+        self.assertEqual(self.request.call_count, 3)
+
+    def test_token_bucket_reserve(self):
+        with mock.patch.object(steam_client.time, 'monotonic', return_value=100.0) as now:
+            bucket = steam_client.TokenBucket(rate=10, capacity=2)
+            self.assertEqual([bucket.reserve(), bucket.reserve()], [0, 0])
+            # 토큰이 모자라면 미리 예약하고 채워질 때까지의 시간을 반환 (뒤에 온 요청은 더 오래 기다림)
+            self.assertAlmostEqual(bucket.reserve(), 0.1)
+            self.assertAlmostEqual(bucket.reserve(), 0.2)
+            now.return_value = 101.0
+            self.assertEqual(bucket.reserve(), 0) # 1초 뒤에는 최대 버스트까지만 채워짐
+            self.assertAlmostEqual(bucket.tokens, 1)
+            self.assertAlmostEqual(bucket.reserve(5), 0.4)
+
+
+class SteamInteractiveBucketTests(SimpleTestCase):
+    """ 사용자 요청은 대량 수집이 미리 예약해 둔 'store' 토큰 뒤에 줄 서지 않음 """
+
+    def setUp(self):
+        buckets = {'store': steam_client.TokenBucket(rate=1, capacity=2),
+                   'store:interactive': steam_client.TokenBucket(rate=1, capacity=2),
+                   'community': steam_client.TokenBucket(rate=1, capacity=2)}
+        patches = [
+            mock.patch.object(steam_client, '_buckets', buckets),
+            mock.patch.object(steam_client.time, 'sleep'),
+            mock.patch.object(steam_client._session, 'request', return_value=mock.Mock(status_code=200)),
+        ]
+        self.buckets, self.sleep, _ = [patch.start() for patch in patches]
+        for patch in patches:
+            self.addCleanup(patch.stop)
+
+    def test_interactive_calls_skip_the_bulk_queue(self):
+        # 대량 수집이 토큰을 몇 초 앞까지 예약해 둔 상태
+        self.buckets['store'].reserve(10)
+
+        steam_client.steam_get('appdetails', interactive=True)
+        self.sleep.assert_not_called()
+        self.assertLess(self.buckets['store'].tokens, 0)
+
+        steam_client.steam_get('appdetails')
+        self.assertGreater(self.sleep.call_args.args[0], 5)
+
+    @override_settings(STEAM_MAX_RETRIES=3, STEAM_INTERACTIVE_MAX_RETRIES=0)
+    def test_interactive_calls_fail_fast(self):
+        steam_client._session.request.return_value = mock.Mock(status_code=503, headers={})
+        self.assertEqual(steam_client.steam_get('appdetails', interactive=True).status_code, 503)
+        self.assertEqual(steam_client._session.request.call_count, 1)
+
+        # 사용자 요청용 버킷이 없는 엔드포인트는 공용 버킷을 씀
+        self.assertIs(steam_client._bucket_for('openid', interactive=True), self.buckets['community'])
+        self.assertIs(steam_client._bucket_for('appdetails', interactive=True), self.buckets['store:interactive'])
+
+
+@override_settings(APPDETAILS_CACHE_TTL=datetime.timedelta(days=3), APPDETAILS_NEGATIVE_CACHE_TTL=datetime.timedelta(days=1))
+class AppDetailsCacheTests(TestCase):
+    """ appdetails 캐시: 유효 기간 안에는 네트워크 없이, 상점에 없는 appid(success: false)는 더 짧게 기억 """
+
+    def steam_response(self, appid, data=None):
+        entry = {'success': True, 'data': data} if data else {'success': False}
+        return mock.Mock(json=lambda: {str(appid): entry})
+
+    def age(self, appid, **delta):
+        AppDetailsCache.objects.filter(appid=appid).update(fetched_at=timezone.now() - datetime.timedelta(**delta))
+
+    def test_positive_cache_ttl(self):
+        data = {'name': 'Game', 'short_description': '설명', 'price_overview': {'final': 1200000}}
+        with mock.patch('games.utils.steam_get', return_value=self.steam_response(1, data)) as steam_get:
+            self.assertEqual(fetch_game_detail_internal(1)['price'], 12000)
+            self.assertEqual(fetch_game_detail_internal(1)['description'], '설명')
+            self.assertEqual(steam_get.call_count, 1)
+
+            self.age(1, days=3, seconds=1)
+            fetch_game_detail_internal(1)
+            self.assertEqual(steam_get.call_count, 2)
+            fetch_game_detail_internal(1, force=True)
+            self.assertEqual(steam_get.call_count, 3)
+
+    def test_negative_cache_expires_sooner(self):
+        with mock.patch('games.utils.steam_get', return_value=self.steam_response(2)) as steam_get:
+            self.assertIsNone(fetch_game_detail_internal(2))
+            self.assertIsNone(fetch_game_detail_internal(2))
+            self.assertEqual(steam_get.call_count, 1)
+            self.assertFalse(AppDetailsCache.objects.get(appid=2).success)
+
+            self.age(2, hours=25)
+            self.assertIsNone(fetch_game_detail_internal(2))
+            self.assertEqual(steam_get.call_count, 2)
+
+    def test_eviction_keeps_newest(self):
+        now = timezone.now()
+        # 같은 fetched_at이 많아도 appid가 큰 쪽을 남기고, 정리할 행 목록을 읽지 않고 조건 DELETE 한 번으로 지움
+        AppDetailsCache.objects.bulk_create([
+            AppDetailsCache(appid=appid, success=False, fetched_at=now - datetime.timedelta(minutes=appid // 10))
+            for appid in range(1, 50)
+        ])
+        with self.assertNumQueries(2):
+            self.assertEqual(evict_app_details_cache(max_entries=12), 37)
+        kept = set(AppDetailsCache.objects.values_list('appid', flat=True))
+        self.assertEqual(kept, set(range(1, 10)) | {17, 18, 19})
+        self.assertEqual(evict_app_details_cache(max_entries=12), 0)
+
+    def test_network_errors_are_not_cached(self):
+        with mock.patch('games.utils.steam_get', side_effect=requests.ConnectionError):
+            self.assertIsNone(fetch_game_detail_internal(3))
+        self.assertFalse(AppDetailsCache.objects.filter(appid=3).exists())
+
+
+class KeysetPaginationTests(TestCase):
+    """ cursor로 끝까지 넘긴 결과가 OFFSET 페이징(전체 정렬)과 같은 순서인지 (출시일 NULL, 같은 값 포함) """
+
+    @classmethod
+    def setUpTestData(cls):
+        rng = random.Random(10)
+        Game.objects.bulk_create([
+            Game(
+                appid=appid,
+                title=rng.choice(['Alpha', 'Beta', 'Gamma', '감마']),
+                price=rng.choice([0, 5000, 12000]),
+                release_date=rng.choice([None, None, datetime.date(2021, 1, 1), datetime.date(2022, rng.randint(1, 3), 1)]),
+            )
+            for appid in range(1, 201)
+        ])
+
+    def test_cursor_pages_match_offset_order(self):
+        for sort, ordering in GameListView.SORT_ORDERINGS.items():
+            for limit in (7, 24):
+                with self.subTest(sort=sort, limit=limit):
+                    expected = list(keyset_order_by(Game.objects.all(), ordering).values_list('appid', flat=True))
+                    seen, cursor = [], None
+                    while True:
+                        # 실제 요청처럼 cursor 토큰으로 직렬화했다가 되돌림 (날짜는 문자열이 됨)
+                        values = decode_cursor(cursor, sort) if cursor else None
+                        games, next_values = keyset_paginate(Game.objects.all(), ordering, values, limit)
+                        seen += [game.appid for game in games]
+                        if not next_values:
+                            break
+                        cursor = encode_cursor(sort, next_values)
+                    self.assertEqual(seen, expected)
+
+    def test_filtered_cursor_pages(self):
+        ordering = GameListView.SORT_ORDERINGS['recent']
+        qs = Game.objects.filter(price__gt=0)
+        expected = list(keyset_order_by(qs, ordering).values_list('appid', flat=True))
+        seen, values = [], None
+        while True:
+            games, values = keyset_paginate(qs, ordering, values, 10)
+            seen += [game.appid for game in games]
+            if not values:
+                break
+        self.assertEqual(seen, expected)
+
+
+class FakeAppList:
+    """ GetAppList 흉내: last_appid 다음 앱을 max_results보다 적게(per_page개) 주면서 have_more_results로 이어짐 """
+
+    def __init__(self, appids, per_page, fail_at=None):
+        self.appids = sorted(appids)
+        self.per_page = per_page
+        self.fail_at = fail_at
+        self.requested = []
+
+    def __call__(self, endpoint, params, stream=False):
+        last_appid = params['last_appid']
+        self.requested.append(last_appid)
+        if last_appid == self.fail_at:
+            self.fail_at = None
+            return mock.MagicMock(status_code=500, **{'__enter__.return_value.status_code': 500})
+
+        page = [appid for appid in self.appids if appid > last_appid][:min(self.per_page, params['max_results'])]
+        more = bool(page) and page[-1] != self.appids[-1]
+        body = json.dumps({'response': {
+            'apps': [{'appid': appid, 'name': f'게임 {appid}'} for appid in page],
+            'have_more_results': more, 'last_appid': page[-1] if page else last_appid,
+        }}, ensure_ascii=False).encode()
+        response = mock.MagicMock(status_code=200)
+        response.__enter__.return_value = response
+        response.iter_content = lambda chunk_size: (body[i:i + chunk_size] for i in range(0, len(body), chunk_size))
+        return response
+
+
+class AppListImportTests(TestCase):
+    """ 카탈로그 수집: 스트리밍 파서, 짧은 페이지 이어받기, 저장 지점부터 재시작 """
+
+    def test_iter_app_list_across_chunk_boundaries(self):
+        body = FakeAppList(range(1, 6), per_page=5)('app_list', {'last_appid': 0, 'max_results': 10})
+        expected = [(appid, f'게임 {appid}') for appid in range(1, 6)]
+        for chunk_size in (1, 2, 5, 17, 64 * 1024):
+            with self.subTest(chunk_size=chunk_size):
+                page_info = {}
+                items = list(iter_app_list(body, chunk_size=chunk_size, page_info=page_info))
+                self.assertEqual([(item['appid'], item['name']) for item in items], expected)
+                self.assertEqual(page_info, {'have_more_results': False, 'last_appid': 5})
+
+    def test_resumes_from_checkpoint_and_follows_short_pages(self):
+        steam = FakeAppList(range(1, 11), per_page=2, fail_at=6)
+        with mock.patch('games.management.commands.init_steam_games.steam_get', steam):
+            call_command('init_steam_games', page_size=3, stdout=io.StringIO())
+            self.assertEqual(get_checkpoint('init_steam_games'), {'last_appid': 6})
+            self.assertEqual(Game.objects.count(), 6)
+
+            steam.requested.clear()
+            call_command('init_steam_games', page_size=3, stdout=io.StringIO())
+        self.assertEqual(steam.requested, [6, 8]) # 2개씩 와도 have_more_results가 true면 계속
+        self.assertEqual(sorted(Game.objects.values_list('appid', flat=True)), list(range(1, 11)))
+        self.assertIsNone(get_checkpoint('init_steam_games'))
+        self.assertEqual(GameFacetCount.objects.get(genre=None, price_bucket='free').count, 10)
+
+
+class SearchRecommendationCacheTests(TestCase):
+    """ AI 추천 캐시: 같은 검색어의 동시 호출은 한 번만, 빈 결과는 짧게, 대기 시간 초과는 추천 없음 """
+
+    def test_single_flight_collapses_concurrent_calls(self):
+        release = threading.Event()
+        calls = []
+
+        def slow():
+            calls.append(1)
+            release.wait(5)
+            return [1, 2]
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            leader = executor.submit(recommendations._single_flight, 'key', slow)
+            while not calls:
+                time.sleep(0.001)
+            followers = [executor.submit(recommendations._single_flight, 'key', slow) for _ in range(3)]
+            time.sleep(0.05)
+            release.set()
+            results = [leader.result()] + [future.result() for future in followers]
+        self.assertEqual(results, [[1, 2]] * 4)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(recommendations._inflight, {})
+
+    @override_settings(SEARCH_RECOMMENDATION_WAIT_TIMEOUT=0.05)
+    def test_follower_timeout_returns_no_recommendations(self):
+        # 같은 검색어의 LLM 호출이 아직 끝나지 않은 상태
+        recommendations._inflight['elden ring'] = Future()
+        self.addCleanup(recommendations._inflight.clear)
+        resolve = mock.Mock(return_value=[1])
+        self.assertEqual(recommendations.cached_recommendations('Elden  Ring', resolve), [])
+        resolve.assert_not_called()
+
+    @override_settings(
+        SEARCH_RECOMMENDATION_CACHE_TTL=datetime.timedelta(days=7),
+        SEARCH_RECOMMENDATION_NEGATIVE_CACHE_TTL=datetime.timedelta(hours=6),
+    )
+    def test_negative_cache_ttl(self):
+        resolve = mock.Mock(side_effect=[None, [], [3]])
+        cached = recommendations.cached_recommendations
+
+        self.assertEqual(cached('zzqx', resolve), []) # 실패(None)는 저장하지 않음
+        self.assertEqual(cached('ZZQX', resolve), []) # 추천 없음([])은 짧게 저장
+        self.assertEqual(cached('zzqx', resolve), [])
+        self.assertEqual(resolve.call_count, 2)
+
+        SearchRecommendationCache.objects.filter(query='zzqx').update(
+            expires_at=timezone.now() - datetime.timedelta(seconds=1)
+        )
+        self.assertEqual(cached('zzqx', resolve), [3])
+        entry = SearchRecommendationCache.objects.get(query='zzqx')
+        self.assertGreater(entry.expires_at, timezone.now() + datetime.timedelta(days=6))
@@ -1,15 +1,21 @@
 from django.urls import path
-from .views import SteamLibrary, GameDetailView, GameSearchView, FavoriteGame, AnalyzeGameReviewsView, GameListView
+from .views import SteamLibrary, LibrarySyncJobView, GameDetailView, GameSearchView, FavoriteGame, AnalyzeGameReviewsView, GameListView, GameFacetsView, GameAutocompleteView
 
 urlpatterns = [
     # 내 라이브러리 (목록 및 동기화)
     path('library/', SteamLibrary.as_view(), name='steam-library'),
+
+    # 라이브러리 동기화 작업 진행 상황 조회
+    path('library/sync/<int:job_id>/', LibrarySyncJobView.as_view(), name='library-sync-job'),
     
     # 게임 상세 정보 (DB 없으면 크롤링)
     path('<int:appid>/', GameDetailView.as_view(), name='game-detail'),
 
     # 스마트 검색용
     path('search/', GameSearchView.as_view(), name='game-search'),
+
+    # 검색창 자동완성 (메모리 색인)
+    path('autocomplete/', GameAutocompleteView.as_view(), name='game-autocomplete'),
     
     # 좋아하는 게임 정보 등록
     path('favorite/', FavoriteGame.as_view(), name='favorite'),
@@ -17,4 +23,7 @@ urlpatterns = [
     path('<int:appid>/analyze-reviews/', AnalyzeGameReviewsView.as_view(), name='analyze-game-reviews'),
 
     path('list/', GameListView.as_view(), name='game-list'),
+
+    # 필터 패널용 장르/가격대별 게임 수
+    path('facets/', GameFacetsView.as_view(), name='game-facets'),
 ]
\ No newline at end of file
@@ -0,0 +1,373 @@
+# games/utils.py
+import hashlib
+import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Game, Genre, UserGameLibrary, AppDetailsCache, CrawlerCheckpoint
+from .steam_client import steam_get
+from .counts import bump_catalog_version
+from .eviction import evict_overflow
+from .facets import apply_facet_deltas, facet_keys_for
+
+# 상세 정보로 채워지는 Game 필드 목록 (bulk_update 대상)
+DETAIL_FIELDS = ['publisher', 'developer', 'release_date', 'price', 'description', 'header_image']
+
+
+def parse_game_detail(game_data):
+    """ appdetails 응답의 data 부분을 Game 필드 형태로 변환 """
+    price = 0
+    if 'price_overview' in game_data:
+        price = game_data['price_overview']['final'] // 100
+
+    release_date = None
+    date_str = game_data.get('release_date', {}).get('date', '')
+    if date_str:
+        for fmt in ["%Y년 %m월 %d일", "%d %b, %Y", "%Y-%m-%d"]:
+            try:
+                release_date = datetime.strptime(date_str, fmt).date()
+                break
+            except ValueError: continue
+
+    return {
+        "publisher": game_data.get('publishers', [''])[0],
+        "developer": game_data.get('developers', [''])[0],
+        "release_date": release_date,
+        "price": price,
+        "description": game_data.get('short_description', ''),
+        "header_image": game_data.get('header_image', ''),
+        "genres": [g['description'] for g in game_data.get('genres', [])],
+    }
+
+
+def fetch_app_details_raw(appid, interactive=False):
+    """
+    스팀 상점 API에서 appdetails 원본을 가져옴 (DB는 건드리지 않음).
+    반환값: (success, data) / 네트워크 오류나 비정상 응답이면 None (캐시하지 않음)
+    """
+    params = {"appids": appid, "l": "koreana", "cc": "kr"}
+    try:
+        response = steam_get('appdetails', params, interactive=interactive)
+        data = response.json()
+        if not data or str(appid) not in data:
+            return None
+        entry = data[str(appid)]
+        return (True, entry['data']) if entry.get('success') else (False, None)
+    except Exception:
+        return None
+
+
+def store_app_details(results, now=None):
+    """ {appid: (success, data)}를 appdetails 캐시에 한 번에 upsert """
+    if not results:
+        return
+    now = now or timezone.now()
+    AppDetailsCache.objects.bulk_create(
+        [AppDetailsCache(appid=appid, success=success, data=data, fetched_at=now)
+         for appid, (success, data) in results.items()],
+        update_conflicts=True,
+        unique_fields=['appid'],
+        update_fields=['success', 'data', 'fetched_at'],
+        batch_size=500,
+    )
+    _maybe_evict_app_details_cache(len(results))
+
+
+_cache_writes_since_eviction = 0
+
+
+def _maybe_evict_app_details_cache(written):
+    """ 일정 횟수 쓸 때마다 캐시 크기를 확인해서 오래된 항목부터 정리 """
+    global _cache_writes_since_eviction
+    _cache_writes_since_eviction += written
+    if _cache_writes_since_eviction >= getattr(settings, 'APPDETAILS_CACHE_EVICT_EVERY', 500):
+        _cache_writes_since_eviction = 0
+        evict_app_details_cache()
+
+
+def evict_app_details_cache(max_entries=None):
+    """ 캐시가 max_entries를 넘으면 fetched_at이 오래된 순으로 삭제. 삭제한 개수 반환 """
+    max_entries = max_entries or getattr(settings, 'APPDETAILS_CACHE_MAX_ENTRIES', 200000)
+    return evict_overflow(AppDetailsCache.objects.all(), 'fetched_at', max_entries)
+
+
+def get_cached_game_details(appids):
+    """
+    캐시에서 아직 유효한 항목만 골라 {appid: detail 또는 None(상점에 없음)}으로 반환.
+    반환값에 없는 appid는 새로 가져와야 한다.
+    """
+    now = timezone.now()
+    cached = {}
+    for entry in AppDetailsCache.objects.filter(appid__in=list(appids)):
+        if entry.is_fresh(now):
+            cached[entry.appid] = parse_game_detail(entry.data) if entry.success else None
+    return cached
+
+
+def fetch_game_detail_internal(appid, force=False, interactive=False):
+    """
+    게임 상세 정보 조회 (유효한 캐시가 있으면 네트워크 요청 없이 반환, force면 항상 새로 가져옴)
+    interactive: 사용자 요청 안에서 호출하는 경우 (사용자 요청용 토큰 버킷, 재시도 없이 빠르게 실패)
+    """
+    if not force:
+        cached = get_cached_game_details([appid])
+        if appid in cached:
+            return cached[appid]
+
+    result = fetch_app_details_raw(appid, interactive=interactive)
+    if result is None:
+        return None
+    store_app_details({appid: result})
+    success, data = result
+    return parse_game_detail(data) if success else None
+
+
+def get_checkpoint(name, default=None):
+    """ 수집 작업의 재시작 지점 (없으면 default) """
+    checkpoint = CrawlerCheckpoint.objects.filter(name=name).first()
+    return checkpoint.value if checkpoint else default
+
+
+def save_checkpoint(name, value):
+    CrawlerCheckpoint.objects.update_or_create(name=name, defaults={'value': value})
+
+
+def clear_checkpoint(name):
+    CrawlerCheckpoint.objects.filter(name=name).delete()
+
+
+def games_missing_detail():
+    """ 상점 상세 정보(이미지 등)가 아직 채워지지 않은 게임 """
+    return Game.objects.filter(Q(header_image__isnull=True) | Q(header_image=''))
+
+
+def fetch_owned_games(steam_id):
+    """ 스팀 Web API에서 유저의 보유 게임 목록(플레이타임 포함)을 가져오는 함수 """
+    params = {
+        "key": settings.STEAM_API_KEY,
+        "steamid": steam_id,
+        "format": "json",
+        "include_appinfo": 1,
+        "include_played_free_games": 1,
+    }
+    res = steam_get('owned_games', params)
+    response_data = res.json().get("response", {})
+    # 비공개 프로필은 games 키 자체가 없음 → 빈 라이브러리로 보고 삭제하면 안 됨
+    if "games" not in response_data:
+        raise ValueError("스팀 라이브러리 정보를 가져올 수 없습니다.")
+    return response_data["games"]
+
+
+def library_fingerprint(owned_games):
+    """ 보유 게임 목록의 지문 (appid와 플레이타임만 반영, 순서 무관) """
+    rows = sorted(
+        (info['appid'], info.get('playtime_forever', 0), info.get('playtime_2weeks', 0))
+        for info in owned_games
+    )
+    return hashlib.sha256(json.dumps(rows, separators=(',', ':')).encode()).hexdigest()
+
+
+def apply_game_detail(game, detail):
+    """ fetch_game_detail_internal 결과를 Game 인스턴스에 반영 (저장과 장르는 호출하는 쪽에서) """
+    game.publisher = detail['publisher']
+    game.developer = detail['developer']
+    game.release_date = detail['release_date']
+    game.price = detail['price']
+    game.description = detail['description']
+    game.header_image = detail['header_image']
+
+
+def save_game_genres(genres_by_appid, facet_keys_before=None):
+    """
+    {appid: [장르명, ...]}으로 게임들의 장르 관계를 한 번에 교체하고 facet 집계에 변경분을 반영.
+    가격도 함께 바꿨다면 바꾸기 전에 구한 facet_keys_for 결과를 facet_keys_before로 넘길 것.
+    반환값: 장르/가격대 집계가 바뀌었는지 (바뀐 경우에만 카탈로그 버전을 올림)
+    """
+    if not genres_by_appid:
+        return False
+    if facet_keys_before is None:
+        facet_keys_before = facet_keys_for(genres_by_appid)
+    names = {name.strip()[:100] for names in genres_by_appid.values() for name in names if name.strip()}
+    Genre.objects.bulk_create([Genre(name=name) for name in names], ignore_conflicts=True)
+    genre_ids = dict(Genre.objects.filter(name__in=names).values_list('name', 'id'))
+
+    Through = Game.genres.through
+    with transaction.atomic():
+        Through.objects.filter(game_id__in=list(genres_by_appid)).delete()
+        Through.objects.bulk_create(
+            [Through(game_id=appid, genre_id=genre_ids[name.strip()[:100]])
+             for appid, names in genres_by_appid.items() for name in names if name.strip()],
+            ignore_conflicts=True,
+            batch_size=500,
+        )
+    changed = apply_facet_deltas(facet_keys_before, facet_keys_for(genres_by_appid))
+    if changed:
+        bump_catalog_version()
+    return changed
+
+
+def save_game_detail(game, detail):
+    """ 게임 한 개에 상세 정보를 반영하고 저장 """
+    apply_game_detail(game, detail)
+    # 조회 수 등 다른 경로에서 바뀌는 필드를 덮어쓰지 않도록 상세 정보 필드만 저장
+    game.save(update_fields=DETAIL_FIELDS + ['updated_at'])
+    save_game_genres({game.appid: detail['genres']})
+
+
+def enrich_games(appids, max_workers=None, batch_size=None, on_progress=None):
+    """
+    상세 정보가 없는 게임들의 appdetails를 동시에 가져와 Game에 배치 단위로 저장.
+    동시 요청 수는 max_workers로, 전체 요청 속도는 steam_client의 'store' 토큰 버킷으로 제한된다.
+    on_progress(done, enriched, failed)가 주어지면 게임 하나를 처리할 때마다 호출된다.
+    반환값: {'enriched': 상세 정보가 채워진 게임 수, 'failed': 네트워크 오류 등 일시적인 실패 수}
+    (상점에 없는 게임(success: false, 캐시 포함)은 채우지 못해도 실패로 세지 않음)
+    """
+    appids = list(appids)
+    if not appids:
+        return {'enriched': 0, 'failed': 0}
+
+    max_workers = max_workers or getattr(settings, 'STEAM_ENRICH_MAX_WORKERS', 8)
+    batch_size = batch_size or getattr(settings, 'STEAM_ENRICH_BATCH_SIZE', 50)
+
+    def fetch(appid):
+        return appid, fetch_app_details_raw(appid)
+
+    games = Game.objects.in_bulk(appids)
+    pending = []
+    pending_genres = {}
+    fetched = {}
+    done = enriched = failed = 0
+    price_changed = False
+
+    def flush():
+        nonlocal price_changed
+        if pending:
+            # 가격이 바뀌면 가격대 집계도 바뀌므로 저장 전 facet 키를 먼저 구함
+            facet_keys_before = facet_keys_for(game.appid for game in pending)
+            Game.objects.bulk_update(pending, DETAIL_FIELDS + ['updated_at'])
+            # 같은 가격대 안에서 가격만 바뀐 경우에도 가격 범위 개수 캐시는 달라짐
+            if not save_game_genres(pending_genres, facet_keys_before) and price_changed:
+                bump_catalog_version()
+            pending.clear()
+            pending_genres.clear()
+            price_changed = False
+        store_app_details(fetched)
+        fetched.clear()
+
+    def apply(appid, detail, error=False):
+        nonlocal done, enriched, failed, price_changed
+        done += 1
+        failed += error
+        if detail:
+            game = games[appid]
+            old_price = game.price
+            apply_game_detail(game, detail)
+            price_changed = price_changed or game.price != old_price
+            # bulk_update는 auto_now를 채워주지 않으므로 직접 갱신
+            game.updated_at = timezone.now()
+            pending.append(game)
+            pending_genres[appid] = detail['genres']
+            enriched += 1
+        if len(pending) >= batch_size or len(fetched) >= batch_size:
+            flush()
+        if on_progress:
+            on_progress(done, enriched, failed)
+
+    # 1. 캐시에 있는 것은 네트워크 없이 바로 반영
+    cached = get_cached_game_details(games)
+    for appid, detail in cached.items():
+        apply(appid, detail)
+
+    # 2. 나머지만 동시에 요청 (DB 쓰기는 이 스레드에서만, 워커 스레드는 네트워크 요청만 담당)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(fetch, appid) for appid in games if appid not in cached]
+        for future in as_completed(futures):
+            appid, result = future.result()
+            detail = None
+            if result is not None:
+                fetched[appid] = result
+                success, data = result
+                detail = parse_game_detail(data) if success else None
+            apply(appid, detail, error=result is None)
+        flush()
+
+    return {'enriched': enriched, 'failed': failed}
+
+
+def sync_user_library(user, owned_games):
+    """
+    GetOwnedGames 응답(games 리스트)을 유저 라이브러리에 반영.
+    기존 행을 한 번에 읽어 비교한 뒤 새로 생긴/바뀐 행만 upsert하고,
+    더 이상 보유하지 않는 게임의 행은 삭제한다.
+    반환값: {'created', 'updated', 'deleted', 'missing_detail_appids'}
+    """
+    owned = {}
+    for info in owned_games:
+        owned[info['appid']] = info
+
+    with transaction.atomic():
+        # 1. 기존 라이브러리를 한 번에 읽어서 변경분 계산
+        existing = {
+            game_id: (total, recent)
+            for game_id, total, recent in UserGameLibrary.objects.filter(user=user)
+                .values_list('game_id', 'playtime_total', 'playtime_recent_2weeks')
+        }
+
+        # 2. 새로 생긴 게임 중 카탈로그에 없는 것은 제목만으로 먼저 추가 (이미 있으면 무시)
+        new_games = [
+            Game(appid=appid, title=info.get('name', '')[:255])
+            for appid, info in owned.items() if appid not in existing
+        ]
+        if new_games:
+            # 이미 카탈로그에 있던 게임은 전후 키가 같으므로 실제로 추가된 게임만 집계에 더해짐
+            new_appids = [game.appid for game in new_games]
+            facet_keys_before = facet_keys_for(new_appids)
+            Game.objects.bulk_create(new_games, ignore_conflicts=True, batch_size=500)
+            if apply_facet_deltas(facet_keys_before, facet_keys_for(new_appids)):
+                bump_catalog_version()
+
+        now = timezone.now()
+        changed_rows = []
+        created = 0
+        for appid, info in owned.items():
+            playtime = (info.get('playtime_forever', 0), info.get('playtime_2weeks', 0))
+            if appid not in existing:
+                created += 1
+            elif existing[appid] == playtime:
+                continue
+            changed_rows.append(UserGameLibrary(
+                user=user, game_id=appid,
+                playtime_total=playtime[0],
+                playtime_recent_2weeks=playtime[1],
+                last_updated_at=now,
+            ))
+
+        # 3. (user, game) 유니크 제약 기준으로 upsert
+        if changed_rows:
+            UserGameLibrary.objects.bulk_create(
+                changed_rows,
+                update_conflicts=True,
+                unique_fields=['user', 'game'],
+                update_fields=['playtime_total', 'playtime_recent_2weeks', 'last_updated_at'],
+                batch_size=500,
+            )
+
+        # 4. 더 이상 보유하지 않는 게임 정리
+        removed = [game_id for game_id in existing if game_id not in owned]
+        if removed:
+            UserGameLibrary.objects.filter(user=user, game_id__in=removed).delete()
+
+    missing_detail_appids = list(
+        games_missing_detail().filter(usergamelibrary__user=user).values_list('appid', flat=True)
+    )
+
+    return {
+        'created': created,
+        'updated': len(changed_rows) - created,
+        'deleted': len(removed),
+        'missing_detail_appids': missing_detail_appids,
+    }
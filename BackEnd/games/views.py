@@ -1,65 +1,30 @@
 # games/views.py
-import requests
-from datetime import datetime, timedelta
+from datetime import timedelta
 from django.conf import settings
-from django.db.models import Case, When, Value, IntegerField, Q
 from django.utils import timezone
+from django.db.models import F
 from django.shortcuts import get_object_or_404
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly
 from rest_framework import status
 
-from asgiref.sync import async_to_sync
-from .models import UserGameLibrary, Game, UserFavoriteGame
-from .serializers import UserGameLibrarySerializer, GameSerializer
-from ai_analysis.models import ReviewSummary
-from ai_analysis.utils import (
-    fetch_steam_reviews, 
-    get_ai_review_summary, 
-    get_ai_response, 
-    parse_ai_json
+from .models import UserGameLibrary, Game, Genre, UserFavoriteGame, LibrarySyncJob, AppDetailsCache
+from .serializers import UserGameLibrarySerializer, GameSerializer, LibrarySyncJobSerializer
+from .utils import fetch_game_detail_internal, save_game_detail
+from .search import search_games, search_games_after
+from .counts import approximate_count, cached_count, normalize_filters
+from .facets import facet_counts, price_buckets
+from .autocomplete import autocomplete, fuzzy_search
+from .recommendations import cached_recommendations
+from .pagination import InvalidCursor, decode_cursor, encode_cursor, keyset_order_by, keyset_paginate
+from .tasks import (
+    enqueue_library_sync, library_sync_retry_after, schedule_game_detail_refresh,
+    enqueue_review_summary, expire_review_summary_lease, wait_for_review_summary,
 )
-
-# --- 내부 헬퍼 함수 ---
-def fetch_game_detail_internal(appid):
-    """ 스팀 상점 API에서 게임 상세 정보를 가져오는 함수 """
-    url = "https://store.steampowered.com/api/appdetails"
-    params = {"appids": appid, "l": "koreana", "cc": "kr"}
-    
-    try:
-        response = requests.get(url, params=params, timeout=5)
-        data = response.json()
-        
-        if not data or str(appid) not in data or not data[str(appid)]['success']:
-            return None
-
-        game_data = data[str(appid)]['data']
-        
-        price = 0
-        if 'price_overview' in game_data:
-            price = game_data['price_overview']['final'] // 100
-        
-        release_date = None
-        date_str = game_data.get('release_date', {}).get('date', '')
-        if date_str:
-            for fmt in ["%Y년 %m월 %d일", "%d %b, %Y", "%Y-%m-%d"]:
-                try:
-                    release_date = datetime.strptime(date_str, fmt).date()
-                    break
-                except ValueError: continue
-
-        return {
-            "publisher": game_data.get('publishers', [''])[0],
-            "developer": game_data.get('developers', [''])[0],
-            "release_date": release_date,
-            "price": price,
-            "description": game_data.get('short_description', ''),
-            "header_image": game_data.get('header_image', ''),
-            "genres": [g['description'] for g in game_data.get('genres', [])],
-        }
-    except Exception:
-        return None
+from ai_analysis.models import ReviewSummary
+from ai_analysis.sentiment import game_sentiment
+from ai_analysis.utils import get_ai_response, parse_ai_json, run_ai
 
 # --- AI 검색 추천 비동기 함수 ---
 async def get_search_recommendations(query):
@@ -70,6 +35,8 @@ async def get_search_recommendations(query):
     user_prompt = f"사용자 검색어 '{query}'와 가장 유사한 게임 3개의 appid와 제목을 JSON으로 알려주세요."
     
     raw_res = await get_ai_response('gemini-2.5-flash-lite', system_prompt, user_prompt)
+    if not raw_res:
+        return None # 호출 실패 (추천 없음과 구분해서 캐시하지 않음)
     return parse_ai_json(raw_res) or []
 
 
@@ -78,60 +45,37 @@ class SteamLibrary(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        library = UserGameLibrary.objects.filter(user=request.user).order_by('-playtime_total')
+        library = UserGameLibrary.objects.filter(user=request.user).order_by('-playtime_total')\
+            .select_related('game__review_summary').prefetch_related('game__genres')
         serializer = UserGameLibrarySerializer(library, many=True)
         return Response(serializer.data)
 
     def post(self, request):
-        user = request.user
-        steam_id = user.username
-        
-        if not steam_id:
+        if not request.user.username:
             return Response({"error": "스팀 ID가 없습니다."}, status=400)
 
-        url = "http://api.steampowered.com/IPlayerService/GetOwnedGames/v0001/"
-        params = {
-            "key": settings.STEAM_API_KEY,
-            "steamid": steam_id,
-            "format": "json",
-            "include_appinfo": 1,
-            "include_played_free_games": 1,
-        }
-        
-        try:
-            res = requests.get(url, params=params)
-            games_data = res.json().get("response", {}).get("games", [])
-            
-            updated_count = 0
-            for info in games_data:
-                game, _ = Game.objects.get_or_create(
-                    appid=info['appid'],
-                    defaults={'title': info['name']}
-                )
-                if not game.header_image:
-                    detail = fetch_game_detail_internal(info['appid'])
-                    if detail:
-                        game.publisher = detail['publisher']
-                        game.developer = detail['developer']
-                        game.release_date = detail['release_date']
-                        game.price = detail['price']
-                        game.description = detail['description']
-                        game.header_image = detail['header_image']
-                        game.genres = ", ".join(detail['genres'])
-                        game.save()
-                
-                UserGameLibrary.objects.update_or_create(
-                    user=user, game=game,
-                    defaults={
-                        'playtime_total': info.get('playtime_forever', 0), 
-                        'playtime_recent_2weeks': info.get('playtime_2weeks', 0)
-                    }
-                )
-                updated_count += 1
-            
-            return Response({"message": "동기화 성공", "updated_count": updated_count})
-        except Exception as e:
-            return Response({"error": str(e)}, status=500)
+        # 직전에 동기화했다면 스팀에 다시 요청하지 않음
+        retry_after = library_sync_retry_after(request.user)
+        if retry_after:
+            return Response(
+                {"error": "최근에 이미 동기화했습니다. 잠시 후 다시 시도해주세요.", "retry_after": retry_after},
+                status=status.HTTP_429_TOO_MANY_REQUESTS,
+                headers={"Retry-After": str(retry_after)},
+            )
+
+        # 동기화는 백그라운드 작업으로 넘기고 바로 응답 (진행 상황은 작업 조회 API로 확인)
+        job, created = enqueue_library_sync(request.user)
+        data = LibrarySyncJobSerializer(job).data
+        data['message'] = "동기화 작업이 등록되었습니다." if created else "이미 진행 중인 동기화 작업이 있습니다."
+        return Response(data, status=status.HTTP_202_ACCEPTED)
+
+
+class LibrarySyncJobView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, job_id):
+        job = get_object_or_404(LibrarySyncJob, pk=job_id, user=request.user)
+        return Response(LibrarySyncJobSerializer(job).data)
 
 
 # === 2. 게임 상세 조회 ===
@@ -141,26 +85,33 @@ class GameDetailView(APIView):
     def get(self, request, appid):
         game = get_object_or_404(Game, appid=appid)
         now = timezone.now()
+        # 조회 기록 (다른 필드를 덮어쓰지 않도록 UPDATE 한 번으로)
+        Game.objects.filter(appid=appid).update(view_count=F('view_count') + 1, last_viewed_at=now)
+        # 신선도는 Game.updated_at(다른 저장에도 바뀜)이 아니라 상점 정보를 실제로 가져온 시점으로 판단
+        cache = AppDetailsCache.objects.filter(appid=appid).first()
+        release_passed = bool(
+            cache and game.release_date and
+            game.release_date <= now.date() and cache.fetched_at.date() < game.release_date
+        )
         # 1. 필수 정보가 없거나 (새 필드 추가 등)
-        # 2. 마지막 갱신 후 3일이 지났거나
+        # 2. 캐시된 상점 정보가 없거나 유효 기간이 지났거나
         # 3. 출시 예정일이었던 날짜가 지나서 정보 업데이트가 필요할 때
         need_update = (
-            not (game.description and game.developer) or 
-            (now - game.updated_at > timedelta(days=3)) or
-            (game.release_date and game.release_date <= now.date() and game.updated_at.date() < game.release_date)
-)
+            not (game.description and game.developer) or
+            cache is None or not cache.is_fresh(now) or
+            release_passed
+        )
         
-        if need_update:
-            detail = fetch_game_detail_internal(appid)
+        # 설명이 하나라도 있으면 갖고 있는 데이터로 먼저 응답하고 갱신은 백그라운드에서 (stale-while-revalidate)
+        is_stale = False
+        if need_update and game.description and getattr(settings, 'GAME_DETAIL_STALE_WHILE_REVALIDATE', True):
+            schedule_game_detail_refresh(appid, force=release_passed)
+            is_stale = True
+        elif need_update:
+            # 캐시가 유효하면 네트워크 요청 없이 캐시에서 채워짐
+            detail = fetch_game_detail_internal(appid, force=release_passed, interactive=True)
             if detail:
-                game.publisher = detail['publisher']
-                game.developer = detail['developer']
-                game.release_date = detail['release_date']
-                game.price = detail['price']
-                game.description = detail['description']
-                game.header_image = detail['header_image']
-                game.genres = ", ".join(detail['genres'])
-                game.save()
+                save_game_detail(game, detail)
                 
         serializer = GameSerializer(game)
         data = serializer.data
@@ -186,6 +137,9 @@ class GameDetailView(APIView):
             'playtime_total': playtime,
             'is_owned': is_owned,
             'is_favorite': is_favorite,
+            'is_stale': is_stale,
+            # 저장된 리뷰의 감정 점수 집계 (AI 호출 없음)
+            'review_sentiment': game_sentiment(appid),
         })
         return Response(data)
 
@@ -208,41 +162,86 @@ class GameSearchView(APIView):
         if not query:
             return Response({"error": "검색어를 입력해주세요."}, status=status.HTTP_400_BAD_REQUEST)
 
-        qs = Game.objects.filter(title__icontains=query).annotate(
-            search_priority=Case(
-                When(title__istartswith=query, then=Value(0)),
-                default=Value(1),
-                output_field=IntegerField(),
-            )
-        ).order_by('search_priority', 'title')
-        
-        total_count = qs.count()
-        
+        # cursor 페이징 (무한 스크롤용): 전체 개수는 with_count=true일 때만 계산
+        if 'cursor' in request.GET:
+            return self.get_by_cursor(request, query)
+
+        off_int, lim_int = 0, None
         try:
-            off_int = int(offset)
             if limit:
+                off_int = int(offset)
                 lim_int = int(limit)
-                qs = qs[off_int : off_int + lim_int]
         except ValueError:
-            pass
-         
-        games_list = list(qs)
+            off_int, lim_int = 0, None
+
+        # SQLite에서는 FTS5 trigram 색인, 그 외에는 ORM icontains로 검색
+        total_count, games_list = search_games(query, off_int, lim_int)
         results_data = [self.serialize_game(g) for g in games_list]
-        recommendations = []
-                
-        if total_count == 0:
-            ai_results = async_to_sync(get_search_recommendations)(query)
-            if ai_results:
-                suggested_appids = [item.get('appid') for item in ai_results if item.get('appid')]
-                rec_games = Game.objects.filter(appid__in=suggested_appids)
-                recommendations = [self.serialize_game(g) for g in rec_games]
+        recommendations, source = self.get_recommendations(query) if total_count == 0 else ([], None)
 
         return Response({
             "count": total_count,
             "results": results_data,
-            "recommendations": recommendations
+            "recommendations": recommendations,
+            "recommendation_source": source,
         }, status=status.HTTP_200_OK)
 
+    def get_by_cursor(self, request, query):
+        cursor = request.GET.get('cursor')
+        try:
+            limit = int(request.GET.get('limit', 24))
+            cursor_values = decode_cursor(cursor, 'search') if cursor else None
+            total_count, games_list, next_values = search_games_after(
+                query, cursor_values, limit,
+                with_count=request.GET.get('with_count') in ('1', 'true'),
+            )
+        except (InvalidCursor, ValueError) as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        # 첫 페이지부터 결과가 없을 때만 추천
+        recommendations, source = self.get_recommendations(query) if not cursor and not games_list else ([], None)
+        data = {
+            "results": [self.serialize_game(g) for g in games_list],
+            "next_cursor": encode_cursor('search', next_values) if next_values else None,
+            "recommendations": recommendations,
+            "recommendation_source": source,
+        }
+        if total_count is not None:
+            data["count"] = total_count
+        return Response(data, status=status.HTTP_200_OK)
+
+    def get_recommendations(self, query):
+        """
+        검색 결과가 없을 때의 추천. 반환값: (게임 목록, 'fuzzy' | 'ai' | None)
+        먼저 메모리 색인으로 오타를 교정해 보고, 충분히 비슷한 제목이 없을 때만 AI에게 물어봄
+        """
+        threshold = getattr(settings, 'FUZZY_SEARCH_MIN_CONFIDENCE', 0.5)
+        matches = [appid for appid, _, score in fuzzy_search(query, 3) if score >= threshold]
+        if matches:
+            games = Game.objects.in_bulk(matches)
+            return [self.serialize_game(games[appid]) for appid in matches if appid in games], 'fuzzy'
+
+        # AI 추천은 정규화한 검색어별로 DB에 캐시 (같은 검색어의 동시 요청은 LLM 호출 한 번으로)
+        suggested_appids = cached_recommendations(query, lambda: self.resolve_ai_recommendations(query))
+        if not suggested_appids:
+            return [], None
+        rec_games = Game.objects.in_bulk(suggested_appids)
+        return [self.serialize_game(rec_games[appid]) for appid in suggested_appids if appid in rec_games], 'ai'
+
+    def resolve_ai_recommendations(self, query):
+        """ LLM 추천 중 카탈로그에 실제로 있는 appid 목록 (호출 실패면 None) """
+        ai_results = run_ai(get_search_recommendations(query))
+        if ai_results is None:
+            return None
+        suggested_appids = []
+        for item in ai_results:
+            try:
+                suggested_appids.append(int(item.get('appid')))
+            except (AttributeError, TypeError, ValueError):
+                continue
+        existing = set(Game.objects.filter(appid__in=suggested_appids).values_list('appid', flat=True))
+        return [appid for appid in suggested_appids if appid in existing]
+
 
 # === 4. 선호 게임 저장 (월드컵 결과) ===
 class FavoriteGame(APIView):
@@ -270,45 +269,41 @@ class FavoriteGame(APIView):
 
 # === 5. 리뷰 AI 요약 ===
 class AnalyzeGameReviewsView(APIView):
+    """
+    리뷰 AI 요약. POST는 분석 작업을 백그라운드에 등록하고 바로 202로 현재 상태를 응답하며,
+    결과는 GET(?wait=초 를 주면 완료될 때까지 최대 그 시간만큼 기다림)으로 확인한다.
+    """
+
+    def get(self, request, appid):
+        game = get_object_or_404(Game, appid=appid)
+        try:
+            wait = float(request.query_params.get('wait', 0))
+        except ValueError:
+            wait = 0
+        wait = max(0, min(wait, getattr(settings, 'REVIEW_SUMMARY_MAX_WAIT', 25)))
+
+        summary = wait_for_review_summary(game.appid, wait)
+        if summary is None:
+            return Response({"status": None, "summary_text": "", "last_updated_at": None, "tokens_used": 0})
+        return Response(self.serialize_summary(summary))
+
     def post(self, request, appid):
         game = get_object_or_404(Game, appid=appid)
+        expire_review_summary_lease(game.appid)
         summary = ReviewSummary.objects.filter(game=game).first()
-        
+
         if summary and summary.status == 'COMPLETED':
             if timezone.now() - summary.last_updated_at < timedelta(minutes=30):
                 return Response({
                     "message": "최근 분석된 데이터가 있습니다.",
                     "data": self.serialize_summary(summary)
                 })
-            
-        summary, created = ReviewSummary.objects.get_or_create(game=game)
-        summary.status = 'PROCESSING'
-        summary.save()
-        
-        try:
-            reviews = fetch_steam_reviews(appid)
-            if not reviews:
-                summary.status = 'FAILED'
-                summary.summary_text = "분석할 리뷰가 없습니다."
-                summary.save()
-                return Response({"error": "리뷰를 찾을 수 없습니다."}, status=404)
-            else:
-                ai_text = async_to_sync(get_ai_review_summary)(reviews)
-                error_messages = ["요약을 생성할 수 없습니다.", "분석 결과가 유효하지 않습니다.", "표시할 리뷰가 없습니다."]
-                if not ai_text or ai_text in error_messages:
-                    summary.status = "FAILED"
-                    summary.summary_text = ai_text if ai_text else "AI 응답이 비어있습니다."
-                else:
-                    summary.status = 'COMPLETED'
-                    summary.summary_text = ai_text
-
-                summary.save()
-            
-            return Response(self.serialize_summary(summary))
-        except Exception as e:
-            summary.status = 'FAILED'
-            summary.save()
-            return Response({"error": str(e)}, status=500)
+
+        started = enqueue_review_summary(game.appid)
+        summary = ReviewSummary.objects.get(game=game)
+        data = self.serialize_summary(summary)
+        data['message'] = "분석 작업이 등록되었습니다." if started else "이미 분석 중입니다."
+        return Response(data, status=status.HTTP_202_ACCEPTED)
 
     def serialize_summary(self, summary):
         return {
@@ -318,28 +313,64 @@ class AnalyzeGameReviewsView(APIView):
             "tokens_used": summary.tokens_used
         }
 
+class GameAutocompleteView(APIView):
+    """ 검색창 자동완성: DB를 거치지 않고 프로세스 메모리 색인에서 제목을 찾음 """
+
+    def get(self, request):
+        query = request.GET.get('q', '').strip()
+        max_results = getattr(settings, 'AUTOCOMPLETE_MAX_RESULTS', 20)
+        try:
+            limit = min(max(int(request.GET.get('limit', 10)), 1), max_results)
+        except ValueError:
+            limit = 10
+        if not query:
+            return Response({"results": []}, status=status.HTTP_200_OK)
+
+        results = [{"appid": appid, "title": title} for appid, title in autocomplete(query, limit)]
+        return Response({"results": results}, status=status.HTTP_200_OK)
+
+
+def parse_genre_filter(genre_param):
+    """ "액션,RPG" 형태의 장르 파라미터 → (장르명 집합, 장르 id 목록 또는 None(없는 장르가 섞임)) """
+    genres = {g.strip() for g in (genre_param or '').split(',') if g.strip()}
+    if not genres:
+        return genres, []
+    genre_ids = list(Genre.objects.filter(name__in=genres).values_list('id', flat=True))
+    if len(genre_ids) < len(genres):
+        return genres, None
+    return genres, genre_ids
+
+
 class GameListView(APIView):
+    # 정렬 옵션별 정렬 키 (cursor 페이징의 키 순서와 같음)
+    SORT_ORDERINGS = {
+        'recent': ['-release_date', '-appid'],
+        'price_asc': ['price', 'appid'],
+        'price_desc': ['-price', '-appid'],
+        'name': ['title', 'appid'],
+    }
+
     def get(self, request):
         # 1. 파라미터 수신
         genre_param = request.GET.get('genre', '') # "Action,RPG" 형태로 들어옴
         min_price = request.GET.get('min_price')
         max_price = request.GET.get('max_price')
         sort_option = request.GET.get('sort', 'recent') 
+        if sort_option not in self.SORT_ORDERINGS:
+            sort_option = 'recent'
         limit = int(request.GET.get('limit', 24))
         offset = int(request.GET.get('offset', 0))
         
-        qs = Game.objects.all()
-
-        # 2. 다중 장르 필터링 (OR 조건: 선택한 장르 중 하나라도 포함되면 검색)
-        # 만약 AND 조건(모두 포함)을 원하시면 Q 결합 방식을 & 로 바꾸면 됩니다.
-        if genre_param:
-            genres = [g.strip() for g in genre_param.split(',') if g.strip()]
-            if genres:
-                q_objects = Q()
-                for g in genres:
-                    # genres__icontains는 콤마로 구분된 문자열에서 검색
-                    q_objects &= Q(genres__icontains=g) 
-                qs = qs.filter(q_objects)
+        qs = Game.objects.prefetch_related('genres')
+
+        # 2. 다중 장르 필터링 (AND 조건: 선택한 장르를 모두 가진 게임만)
+        genres, genre_ids = parse_genre_filter(genre_param)
+        if genre_ids is None:
+            # 존재하지 않는 장르가 섞여 있으면 결과 없음
+            qs = qs.none()
+        for genre_id in genre_ids or []:
+            # 장르마다 중간 테이블을 인덱스로 조인 (문자열 부분 일치 X)
+            qs = qs.filter(genres=genre_id)
         
         # 3. 가격 범위 필터링
         if min_price is not None and min_price != '':
@@ -348,32 +379,86 @@ class GameListView(APIView):
         if max_price is not None and max_price != '':
             qs = qs.filter(price__lte=int(max_price))
 
-        # 4. 정렬
-        if sort_option == 'price_asc':
-            qs = qs.order_by('price')
-        elif sort_option == 'price_desc':
-            qs = qs.order_by('-price')
-        elif sort_option == 'name':
-            qs = qs.order_by('title')
-        else:
-            qs = qs.order_by('-release_date', '-appid')
+        # 결과 개수는 필터 조합별로 캐시 (count=approx면 결과가 많을 때 추정치)
+        filters = normalize_filters(genres, min_price or None, max_price or None)
+        count_mode = request.GET.get('count')
 
-        # 5. 페이징 및 응답
-        total_count = qs.count()
-        qs = qs[offset : offset + limit]
-        
-        data = []
-        for game in qs:
-            data.append({
-                "appid": game.appid,
-                "title": game.title,
-                "header_image": game.header_image,
-                "price": game.price,
-                "genres": game.genres,
-                "release_date": game.release_date
-            })
+        # 4. 정렬 (마지막 키 appid로 순서를 유일하게 → cursor 페이징 가능)
+        ordering = self.SORT_ORDERINGS.get(sort_option, self.SORT_ORDERINGS['recent'])
+
+        # 5-1. cursor 페이징: OFFSET 없이 이전 페이지 마지막 행 다음부터 조회, 전체 개수는 요청 시에만
+        if 'cursor' in request.GET:
+            cursor = request.GET.get('cursor')
+            try:
+                cursor_values = decode_cursor(cursor, sort_option) if cursor else None
+                games, next_values = keyset_paginate(qs, ordering, cursor_values, limit)
+            except InvalidCursor as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+            data = {
+                "results": [self.serialize_game(g) for g in games],
+                "next_cursor": encode_cursor(sort_option, next_values) if next_values else None,
+            }
+            if request.GET.get('with_count') in ('1', 'true') or count_mode == 'approx':
+                data.update(self.get_count(qs, filters, count_mode))
+            return Response(data, status=status.HTTP_200_OK)
+
+        # 5-2. 기존 offset 페이징 및 응답
+        data = self.get_count(qs, filters, count_mode)
+        qs = keyset_order_by(qs, ordering)[offset : offset + limit]
+        data["results"] = [self.serialize_game(g) for g in qs]
+        return Response(data, status=status.HTTP_200_OK)
+
+    def get_count(self, qs, filters, count_mode):
+        if count_mode == 'approx':
+            count, is_approximate = approximate_count(qs, filters)
+            return {"count": count, "count_is_approximate": is_approximate}
+        return {"count": cached_count(qs, filters)}
+
+    def serialize_game(self, game):
+        return {
+            "appid": game.appid,
+            "title": game.title,
+            "header_image": game.header_image,
+            "price": game.price,
+            "genres": game.genre_names,
+            "release_date": game.release_date
+        }
+
+
+class GameFacetsView(APIView):
+    """
+    게임 목록 필터 패널용 장르/가격대별 게임 수 (GameListView와 같은 genre, min_price, max_price 파라미터)
+    - genres: 현재 선택에 그 장르를 추가했을 때의 게임 수
+    - price_buckets: 현재 장르 선택에서 가격대별 게임 수 (가격 필터는 적용하지 않음)
+    """
+
+    def get(self, request):
+        min_price = request.GET.get('min_price') or None
+        max_price = request.GET.get('max_price') or None
+        try:
+            min_price = int(min_price) if min_price is not None else None
+            max_price = int(max_price) if max_price is not None else None
+        except ValueError:
+            return Response({"error": "가격은 숫자여야 합니다."}, status=status.HTTP_400_BAD_REQUEST)
+
+        genres, genre_ids = parse_genre_filter(request.GET.get('genre', ''))
+        genre_names = dict(Genre.objects.values_list('id', 'name'))
+        if genre_ids is None:
+            by_genre, by_bucket, total = {}, {}, 0
+        else:
+            filters = normalize_filters(genres, min_price, max_price)
+            by_genre, by_bucket, total = facet_counts(genre_ids, min_price, max_price, filters=filters)
 
         return Response({
-            "count": total_count,
-            "results": data
+            "count": total,
+            "genres": sorted(
+                ({"name": genre_names[genre_id], "count": count}
+                 for genre_id, count in by_genre.items() if count and genre_id in genre_names),
+                key=lambda item: (-item["count"], item["name"]),
+            ),
+            "price_buckets": [
+                {"key": key, "min_price": low, "max_price": high, "count": by_bucket.get(key, 0)}
+                for key, low, high in price_buckets()
+            ],
         }, status=status.HTTP_200_OK)
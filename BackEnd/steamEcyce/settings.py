@@ -1,5 +1,6 @@
 # settings.py
 from pathlib import Path
+from datetime import timedelta
 import os
 import environ
 
@@ -10,6 +11,123 @@ environ.Env.read_env(BASE_DIR / '.env')
 
 # API 키 가져오기
 STEAM_API_KEY = env('STEAM_API_KEY')
+
+# 스팀 API 공용 클라이언트 (games/steam_client.py)
+STEAM_HTTP_POOL_SIZE = 16        # keep-alive 커넥션 풀 크기
+STEAM_MAX_RETRIES = 3            # 429/5xx, 네트워크 오류 시 재시도 횟수
+STEAM_RETRY_BACKOFF = 0.5        # 재시도 백오프 기본값(초), 시도마다 2배 + 지터
+STEAM_MAX_BACKOFF = 5.0          # 재시도 한 번의 최대 대기 시간(초), Retry-After가 더 길어도 이만큼만 기다림
+STEAM_INTERACTIVE_MAX_RETRIES = 0  # 사용자 요청 안에서 바로 보내는 스팀 호출의 재시도 횟수 (상세 페이지, 로그인)
+STEAM_RATE_LIMITS = {            # 버킷별 (초당 요청 수, 최대 버스트) - 프로세스 전체 공유
+    'store': (160 / 300, 16),    # 상점 API는 5분에 약 200회 → 대량 수집 160회 + 사용자 요청 40회로 나눔
+    'store:interactive': (40 / 300, 10),  # 사용자 요청(상세 페이지 등)은 대량 수집의 예약 토큰 뒤에 줄 서지 않음
+    'webapi': (2, 10),
+    'webapi:interactive': (1, 5),
+    'community': (2, 5),
+}
+
+# 라이브러리 동기화 시 스팀 상점 상세 정보(appdetails) 병렬 수집 설정
+STEAM_ENRICH_MAX_WORKERS = 8     # 동시에 보내는 최대 요청 수 (전체 속도는 'store' 버킷이 제한)
+STEAM_ENRICH_BATCH_SIZE = 50     # 몇 개씩 모아서 DB에 저장할지
+
+# 전체 게임 목록 수집 (init_steam_games)
+STEAM_APP_LIST_PAGE_SIZE = 10000   # GetAppList 한 번 요청에 받을 앱 수
+STEAM_APP_LIST_WRITE_BATCH = 2000  # 몇 개씩 모아서 저장하고 재시작 지점을 기록할지
+
+# 전체 카탈로그 상세 정보 수집 크롤러 (enrich_steam_games)
+GAME_ENRICH_CRAWL_BATCH = 200                    # 한 번에 골라서 수집할 게임 수
+GAME_ENRICH_RECENT_VIEW_WINDOW = timedelta(days=7) # 이 기간 안에 조회된 게임은 우선 수집
+
+# 스팀 유저 리뷰 수집 (ai_analysis/reviews.py → GameReview)
+STEAM_REVIEW_LANGUAGES = ['korean']  # ingest_game_reviews 명령어가 수집할 언어 (스팀 language 값)
+STEAM_REVIEW_PAGE_SIZE = 100         # appreviews 한 페이지 크기 (최대 100)
+STEAM_REVIEW_WRITE_BATCH = 500       # 몇 개씩 모아서 저장할지
+STEAM_REVIEW_MAX_PER_GAME = 2000     # 게임/언어별 한 번에 수집할 최대 리뷰 수
+STEAM_REVIEW_ON_DEMAND_MAX = 200     # 요약 요청 시 새로 받아 올 최대 리뷰 수 (나머지는 명령어로 수집)
+
+# 리뷰 감정 점수 (ai_analysis/sentiment.py, 감정 사전 기반으로 AI 호출 없이 계산)
+REVIEW_USEFUL_MIN_VOTES = 3          # '유용함' 투표가 이 이상이면 유용한 리뷰
+REVIEW_USEFUL_MIN_TOKENS = 20        # 또는 이 이상의 단어 수 + 감정어 2개 이상이면 유용한 리뷰
+REVIEW_SENTIMENT_THRESHOLD = 0.2     # 점수가 ±이 값 이상이면 긍정/부정으로 집계
+
+# 리뷰 요약 프롬프트에 넣을 리뷰 고르기 (ai_analysis/selection.py)
+REVIEW_SUMMARY_CANDIDATES = 150      # 저장된 리뷰 중 후보로 가져올 개수 ('유용함' 투표 순)
+REVIEW_SUMMARY_PROMPT_TOKENS = 1500  # 프롬프트에 넣을 리뷰 본문의 토큰 예산 (추정치)
+REVIEW_SELECT_MAX_REVIEWS = 20       # 프롬프트에 넣을 최대 리뷰 수
+REVIEW_SELECT_MAX_CHARS = 600        # 리뷰 하나에서 사용할 최대 글자 수 (넘으면 자름)
+REVIEW_SELECT_MIN_WORDS = 3          # 이보다 단어가 적은 리뷰는 제외
+REVIEW_SELECT_DUPLICATE_SIMILARITY = 0.8  # TF-IDF 코사인 유사도가 이 이상이면 중복으로 보고 제외
+REVIEW_SELECT_MMR_LAMBDA = 0.7       # 1에 가까울수록 대표성, 0에 가까울수록 다양성 우선
+
+# 스팀 상점 appdetails 캐시 (games.AppDetailsCache)
+APPDETAILS_CACHE_TTL = timedelta(days=3)           # 정상 응답 유지 기간
+APPDETAILS_NEGATIVE_CACHE_TTL = timedelta(days=1)  # success: false 응답 유지 기간
+APPDETAILS_CACHE_MAX_ENTRIES = 200000              # 최대 항목 수 (넘으면 오래된 순으로 삭제)
+APPDETAILS_CACHE_EVICT_EVERY = 500                 # 몇 건 쓸 때마다 크기 확인할지
+
+# 게임 상세 조회 시 오래된 정보라도 먼저 응답하고 상점 정보 갱신은 백그라운드에서 처리
+GAME_DETAIL_STALE_WHILE_REVALIDATE = True
+
+# 캐시 (기본은 프로세스별 메모리 캐시. 여러 프로세스가 무효화를 공유하려면 Redis/DB 캐시로 교체)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'steam-ecyce',
+    }
+}
+
+# 게임 목록 결과 개수 캐시 (games/counts.py)
+GAME_COUNT_CACHE_TTL = 300       # 필터 조합별 개수 캐시 유지 시간(초)
+GAME_COUNT_EXACT_LIMIT = 10000   # count=approx일 때 이 개수까지는 정확히 셈
+GAME_COUNT_SAMPLE_SIZE = 20000   # 그보다 많으면 appid 해시로 고르게 뽑은 이만큼의 표본으로 추정
+
+# 검색어 자동완성 메모리 색인 (games/autocomplete.py)
+AUTOCOMPLETE_MAX_RESULTS = 20        # 한 번에 돌려줄 수 있는 최대 결과 수
+AUTOCOMPLETE_TOP_PREFIX_LENGTH = 2   # 이 길이 이하의 접두어는 인기 순 결과를 미리 계산
+AUTOCOMPLETE_REFRESH_INTERVAL = 60   # 카탈로그가 바뀌어도 이 시간(초) 안에는 색인을 다시 만들지 않음
+FUZZY_SEARCH_MIN_CONFIDENCE = 0.5    # 검색 결과가 없을 때 오타 교정 결과를 쓸 최소 점수 (미만이면 AI 추천)
+
+# AI 게이트웨이 공용 클라이언트 (ai_analysis/utils.py) - 전용 이벤트 루프에서 keep-alive 커넥션 재사용
+AI_HTTP2 = True                  # h2 패키지가 설치되어 있으면 HTTP/2로 요청을 한 커넥션에 다중화
+AI_HTTP_MAX_CONNECTIONS = 20     # 동시에 열 수 있는 최대 커넥션 수
+AI_HTTP_MAX_KEEPALIVE = 10       # 유휴 상태로 유지할 최대 커넥션 수
+AI_HTTP_KEEPALIVE_EXPIRY = 60    # 유휴 커넥션 유지 시간(초)
+AI_HTTP_TIMEOUT = 30.0           # AI 요청 타임아웃(초)
+AI_REQUEST_TIMEOUT = 45.0        # 동기 코드에서 AI 호출 결과를 기다리는 최대 시간(초), 넘으면 취소하고 실패 처리
+
+# LLM 응답 캐시 (ai_analysis.AIResponseCache) - 같은 모델/프롬프트면 다시 호출하지 않음
+AI_RESPONSE_CACHE_TTL = timedelta(days=7)  # 응답 유지 기간
+AI_RESPONSE_CACHE_MAX_ENTRIES = 5000       # 넘으면 오래 안 쓰인 응답부터 삭제
+AI_RESPONSE_CACHE_EVICT_EVERY = 50         # 몇 번 저장할 때마다 정리할지
+
+# 검색 결과가 없을 때의 AI 추천 캐시 (games/recommendations.py)
+SEARCH_RECOMMENDATION_CACHE_TTL = timedelta(days=7)           # 추천 결과 유지 기간
+SEARCH_RECOMMENDATION_NEGATIVE_CACHE_TTL = timedelta(hours=6) # 추천할 게임이 없었던 검색어 유지 기간
+SEARCH_RECOMMENDATION_CACHE_MAX_ENTRIES = 20000               # 넘으면 오래 안 쓰인 검색어부터 삭제
+SEARCH_RECOMMENDATION_CACHE_EVICT_EVERY = 100                 # 몇 번 저장할 때마다 정리할지
+SEARCH_RECOMMENDATION_WAIT_TIMEOUT = 40                       # 같은 검색어의 진행 중인 AI 호출을 기다리는 최대 시간(초)
+
+# 게임 목록 필터 패널의 가격대 (games/facets.py). (키, 최소, 최대) 원 단위, 최대가 None이면 상한 없음
+GAME_PRICE_BUCKETS = [
+    ('free', 0, 0),
+    ('under_10000', 1, 9999),
+    ('under_30000', 10000, 29999),
+    ('under_50000', 30000, 49999),
+    ('over_50000', 50000, None),
+]
+
+# 백그라운드 작업 (라이브러리 동기화 등)
+BACKGROUND_TASK_WORKERS = 4              # 웹 프로세스 내 작업 스레드 수
+LIBRARY_SYNC_RUN_IN_PROCESS = True       # False면 process_library_sync_jobs 명령어로만 처리
+LIBRARY_SYNC_JOB_TIMEOUT = timedelta(minutes=30)  # heartbeat가 이보다 오래 끊기면 실패 처리
+LIBRARY_SYNC_PROGRESS_INTERVAL = 20      # 진행 상황을 몇 게임마다 DB에 기록할지
+LIBRARY_SYNC_MIN_INTERVAL = timedelta(minutes=5)  # 같은 유저의 최소 재동기화 간격
+REVIEW_SUMMARY_WORKERS = 2               # 리뷰 요약 전용 작업 스레드 수 (라이브러리 동기화와 별도)
+REVIEW_SUMMARY_LEASE_TIMEOUT = timedelta(minutes=5)  # 리뷰 요약 작업이 시작 후 이보다 오래 끝나지 않으면 다른 요청이 다시 시작
+REVIEW_SUMMARY_MAX_WAIT = 25             # 요약 결과 long-poll 최대 대기 시간(초)
+REVIEW_SUMMARY_POLL_INTERVAL = 0.5       # long-poll 중 DB 상태 확인 간격(초)
+REVIEW_SUMMARY_WARMUP_CONCURRENCY = 8    # warmup_review_summaries에서 동시에 요약할 게임 수
+REVIEW_SUMMARY_WARMUP_TOKENS_PER_MINUTE = 200000  # warmup_review_summaries의 분당 토큰 예산 (추정치 기준)
 FRONTEND_URL = 'http://localhost:5173'
 
 # SECURITY WARNING: keep the secret key used in production secret!